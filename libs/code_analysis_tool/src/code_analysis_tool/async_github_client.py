@@ -0,0 +1,410 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Callable, List, Optional, Sequence
+from dateutil.parser import parse
+from loguru import logger
+import httpx
+
+from code_analysis_tool.interfaces import AsyncSourceControlFetcher
+from code_analysis_tool.models.repository import Repository
+from code_analysis_tool.models.pull_request import PullRequest
+from code_analysis_tool.models.user import User
+from .fetcher_base import fetch_scope
+from .github_client import SEARCH_RESULT_LIMIT, GraphQLConversion, pull_requests_by_number_query
+from .pull_request_utils import DIFF_MEDIA_TYPE, filename, diff, iter_lines, parse_unified_diff
+
+DEFAULT_BASE_URL = "https://api.github.com"
+
+# Responses worth retrying after a pause: secondary rate limits and transient server errors
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+
+class AsyncGitHubClient(GraphQLConversion, AsyncSourceControlFetcher):
+    """
+    GitHub client for async services, on httpx with HTTP/2 and a shared connection pool.
+
+    Returns the same models as GitHubClient. Over HTTP/2 many requests are multiplexed
+    on a few connections, so hundreds of concurrent calls from one event loop don't
+    each need their own socket. Requires the "async" extra (httpx[http2]).
+
+    Authors and repository owners of listed pull requests come from the list payloads,
+    which don't include name and email. Unlike GitHubClient, which reads them with a
+    request per user, they are left as None; get_user_by_id fetches the full user.
+    Search results are fetched by number with one GraphQL query per page, which
+    includes them, as in GitHubClient.
+
+    Diffs are not fetched with the pull requests. Await load_diffs before reading
+    file_diffs, otherwise file_diffs loads the diff with a blocking request.
+    """
+
+    def __init__(
+        self,
+        access_token: str,
+        max_connections: int = 100,
+        rate_limit_floor: int = 50,
+        max_retries: int = 3,
+        base_url: str = DEFAULT_BASE_URL,
+        http2: bool = True,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ) -> None:
+        """
+        Args:
+            access_token: GitHub personal access token
+            max_connections: Maximum number of open connections, requests beyond that wait for a free one
+            rate_limit_floor: Remaining request budget below which requests wait for the rate limit to reset
+            max_retries: Number of times a request is retried after a secondary rate limit or server error
+            base_url: GitHub API URL, for GitHub Enterprise
+            http2: Whether to use HTTP/2
+            transport: httpx transport to send requests with instead of the network, for tests
+        """
+        super().__init__()
+        self.access_token = access_token
+        self.base_url = base_url.rstrip("/")
+        # GitHub Enterprise serves GraphQL at /api/graphql next to the REST API at /api/v3
+        self.graphql_url = self.base_url[:-len("/v3")] + "/graphql" if self.base_url.endswith("/api/v3") else self.base_url + "/graphql"
+        self.rate_limit_floor = rate_limit_floor
+        self.max_retries = max_retries
+        self._headers = {
+            "Authorization": f"token {access_token}",
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": "2022-11-28"
+        }
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self._headers,
+            http2=http2,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            # Waiting for a pooled connection is expected under load and must not time out
+            timeout=httpx.Timeout(60.0, pool=None),
+            transport=transport
+        )
+        # (remaining, reset time) from the last response headers of each rate limit resource,
+        # like "core", "search" and "graphql", which GitHub budgets separately
+        self._rate_limits: dict[str, tuple[int, float]] = {}
+
+    async def __aenter__(self) -> "AsyncGitHubClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the pooled connections."""
+        await self._client.aclose()
+
+    async def _wait_for_rate_limit(self, resource: str) -> None:
+        """
+        Sleep until the resource's rate limit resets if its remaining budget is nearly spent.
+        Search only has 30 requests a minute, so rather than keeping a floor each search
+        claims a request from its budget and waits once the budget is spent.
+        """
+        if resource not in self._rate_limits:
+            return
+        remaining, reset_time = self._rate_limits[resource]
+        floor = 1 if resource == "search" else self.rate_limit_floor
+        if remaining >= floor:
+            if resource == "search":
+                # Claim the request before sending it so concurrent searches can't overspend the budget
+                self._rate_limits[resource] = (remaining - 1, reset_time)
+            return
+        delay = reset_time - time.time()
+        if delay > 0:
+            logger.warning(f"{remaining} GitHub {resource} requests left, waiting {delay:.0f}s for the rate limit to reset")
+            await asyncio.sleep(delay)
+        if resource == "search":
+            self._rate_limits.pop(resource, None)
+
+    def _record_rate_limit(self, response: httpx.Response) -> None:
+        if "x-ratelimit-remaining" in response.headers:
+            resource = response.headers.get("x-ratelimit-resource", "core")
+            self._rate_limits[resource] = (
+                int(response.headers["x-ratelimit-remaining"]),
+                float(response.headers.get("x-ratelimit-reset", 0))
+            )
+
+    async def _request(
+        self,
+        url: str,
+        params: Optional[dict[str, Any]] = None,
+        headers: Optional[dict[str, str]] = None,
+        method: str = "GET",
+        json: Optional[dict[str, Any]] = None,
+        resource: str = "core"
+    ) -> httpx.Response:
+        """
+        Send a request, retrying secondary rate limits and server errors, and raise for any other
+        error status. resource is the rate limit the request counts against.
+        """
+        for attempt in range(self.max_retries + 1):
+            await self._wait_for_rate_limit(resource)
+            response = await self._client.request(method, url, params=params, headers=headers, json=json)
+            self._record_rate_limit(response)
+            # Secondary rate limits are 403s or 429s with a Retry-After header
+            retryable = response.status_code in RETRY_STATUS_CODES or (
+                response.status_code == 403 and "retry-after" in response.headers
+            )
+            if not retryable or attempt == self.max_retries:
+                break
+            delay = float(response.headers.get("retry-after", 2 ** attempt))
+            logger.warning(f"GitHub responded {response.status_code} to {url}, retrying in {delay:.0f}s")
+            await asyncio.sleep(delay)
+        response.raise_for_status()
+        return response
+
+    async def _get_json(self, url: str, params: Optional[dict[str, Any]] = None) -> Any:
+        return (await self._request(url, params)).json()
+
+    async def _paginate(self, url: str, params: dict[str, Any], resource: str = "core") -> AsyncIterator[Any]:
+        """Yield each page of a list endpoint, following the Link header until the last page."""
+        next_url: Optional[str] = url
+        params = {**params, "per_page": 100}
+        while next_url:
+            response = await self._request(next_url, params, resource=resource)
+            yield response.json()
+            next_url = response.links.get("next", {}).get("url")
+            # The next link already carries the query parameters
+            params = None
+
+    async def _query(self, query: str, variables: dict[str, Any]) -> dict[str, Any]:
+        response = await self._request(self.graphql_url, method="POST", json={"query": query, "variables": variables}, resource="graphql")
+        body = response.json()
+        # GraphQL reports errors in the body of a 200 response
+        if body.get("errors"):
+            raise Exception(f"GraphQL query failed: {body['errors']}")
+        return body["data"]
+
+    async def _get_pull_requests_by_number(self, repo_name: str, numbers: Sequence[int]) -> List[PullRequest]:
+        """Fetch several pull requests of a repository with one GraphQL query."""
+        owner, name = repo_name.split("/", 1)
+        repository = (await self._query(pull_requests_by_number_query(numbers), {"owner": owner, "name": name}))["repository"]
+        return self._convert_graphql_pull_requests_by_number(repository, numbers)
+
+    def _graphql_diff_loader(self, repo_name: str, number: int, head_sha: str) -> Callable[[], dict[filename, diff]]:
+        return lambda: self._get_diff_blocking(repo_name, number)
+
+    def _convert_user(self, github_user: Optional[dict[str, Any]]) -> User:
+        """Convert a GitHub user payload to platform-agnostic User model."""
+        # Deleted accounts come back as null users, GitHub shows them as "ghost"
+        github_user = github_user or {"id": "", "login": "ghost"}
+        user_id = str(github_user["id"])
+        return self._intern(self._users, user_id or github_user["login"], lambda: User(
+            id=user_id,
+            login=github_user["login"],
+            name=github_user.get("name"),
+            email=github_user.get("email")
+        ))
+
+    def _convert_repository(self, github_repo: dict[str, Any]) -> Repository:
+        """Convert a GitHub repository payload to platform-agnostic Repository model."""
+        return self._intern(self._repositories, str(github_repo["id"]), lambda: Repository(
+            id=str(github_repo["id"]),
+            name=github_repo["name"],
+            full_name=github_repo["full_name"],
+            owner=self._convert_user(github_repo["owner"]),
+            description=github_repo["description"],
+            private=github_repo["private"]
+        ))
+
+    def _convert_pull_request(self, github_pr: dict[str, Any]) -> PullRequest:
+        """Convert a GitHub pull request payload to platform-agnostic PullRequest model."""
+        repository = self._convert_repository(github_pr["base"]["repo"])
+        return PullRequest(
+            id=str(github_pr["id"]),
+            number=github_pr["number"],
+            title=github_pr["title"],
+            author=self._convert_user(github_pr["user"]),
+            repository=repository,
+            created_at=parse(github_pr["created_at"]),
+            merged_at=parse(github_pr["merged_at"]) if github_pr["merged_at"] else None,
+            merged=github_pr["merged_at"] is not None,
+            description=github_pr["body"],
+            # Only the single pull request payload has change stats
+            additions=github_pr.get("additions"),
+            deletions=github_pr.get("deletions"),
+            changed_files=github_pr.get("changed_files"),
+            file_diffs=None,  # Don't load diffs immediately
+            _diff_loader=lambda: self._get_diff_blocking(repository.full_name, github_pr["number"])
+        )
+
+    @fetch_scope
+    async def get_user_by_id(self, user_id: str) -> Optional[User]:
+        try:
+            github_user = await self._get_json(f"/users/{user_id}")
+            user = User(
+                id=str(github_user["id"]),
+                login=github_user["login"],
+                name=github_user.get("name"),
+                email=github_user.get("email")
+            )
+            # Replace a partial user from an earlier list payload
+            self._users[user.id] = user
+            return user
+        except Exception as e:
+            raise Exception(f"Failed to find user with ID {user_id}: {str(e)}")
+
+    async def get_user_repositories(self, user_id: str) -> List[Repository]:
+        return [repo async for repo in self.iter_user_repositories(user_id)]
+
+    @fetch_scope
+    async def iter_user_repositories(self, user_id: str) -> AsyncIterator[Repository]:
+        try:
+            async for page in self._paginate(f"/users/{user_id}/repos", {"type": "owner"}):
+                for repo in page:
+                    yield self._convert_repository(repo)
+        except Exception as e:
+            raise Exception(f"Failed to fetch repositories for user ID {user_id}: {str(e)}")
+
+    async def get_merged_pull_requests(
+        self,
+        repo_name: str,
+        since_date: Optional[str] = None
+    ) -> List[PullRequest]:
+        return [pr async for pr in self.iter_merged_pull_requests(repo_name, since_date)]
+
+    @fetch_scope
+    async def iter_merged_pull_requests(
+        self,
+        repo_name: str,
+        since_date: Optional[str] = None
+    ) -> AsyncIterator[PullRequest]:
+        try:
+            since_datetime: Optional[datetime] = parse(since_date).astimezone(timezone.utc) if since_date else None
+            merged_pulls = await self._search_merged_pull_requests(repo_name, since_datetime) if since_datetime else None
+            if merged_pulls is None:
+                merged_pulls = self._list_merged_pull_requests(repo_name, since_datetime)
+            async for pr in merged_pulls:
+                yield pr
+        except ValueError as e:
+            raise ValueError(f"Value error, potential issue in date format: {str(e)}")
+        except Exception as e:
+            raise Exception(f"Failed to fetch pull requests for repository {repo_name}: {str(e)}")
+
+    async def _search_merged_pull_requests(self, repo_name: str, since_datetime: datetime) -> Optional[AsyncIterator[PullRequest]]:
+        """
+        Use the search API so that only pull requests merged since the date are transferred.
+        Search results are issues, so each page's pull requests are then fetched by number
+        with one GraphQL query rather than a REST request each.
+        Returns None if there are more matches than the search API can return.
+        """
+        query = f"repo:{repo_name} is:pr is:merged merged:>={since_datetime.isoformat(timespec='seconds')}"
+        pages = self._paginate("/search/issues", {"q": query}, resource="search")
+        # The first page is fetched up front to learn how many pull requests match
+        first_page = await anext(pages)
+        if first_page["total_count"] > SEARCH_RESULT_LIMIT:
+            await pages.aclose()
+            logger.info(f"{first_page['total_count']} pull requests merged in {repo_name} since {since_datetime}, listing them instead of searching")
+            return None
+
+        async def results() -> AsyncIterator[PullRequest]:
+            page = first_page
+            while True:
+                if page["items"]:
+                    for pr in await self._get_pull_requests_by_number(repo_name, [issue["number"] for issue in page["items"]]):
+                        yield pr
+                page = await anext(pages, None)
+                if page is None:
+                    return
+        return results()
+
+    async def _list_merged_pull_requests(self, repo_name: str, since_datetime: Optional[datetime]) -> AsyncIterator[PullRequest]:
+        """List closed pull requests, most recently updated first, and yield the merged ones."""
+        params = {"state": "closed", "sort": "updated", "direction": "desc"}
+        pages = self._paginate(f"/repos/{repo_name}/pulls", params)
+        try:
+            async for page in pages:
+                for pr in page:
+                    # Merging updates a pull request so updated_at >= merged_at, nothing after this can have been merged since
+                    if since_datetime and parse(pr["updated_at"]) < since_datetime:
+                        return
+                    if pr["merged_at"] is None:
+                        continue
+                    if since_datetime and parse(pr["merged_at"]) < since_datetime:
+                        continue
+                    yield self._convert_pull_request(pr)
+        finally:
+            await pages.aclose()
+
+    @fetch_scope
+    async def get_merged_pull_requests_for_user(
+        self,
+        user_id: str,
+        since_date: Optional[str] = None
+    ) -> List[PullRequest]:
+        try:
+            repositories = await self.get_user_repositories(user_id)
+            # The connection pool bounds how many of these are in flight
+            merged_pulls_by_repo = await asyncio.gather(*(
+                self.get_merged_pull_requests(repo.full_name, since_date) for repo in repositories
+            ))
+            return [pr for merged_pulls in merged_pulls_by_repo for pr in merged_pulls]
+        except Exception as e:
+            raise Exception(f"Failed to fetch merged pull requests for user ID {user_id}: {str(e)}")
+
+    @fetch_scope
+    async def iter_merged_pull_requests_for_user(
+        self,
+        user_id: str,
+        since_date: Optional[str] = None
+    ) -> AsyncIterator[PullRequest]:
+        """
+        Like get_merged_pull_requests_for_user but yields each repository's pull requests
+        as soon as that repository has been fetched, in completion order.
+        """
+        tasks: List[asyncio.Task] = []
+        try:
+            repositories = await self.get_user_repositories(user_id)
+            tasks = [asyncio.create_task(self.get_merged_pull_requests(repo.full_name, since_date)) for repo in repositories]
+            for next_done in asyncio.as_completed(tasks):
+                for pr in await next_done:
+                    yield pr
+        except Exception as e:
+            raise Exception(f"Failed to fetch merged pull requests for user ID {user_id}: {str(e)}")
+        finally:
+            # Don't keep fetching if the caller stopped iterating or a fetch failed
+            for task in tasks:
+                task.cancel()
+
+    async def get_diff(self, repo_name: str, number: int) -> dict[filename, diff]:
+        """Get the diff of a pull request organized by filename, from a single unified diff request."""
+        try:
+            response = await self._request(f"/repos/{repo_name}/pulls/{number}", headers={"Accept": DIFF_MEDIA_TYPE})
+            return dict(parse_unified_diff(iter_lines([response.content])))
+        except Exception as e:
+            raise Exception(f"Failed to get diffs for PR #{number}: {str(e)}")
+
+    def _get_diff_blocking(self, repo_name: str, number: int) -> dict[filename, diff]:
+        """Fallback for reading file_diffs without load_diffs, which blocks the calling thread."""
+        response = httpx.get(
+            f"{self.base_url}/repos/{repo_name}/pulls/{number}",
+            headers={**self._headers, "Accept": DIFF_MEDIA_TYPE},
+            timeout=60.0
+        )
+        response.raise_for_status()
+        return dict(parse_unified_diff(iter_lines([response.content])))
+
+    async def load_diffs(self, pull_requests: List[PullRequest], concurrency: int = 32) -> List[PullRequest]:
+        """
+        Load the diffs of many pull requests concurrently so that reading file_diffs doesn't block.
+
+        Pull requests whose diffs are already loaded are skipped. A failed load is
+        logged and leaves an empty diff, the same as accessing file_diffs directly.
+
+        Args:
+            pull_requests: Pull requests from this client to load the diffs for
+            concurrency: Maximum number of diffs loaded at the same time
+
+        Returns:
+            The pull requests, in the order given
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def load(pr: PullRequest) -> None:
+            async with semaphore:
+                try:
+                    pr._file_diffs = await self.get_diff(pr.repository.full_name, pr.number)
+                except Exception as e:
+                    logger.warning(f"Failed to load diffs for PR #{pr.number}: {str(e)}")
+                    pr._file_diffs = {}
+
+        await asyncio.gather(*(load(pr) for pr in pull_requests if not pr.diffs_loaded))
+        return pull_requests
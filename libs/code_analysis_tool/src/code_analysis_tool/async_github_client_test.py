@@ -0,0 +1,275 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+from typing import Any, Callable
+from unittest.mock import patch
+import httpx
+import pytest
+
+from code_analysis_tool.async_github_client import AsyncGitHubClient
+from code_analysis_tool.github_client import SEARCH_RESULT_LIMIT
+from code_analysis_tool.models.pull_request import PullRequest
+from code_analysis_tool.models.repository import Repository
+from code_analysis_tool.models.user import User
+
+OWNER = {"id": 1, "login": "owner"}
+REPO = {"id": 10, "name": "repo", "full_name": "owner/repo", "owner": OWNER, "description": "A repo", "private": False}
+
+def pull_request(number: int, merged_at: str | None, updated_at: str = "2024-03-01T00:00:00Z") -> dict[str, Any]:
+    return {
+        "id": 1000 + number,
+        "number": number,
+        "title": f"PR {number}",
+        "body": "description",
+        "user": {"id": 2, "login": "author"},
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": updated_at,
+        "merged_at": merged_at,
+        "base": {"repo": REPO},
+        "head": {"sha": f"sha{number}"}
+    }
+
+def graphql_pull_request(number: int, merged_at: str) -> dict[str, Any]:
+    owner = {"databaseId": 1, "login": "owner"}
+    return {
+        "databaseId": 1000 + number,
+        "number": number,
+        "title": f"PR {number}",
+        "body": "description",
+        "createdAt": "2024-01-01T00:00:00Z",
+        "updatedAt": merged_at,
+        "mergedAt": merged_at,
+        "merged": True,
+        "additions": 10,
+        "deletions": 2,
+        "changedFiles": 1,
+        "headRefOid": f"sha{number}",
+        "author": {"databaseId": 2, "login": "author", "name": "Author", "email": ""},
+        "repository": {"databaseId": 10, "name": "repo", "nameWithOwner": "owner/repo", "description": "A repo", "isPrivate": False, "owner": owner}
+    }
+
+def graphql_response(numbers: list[int], merged_at: str = "2024-02-15T00:00:00Z") -> httpx.Response:
+    return httpx.Response(200, json={"data": {"repository": {
+        f"pr{number}": graphql_pull_request(number, merged_at) for number in numbers
+    }}}, headers={"X-RateLimit-Resource": "graphql", "X-RateLimit-Remaining": "4999", "X-RateLimit-Reset": "1000030"})
+
+def make_client(handler: Callable[[httpx.Request], httpx.Response], **kwargs: Any) -> AsyncGitHubClient:
+    return AsyncGitHubClient("fake_token", transport=httpx.MockTransport(handler), **kwargs)
+
+def run(client: AsyncGitHubClient, coroutine: Any) -> Any:
+    async def run_and_close() -> Any:
+        async with client:
+            return await coroutine
+    return asyncio.run(run_and_close())
+
+def test_get_user_by_id() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/users/test_user"
+        assert request.headers["Authorization"] == "token fake_token"
+        return httpx.Response(200, json={"id": 123, "login": "test_user", "name": "Test User", "email": "test@example.com"})
+
+    client = make_client(handler)
+    user = run(client, client.get_user_by_id("test_user"))
+
+    assert user == User(id="123", login="test_user", name="Test User", email="test@example.com")
+
+def test_get_user_by_id_failure() -> None:
+    client = make_client(lambda request: httpx.Response(404, json={"message": "Not Found"}))
+
+    with pytest.raises(Exception) as exc_info:
+        run(client, client.get_user_by_id("test_user"))
+
+    assert "Failed to find user with ID test_user" in str(exc_info.value)
+
+def test_get_user_repositories_follows_link_header() -> None:
+    second = {**REPO, "id": 11, "name": "other", "full_name": "owner/other"}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.params.get("page") == "2":
+            return httpx.Response(200, json=[second])
+        assert request.url.params["per_page"] == "100"
+        return httpx.Response(200, json=[REPO], headers={"Link": '<https://api.github.com/users/owner/repos?type=owner&per_page=100&page=2>; rel="next"'})
+
+    client = make_client(handler)
+    repositories = run(client, client.get_user_repositories("owner"))
+
+    assert [repo.full_name for repo in repositories] == ["owner/repo", "owner/other"]
+    assert isinstance(repositories[0], Repository)
+    # Both repositories share the interned owner
+    assert repositories[0].owner is repositories[1].owner
+
+def test_get_merged_pull_requests_searches_since_date() -> None:
+    requested = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(request.url.path)
+        if request.url.path == "/search/issues":
+            assert request.url.params["q"] == "repo:owner/repo is:pr is:merged merged:>=2024-02-01T00:00:00+00:00"
+            return httpx.Response(200, json={"total_count": 2, "items": [{"number": 1}, {"number": 2}]})
+        assert request.method == "POST" and request.url.path == "/graphql"
+        assert json.loads(request.content)["variables"] == {"owner": "owner", "name": "repo"}
+        return graphql_response([1, 2])
+
+    client = make_client(handler)
+    pull_requests = run(client, client.get_merged_pull_requests("owner/repo", "2024-02-01T00:00:00Z"))
+
+    assert [pr.number for pr in pull_requests] == [1, 2]
+    assert all(isinstance(pr, PullRequest) and pr.merged for pr in pull_requests)
+    assert pull_requests[0].id == "1001"
+    assert pull_requests[0].merged_at == datetime(2024, 2, 15, tzinfo=timezone.utc)
+    assert pull_requests[0].author.name == "Author"
+    # The search hits of a page come from a single GraphQL query
+    assert requested == ["/search/issues", "/graphql"]
+
+def test_search_budget_does_not_hold_back_other_requests() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/search/issues":
+            return httpx.Response(200, json={"total_count": 1, "items": [{"number": 1}]}, headers={
+                "X-RateLimit-Resource": "search",
+                "X-RateLimit-Remaining": "29",
+                "X-RateLimit-Reset": "1000030"
+            })
+        if request.url.path == "/graphql":
+            return graphql_response([1])
+        return httpx.Response(200, json={"id": 123, "login": "test_user"}, headers={
+            "X-RateLimit-Resource": "core",
+            "X-RateLimit-Remaining": "4999",
+            "X-RateLimit-Reset": "1003600"
+        })
+
+    client = make_client(handler, rate_limit_floor=50)
+    with patch("code_analysis_tool.async_github_client.time.time", return_value=1000000), \
+            patch("code_analysis_tool.async_github_client.asyncio.sleep") as mock_sleep:
+        async def fetch() -> None:
+            await client.get_user_by_id("test_user")
+            await client.get_merged_pull_requests("owner/repo", "2024-02-01T00:00:00Z")
+            await client.get_merged_pull_requests("owner/repo", "2024-02-01T00:00:00Z")
+            await client.get_user_by_id("test_user")
+        run(client, fetch())
+
+    mock_sleep.assert_not_called()
+
+def test_search_waits_once_search_budget_is_spent() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/search/issues":
+            return httpx.Response(200, json={"total_count": 0, "items": []}, headers={
+                "X-RateLimit-Resource": "search",
+                "X-RateLimit-Remaining": "0",
+                "X-RateLimit-Reset": "1000030"
+            })
+        raise AssertionError(f"Unexpected request to {request.url.path}")
+
+    client = make_client(handler)
+    with patch("code_analysis_tool.async_github_client.time.time", return_value=1000000), \
+            patch("code_analysis_tool.async_github_client.asyncio.sleep") as mock_sleep:
+        async def two_searches() -> None:
+            await client.get_merged_pull_requests("owner/repo", "2024-02-01T00:00:00Z")
+            mock_sleep.assert_not_called()
+            await client.get_merged_pull_requests("owner/repo", "2024-02-01T00:00:00Z")
+        run(client, two_searches())
+
+    mock_sleep.assert_called_once_with(30)
+
+def test_get_merged_pull_requests_lists_when_search_exceeds_limit() -> None:
+    pulls = [
+        pull_request(3, "2024-02-20T00:00:00Z", updated_at="2024-02-21T00:00:00Z"),
+        pull_request(2, None, updated_at="2024-02-10T00:00:00Z"),
+        pull_request(1, "2024-01-01T00:00:00Z", updated_at="2024-01-02T00:00:00Z")
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/search/issues":
+            return httpx.Response(200, json={"total_count": SEARCH_RESULT_LIMIT + 1, "items": []})
+        assert request.url.path == "/repos/owner/repo/pulls"
+        assert request.url.params["sort"] == "updated"
+        return httpx.Response(200, json=pulls)
+
+    client = make_client(handler)
+    pull_requests = run(client, client.get_merged_pull_requests("owner/repo", "2024-02-01T00:00:00Z"))
+
+    assert [pr.number for pr in pull_requests] == [3]
+
+def test_get_merged_pull_requests_for_user_keeps_repository_order() -> None:
+    other = {**REPO, "id": 11, "name": "other", "full_name": "owner/other"}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/users/owner/repos":
+            return httpx.Response(200, json=[REPO, other])
+        if request.url.path == "/repos/owner/repo/pulls":
+            # The first repository finishes last
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json=[pull_request(1, "2024-02-20T00:00:00Z")])
+        return httpx.Response(200, json=[{**pull_request(2, "2024-02-20T00:00:00Z"), "base": {"repo": other}}])
+
+    client = make_client(handler)
+    pull_requests = run(client, client.get_merged_pull_requests_for_user("owner"))
+
+    assert [pr.repository.full_name for pr in pull_requests] == ["owner/repo", "owner/other"]
+
+def test_request_retries_secondary_rate_limit() -> None:
+    responses = [
+        httpx.Response(403, headers={"Retry-After": "0"}, json={"message": "secondary rate limit"}),
+        httpx.Response(200, json={"id": 123, "login": "test_user"})
+    ]
+    client = make_client(lambda request: responses.pop(0))
+
+    user = run(client, client.get_user_by_id("test_user"))
+
+    assert user.login == "test_user"
+    assert not responses
+
+def test_waits_for_rate_limit_reset_below_floor() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"id": 123, "login": "test_user"}, headers={
+            "X-RateLimit-Remaining": "10",
+            "X-RateLimit-Reset": "1000030"
+        })
+
+    client = make_client(handler, rate_limit_floor=50)
+    with patch("code_analysis_tool.async_github_client.time.time", return_value=1000000), \
+            patch("code_analysis_tool.async_github_client.asyncio.sleep") as mock_sleep:
+        async def two_requests() -> None:
+            await client.get_user_by_id("test_user")
+            await client.get_user_by_id("test_user")
+        run(client, two_requests())
+
+    mock_sleep.assert_called_once_with(30)
+
+def test_load_diffs_parses_unified_diff() -> None:
+    unified_diff = (
+        "diff --git a/file.py b/file.py\n"
+        "--- a/file.py\n"
+        "+++ b/file.py\n"
+        "@@ -1 +1 @@\n"
+        "-old\n"
+        "+new\n"
+    )
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.headers["Accept"] == "application/vnd.github.diff":
+            return httpx.Response(200, text=unified_diff)
+        return httpx.Response(200, json=[pull_request(1, "2024-02-20T00:00:00Z"), pull_request(2, "2024-02-20T00:00:00Z")])
+
+    client = make_client(handler)
+
+    async def fetch_and_load() -> list[PullRequest]:
+        return await client.load_diffs(await client.get_merged_pull_requests("owner/repo"))
+    pull_requests = run(client, fetch_and_load())
+
+    assert all(pr.diffs_loaded for pr in pull_requests)
+    assert pull_requests[0].file_diffs == {"file.py": "@@ -1 +1 @@\n-old\n+new"}
+
+def test_load_diffs_failure_leaves_empty_diff() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.headers["Accept"] == "application/vnd.github.diff":
+            return httpx.Response(500)
+        return httpx.Response(200, json=[pull_request(1, "2024-02-20T00:00:00Z")])
+
+    client = make_client(handler, max_retries=0)
+
+    async def fetch_and_load() -> list[PullRequest]:
+        return await client.load_diffs(await client.get_merged_pull_requests("owner/repo"))
+    pull_requests = run(client, fetch_and_load())
+
+    assert pull_requests[0].diffs_loaded
+    assert pull_requests[0].file_diffs == {}
@@ -0,0 +1,172 @@
+import math
+from datetime import datetime, timezone
+from typing import Any, Iterator, List, Optional
+from dateutil.parser import parse
+import requests
+
+from code_analysis_tool.models.repository import Repository
+from code_analysis_tool.models.pull_request import PullRequest
+from code_analysis_tool.models.user import User
+from .pull_request_utils import filename, diff, iter_lines, parse_unified_diff
+from .fetcher_base import ConcurrentFetcher, fetch_scope
+from .rest_client import Pagination, RestClient
+
+DEFAULT_BASE_URL = "https://api.bitbucket.org/2.0"
+
+# Largest page size Bitbucket allows for pull requests
+PAGE_LENGTH = 50
+
+class BitbucketPagination(Pagination):
+    """Bitbucket Cloud pages, JSON objects holding the items in values and the next page URL in next."""
+
+    def items(self, response: requests.Response, body: Any) -> List[Any]:
+        return body["values"]
+
+    def next_url(self, response: requests.Response, body: Any) -> Optional[str]:
+        return body.get("next")
+
+    def page_count(self, response: requests.Response, body: Any) -> Optional[int]:
+        # size is optional, Bitbucket leaves it out when counting would be expensive
+        if "size" not in body or not body.get("pagelen"):
+            return None
+        return max(1, math.ceil(body["size"] / body["pagelen"]))
+
+class BitbucketClient(ConcurrentFetcher):
+    """
+    Source control fetcher for Bitbucket Cloud, where a user's repositories are those
+    of their workspace. Users are identified by UUID or account ID.
+
+    Bitbucket doesn't record when a pull request was merged, so merged_at is the time
+    it was last updated, which is the merge unless it was commented on afterwards.
+    """
+
+    def __init__(
+        self,
+        access_token: str | tuple[str, str],
+        base_url: str = DEFAULT_BASE_URL,
+        max_workers: int = 8,
+        max_retries: int = 3
+    ) -> None:
+        """
+        Args:
+            access_token: Repository, project or workspace access token, or a (username, app password) pair
+            base_url: Bitbucket API URL
+            max_workers: Maximum number of concurrent requests
+            max_retries: Number of times a request is retried after a rate limit or server error
+        """
+        super().__init__()
+        is_token = isinstance(access_token, str)
+        self.rest = RestClient(
+            base_url,
+            headers={"Authorization": f"Bearer {access_token}"} if is_token else None,
+            auth=None if is_token else access_token,
+            max_workers=max_workers,
+            max_retries=max_retries
+        )
+        self.pagination = BitbucketPagination()
+        self.max_workers = max_workers
+
+    def _convert_user(self, account: Optional[dict[str, Any]]) -> User:
+        """Convert a Bitbucket account to platform-agnostic User model."""
+        # Authors that were removed from Bitbucket come back empty
+        account = account or {"uuid": "", "nickname": "ghost"}
+        return self._intern(self._users, account["uuid"] or account["nickname"], lambda: User(
+            id=account["uuid"],
+            login=account.get("nickname") or account.get("username") or account["uuid"],
+            name=account.get("display_name"),
+            # Bitbucket never exposes account emails
+            email=None
+        ))
+
+    def _convert_repository(self, repo: dict[str, Any]) -> Repository:
+        """Convert a Bitbucket repository to platform-agnostic Repository model."""
+        return self._intern(self._repositories, repo["uuid"], lambda: Repository(
+            id=repo["uuid"],
+            name=repo["slug"],
+            full_name=repo["full_name"],
+            owner=self._convert_user(repo["owner"]),
+            description=repo.get("description") or None,
+            private=repo["is_private"]
+        ))
+
+    def _convert_pull_request(self, repository: Repository, pr: dict[str, Any]) -> PullRequest:
+        """Convert a Bitbucket pull request to platform-agnostic PullRequest model."""
+        merged = pr["state"] == "MERGED"
+        return PullRequest(
+            # Pull request IDs are only unique within a repository
+            id=f"{repository.id}#{pr['id']}",
+            number=pr["id"],
+            title=pr["title"],
+            author=self._convert_user(pr.get("author")),
+            repository=repository,
+            created_at=parse(pr["created_on"]),
+            merged_at=parse(pr["updated_on"]) if merged else None,
+            merged=merged,
+            description=pr.get("description") or None,
+            file_diffs=None,  # Don't load diffs immediately
+            _diff_loader=lambda: self.get_diff(repository.full_name, pr["id"])
+        )
+
+    @fetch_scope
+    def get_user_by_id(self, user_id: str) -> Optional[User]:
+        try:
+            return self._convert_user(self.rest.get_json(f"users/{user_id}"))
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                return None
+            raise Exception(f"Failed to find user with ID {user_id}: {str(e)}")
+        except Exception as e:
+            raise Exception(f"Failed to find user with ID {user_id}: {str(e)}")
+
+    def get_user_repositories(self, user_id: str) -> List[Repository]:
+        return list(self.iter_user_repositories(user_id))
+
+    @fetch_scope
+    def iter_user_repositories(self, user_id: str) -> Iterator[Repository]:
+        """Yield the repositories of a workspace, by workspace slug or user UUID."""
+        try:
+            for repo in self.rest.iter_items(f"repositories/{user_id}", {"pagelen": 100}, self.pagination):
+                yield self._convert_repository(repo)
+        except Exception as e:
+            raise Exception(f"Failed to fetch repositories for user ID {user_id}: {str(e)}")
+
+    def _fetch_repository(self, repo_name: str) -> Repository:
+        """Fetch a repository by its full name, e.g. "workspace/repo"."""
+        return self._convert_repository(self.rest.get_json(f"repositories/{repo_name}"))
+
+    def get_merged_pull_requests(
+        self,
+        repo_name: str,
+        since_date: Optional[str] = None
+    ) -> List[PullRequest]:
+        return list(self.iter_merged_pull_requests(repo_name, since_date))
+
+    @fetch_scope
+    def iter_merged_pull_requests(
+        self,
+        repo_name: str,
+        since_date: Optional[str] = None
+    ) -> Iterator[PullRequest]:
+        try:
+            since_datetime: Optional[datetime] = parse(since_date).astimezone(timezone.utc) if since_date else None
+            repository = self.get_repository(repo_name)
+            query = 'state = "MERGED"'
+            if since_datetime:
+                # merged_at is the last update, so Bitbucket can leave out everything not updated since
+                query += f" AND updated_on >= {since_datetime.isoformat(timespec='seconds')}"
+            params = {"q": query, "sort": "-updated_on", "pagelen": PAGE_LENGTH}
+
+            for pr in self.rest.iter_items(f"repositories/{repo_name}/pullrequests", params, self.pagination):
+                yield self._convert_pull_request(repository, pr)
+        except ValueError as e:
+            raise ValueError(f"Value error, potential issue in date format: {str(e)}")
+        except Exception as e:
+            raise Exception(f"Failed to fetch pull requests for repository {repo_name}: {str(e)}")
+
+    def get_diff(self, repo_name: str, number: int) -> dict[filename, diff]:
+        """Get the diff of a pull request organized by filename, from its unified diff."""
+        try:
+            response = self.rest.get(f"repositories/{repo_name}/pullrequests/{number}/diff")
+            return dict(parse_unified_diff(iter_lines([response.content])))
+        except Exception as e:
+            raise Exception(f"Failed to get diffs for PR #{number}: {str(e)}")
@@ -0,0 +1,98 @@
+from datetime import datetime, timezone
+from typing import Any
+from unittest.mock import Mock
+import pytest
+import requests
+
+from code_analysis_tool.bitbucket_client import BitbucketClient
+from code_analysis_tool.rest_client_test import make_response
+
+OWNER = {"uuid": "{owner}", "nickname": "owner", "display_name": "Owner"}
+REPO = {"uuid": "{repo}", "slug": "repo", "full_name": "workspace/repo", "owner": OWNER, "description": "", "is_private": True}
+
+def pull_request(number: int) -> dict[str, Any]:
+    return {
+        "id": number,
+        "title": f"PR {number}",
+        "description": "description",
+        "state": "MERGED",
+        "author": {"uuid": "{author}", "nickname": "author", "display_name": "Author"},
+        "created_on": "2024-01-01T00:00:00+00:00",
+        "updated_on": "2024-02-15T00:00:00+00:00"
+    }
+
+def page(values: list, next_url: str | None = None) -> requests.Response:
+    body: dict[str, Any] = {"values": values, "pagelen": 50}
+    if next_url:
+        body["next"] = next_url
+    return make_response(body)
+
+@pytest.fixture
+def client() -> BitbucketClient:
+    return BitbucketClient("fake_token")
+
+def test_authentication() -> None:
+    assert BitbucketClient("fake_token").rest.session.headers["Authorization"] == "Bearer fake_token"
+    assert BitbucketClient(("user", "app_password")).rest.session.auth == ("user", "app_password")
+
+def test_get_user_by_id_not_found(client: BitbucketClient) -> None:
+    client.rest.session.get = Mock(return_value=make_response({"type": "error"}, status_code=404))
+
+    assert client.get_user_by_id("{missing}") is None
+
+def test_get_user_repositories_follows_next(client: BitbucketClient) -> None:
+    other = {**REPO, "uuid": "{other}", "slug": "other", "full_name": "workspace/other"}
+    pages = {
+        "https://api.bitbucket.org/2.0/repositories/workspace": page([REPO], next_url="https://api.bitbucket.org/2.0/repositories/workspace?page=2"),
+        "https://api.bitbucket.org/2.0/repositories/workspace?page=2": page([other])
+    }
+    client.rest.session.get = Mock(side_effect=lambda url, **kwargs: pages[url])
+
+    repositories = client.get_user_repositories("workspace")
+
+    assert [repo.full_name for repo in repositories] == ["workspace/repo", "workspace/other"]
+    assert repositories[0].description is None
+    assert repositories[0].owner is repositories[1].owner
+
+def test_get_merged_pull_requests_fetches_counted_pages_by_number(client: BitbucketClient) -> None:
+    requested_pages = []
+
+    def get(url: str, params: Any = None, **kwargs: Any) -> requests.Response:
+        if url.endswith("/repositories/workspace/repo"):
+            return make_response(REPO)
+        assert params["q"] == 'state = "MERGED" AND updated_on >= 2024-02-01T00:00:00+00:00'
+        assert params["sort"] == "-updated_on"
+        requested_pages.append(params.get("page", 1))
+        return make_response({"values": [pull_request(params.get("page", 1))], "size": 75, "pagelen": 50})
+    client.rest.session.get = Mock(side_effect=get)
+
+    pull_requests = client.get_merged_pull_requests("workspace/repo", "2024-02-01T00:00:00Z")
+
+    assert [pr.number for pr in pull_requests] == [1, 2]
+    assert requested_pages == [1, 2]
+    assert pull_requests[0].id == "{repo}#1"
+    assert pull_requests[0].merged_at == datetime(2024, 2, 15, tzinfo=timezone.utc)
+    assert pull_requests[0].author.login == "author"
+
+def test_get_diff(client: BitbucketClient) -> None:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = (
+        b"diff --git a/a.py b/a.py\n"
+        b"--- a/a.py\n"
+        b"+++ b/a.py\n"
+        b"@@ -1 +1 @@\n"
+        b"-old\n"
+        b"+new\n"
+    )
+    client.rest.session.get = Mock(return_value=response)
+
+    assert client.get_diff("workspace/repo", 1) == {"a.py": "@@ -1 +1 @@\n-old\n+new"}
+
+def test_get_merged_pull_requests_failure(client: BitbucketClient) -> None:
+    client.rest.session.get = Mock(side_effect=requests.ConnectionError("connection refused"))
+
+    with pytest.raises(Exception) as exc_info:
+        client.get_merged_pull_requests("workspace/repo")
+
+    assert "Failed to fetch pull requests for repository workspace/repo" in str(exc_info.value)
@@ -0,0 +1,104 @@
+import os
+import json
+import zlib
+import hashlib
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional
+from loguru import logger
+
+from .pull_request_utils import filename, diff
+
+class DiffCache:
+    """
+    On-disk cache of pull request diffs.
+
+    Entries are keyed by repository, pull request number and head commit SHA, so a
+    cached diff is only reused while the pull request's head is unchanged, which is
+    always true once it has been merged. Each entry is a zlib compressed JSON file.
+    When the cache grows beyond max_size_bytes the least recently used entries are
+    evicted, using file modification times which are bumped on every hit.
+    """
+
+    SUFFIX = ".json.z"
+
+    def __init__(self, cache_dir: str, max_size_bytes: int = 512 * 1024 * 1024) -> None:
+        """
+        Args:
+            cache_dir: Directory holding the cache entries, created if missing
+            max_size_bytes: Total compressed size of entries above which old entries are evicted
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_size_bytes = max_size_bytes
+        self._lock = threading.Lock()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._sizes = {path: path.stat().st_size for path in self.cache_dir.glob(f"*{self.SUFFIX}")}
+        self._total_size = sum(self._sizes.values())
+
+    def _path(self, repo_name: str, number: int, head_sha: str) -> Path:
+        key = hashlib.sha256(f"{repo_name}#{number}@{head_sha}".encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key}{self.SUFFIX}"
+
+    def get(self, repo_name: str, number: int, head_sha: str) -> Optional[dict[filename, diff]]:
+        """
+        Returns:
+            The cached diffs by filename, or None on a miss
+        """
+        path = self._path(repo_name, number, head_sha)
+        try:
+            with open(path, "rb") as cache_file:
+                diffs = json.loads(zlib.decompress(cache_file.read()))
+            os.utime(path)
+            return diffs
+        except FileNotFoundError:
+            return None
+        except (OSError, zlib.error, ValueError) as e:
+            logger.warning(f"Ignoring unreadable diff cache entry for {repo_name}#{number}: {str(e)}")
+            return None
+
+    def put(self, repo_name: str, number: int, head_sha: str, diffs: dict[filename, diff]) -> None:
+        """Stores the diffs of a pull request, evicting old entries if the cache is full"""
+        path = self._path(repo_name, number, head_sha)
+        data = zlib.compress(json.dumps(diffs).encode("utf-8"))
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as tmp_file:
+                    tmp_file.write(data)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            # The cache is an optimisation, failing to fill it shouldn't fail the caller
+            logger.warning(f"Failed to cache diff for {repo_name}#{number}: {str(e)}")
+            return
+
+        with self._lock:
+            self._total_size += len(data) - self._sizes.get(path, 0)
+            self._sizes[path] = len(data)
+            if self._total_size > self.max_size_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Removes least recently used entries until the cache fits. Must hold the lock."""
+        def last_used(path: Path) -> float:
+            try:
+                return path.stat().st_mtime
+            except FileNotFoundError:
+                return 0
+
+        for path in sorted(self._sizes, key=last_used):
+            if self._total_size <= self.max_size_bytes:
+                return
+            path.unlink(missing_ok=True)
+            self._total_size -= self._sizes.pop(path)
+
+    def clear(self) -> None:
+        """Removes every entry"""
+        with self._lock:
+            for path in self._sizes:
+                path.unlink(missing_ok=True)
+            self._sizes.clear()
+            self._total_size = 0
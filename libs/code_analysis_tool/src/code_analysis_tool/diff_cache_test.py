@@ -0,0 +1,70 @@
+import os
+import pytest
+from pathlib import Path
+
+from code_analysis_tool.diff_cache import DiffCache
+
+@pytest.fixture
+def cache(tmp_path: Path) -> DiffCache:
+    return DiffCache(str(tmp_path / "diffs"))
+
+def test_put_and_get(cache: DiffCache) -> None:
+    diffs = {"file1.py": "@@ -1 +1 @@\n-a\n+b", "file2.py": "diff2"}
+
+    cache.put("owner/repo", 1, "abc", diffs)
+
+    assert cache.get("owner/repo", 1, "abc") == diffs
+
+def test_miss_on_different_key(cache: DiffCache) -> None:
+    cache.put("owner/repo", 1, "abc", {"file.py": "diff"})
+
+    assert cache.get("owner/repo", 1, "def") is None
+    assert cache.get("owner/repo", 2, "abc") is None
+    assert cache.get("owner/other", 1, "abc") is None
+
+def test_entries_are_compressed(cache: DiffCache) -> None:
+    diffs = {"file.py": "+line\n" * 10000}
+
+    cache.put("owner/repo", 1, "abc", diffs)
+
+    [entry] = cache.cache_dir.iterdir()
+    assert entry.stat().st_size < len(diffs["file.py"]) / 10
+
+def test_persists_across_instances(cache: DiffCache) -> None:
+    cache.put("owner/repo", 1, "abc", {"file.py": "diff"})
+
+    reopened = DiffCache(str(cache.cache_dir))
+
+    assert reopened.get("owner/repo", 1, "abc") == {"file.py": "diff"}
+    assert reopened._total_size == cache._total_size
+
+def test_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = DiffCache(str(tmp_path), max_size_bytes=10**6)
+    for number in range(3):
+        cache.put("owner/repo", number, "sha", {"file.py": os.urandom(100).hex()})
+        # Space out modification times so recency is unambiguous
+        path = cache._path("owner/repo", number, "sha")
+        os.utime(path, (number, number))
+    cache.get("owner/repo", 0, "sha")
+
+    cache.max_size_bytes = cache._total_size
+    cache.put("owner/repo", 3, "sha", {"file.py": os.urandom(100).hex()})
+
+    assert cache.get("owner/repo", 1, "sha") is None
+    assert cache.get("owner/repo", 0, "sha") is not None
+    assert cache.get("owner/repo", 3, "sha") is not None
+    assert cache._total_size <= cache.max_size_bytes
+
+def test_corrupt_entry_is_a_miss(cache: DiffCache) -> None:
+    cache.put("owner/repo", 1, "abc", {"file.py": "diff"})
+    cache._path("owner/repo", 1, "abc").write_bytes(b"not zlib")
+
+    assert cache.get("owner/repo", 1, "abc") is None
+
+def test_clear(cache: DiffCache) -> None:
+    cache.put("owner/repo", 1, "abc", {"file.py": "diff"})
+
+    cache.clear()
+
+    assert cache.get("owner/repo", 1, "abc") is None
+    assert list(cache.cache_dir.iterdir()) == []
@@ -0,0 +1,121 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterable, List
+
+from code_analysis_tool.models.pull_request import PullRequest
+from .pull_request_utils import filename, diff
+
+@dataclass(slots=True)
+class LineStats:
+    """Line and hunk counts of one or more file diffs."""
+    additions: int = 0
+    deletions: int = 0
+    files_changed: int = 0
+    hunks: int = 0
+
+    @property
+    def churn(self) -> int:
+        """Total lines touched, additions plus deletions"""
+        return self.additions + self.deletions
+
+    def add(self, other: "LineStats") -> None:
+        self.additions += other.additions
+        self.deletions += other.deletions
+        self.files_changed += other.files_changed
+        self.hunks += other.hunks
+
+@dataclass(slots=True)
+class DiffStats(LineStats):
+    """Line stats of a diff, in total and by file extension ("" for files without one)."""
+    by_file_type: dict[str, LineStats] = field(default_factory=dict)
+
+    def add(self, other: "DiffStats") -> None:
+        LineStats.add(self, other)
+        for file_type, stats in other.by_file_type.items():
+            self.by_file_type.setdefault(file_type, LineStats()).add(stats)
+
+@dataclass(slots=True)
+class PullRequestStats:
+    """Diff stats of a single pull request."""
+    repository: str
+    number: int
+    author: str
+    stats: DiffStats
+
+def file_type(name: filename) -> str:
+    """Lower case extension of a file without the dot, "" if it has none"""
+    return os.path.splitext(name)[1][1:].lower()
+
+def compute_diff_stats(file_diffs: dict[filename, diff]) -> DiffStats:
+    """
+    Compute the stats of a diff in a single pass over its patches.
+
+    Patches are expected in the files API format, starting at the first hunk header,
+    as returned by file_diffs. Counting is done with str.count on line prefixes rather
+    than splitting patches into lines, since large patches dominate the cost.
+
+    Args:
+        file_diffs: Patch by filename
+
+    Returns:
+        Totals and a breakdown by file type
+    """
+    stats = DiffStats()
+    for name, patch in file_diffs.items():
+        # Every line but the first follows a newline and the first is always a hunk header
+        file_stats = LineStats(
+            additions=patch.count("\n+"),
+            deletions=patch.count("\n-"),
+            files_changed=1,
+            hunks=patch.count("\n@@") + patch.startswith("@@")
+        )
+        LineStats.add(stats, file_stats)
+        stats.by_file_type.setdefault(file_type(name), LineStats()).add(file_stats)
+    return stats
+
+def compute_pull_request_stats(
+    pull_requests: Iterable[PullRequest],
+    processes: int = 1,
+    chunksize: int = 64
+) -> List[PullRequestStats]:
+    """
+    Compute the diff stats of many pull requests.
+
+    Diffs are loaded through file_diffs in the calling thread, so call prefetch_diffs
+    first for pull requests whose diffs haven't been loaded. With processes above 1
+    the counting is spread over a process pool, which pays off for large batches of
+    big diffs; only the diffs are sent to the workers.
+
+    Args:
+        pull_requests: Pull requests to compute the stats of
+        processes: Number of worker processes, 1 to compute in this process
+        chunksize: Number of diffs sent to a worker at a time
+
+    Returns:
+        Stats for each pull request, in the order given
+    """
+    pull_requests = list(pull_requests)
+    file_diffs = [pr.file_diffs for pr in pull_requests]
+    if processes > 1 and len(pull_requests) > chunksize:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            all_stats = list(executor.map(compute_diff_stats, file_diffs, chunksize=chunksize))
+    else:
+        all_stats = [compute_diff_stats(diffs) for diffs in file_diffs]
+
+    return [
+        PullRequestStats(repository=pr.repository.full_name, number=pr.number, author=pr.author.login, stats=stats)
+        for pr, stats in zip(pull_requests, all_stats)
+    ]
+
+def stats_by_author(pull_request_stats: Iterable[PullRequestStats]) -> dict[str, DiffStats]:
+    """
+    Sum pull request stats per author login.
+
+    Returns:
+        Combined stats by author, where files_changed counts a file once per pull request
+    """
+    by_author: dict[str, DiffStats] = {}
+    for pr_stats in pull_request_stats:
+        by_author.setdefault(pr_stats.author, DiffStats()).add(pr_stats.stats)
+    return by_author
@@ -0,0 +1,65 @@
+from datetime import datetime, timezone
+
+from code_analysis_tool.diff_stats import DiffStats, LineStats, compute_diff_stats, compute_pull_request_stats, stats_by_author
+from code_analysis_tool.models.pull_request import PullRequest
+from code_analysis_tool.models.repository import Repository
+from code_analysis_tool.models.user import User
+
+PYTHON_PATCH = "@@ -1,3 +1,3 @@\n import os\n-old()\n+new()\n@@ -10,1 +10,2 @@\n run()\n+cleanup()"
+MARKDOWN_PATCH = "@@ -1 +1 @@\n--- a rule\n+Heading\n\\ No newline at end of file"
+
+def create_pull_request(number: int, author: str, file_diffs: dict[str, str]) -> PullRequest:
+    user = User(id=author, login=author)
+    return PullRequest(
+        id=str(number),
+        number=number,
+        title=f"PR {number}",
+        author=user,
+        repository=Repository(id="1", name="repo", full_name="owner/repo", owner=user),
+        created_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        merged_at=datetime(2024, 1, 2, tzinfo=timezone.utc),
+        merged=True,
+        description=None,
+        file_diffs=file_diffs
+    )
+
+def test_compute_diff_stats() -> None:
+    """Test totals and file type breakdown of a diff"""
+    stats = compute_diff_stats({"src/app.py": PYTHON_PATCH, "README.MD": MARKDOWN_PATCH, "Makefile": "@@ -1 +1 @@\n-a\n+b"})
+
+    assert (stats.additions, stats.deletions, stats.files_changed, stats.hunks) == (4, 3, 3, 4)
+    assert stats.churn == 7
+    assert stats.by_file_type == {
+        "py": LineStats(additions=2, deletions=1, files_changed=1, hunks=2),
+        "md": LineStats(additions=1, deletions=1, files_changed=1, hunks=1),
+        "": LineStats(additions=1, deletions=1, files_changed=1, hunks=1),
+    }
+
+def test_compute_diff_stats_empty() -> None:
+    """Test a pull request without diffs"""
+    assert compute_diff_stats({}) == DiffStats()
+
+def test_compute_pull_request_stats_and_by_author() -> None:
+    """Test per pull request stats and summing them per author"""
+    pull_requests = [
+        create_pull_request(1, "alice", {"app.py": PYTHON_PATCH}),
+        create_pull_request(2, "bob", {"README.md": MARKDOWN_PATCH}),
+        create_pull_request(3, "alice", {"app.py": PYTHON_PATCH, "docs.md": MARKDOWN_PATCH}),
+    ]
+
+    result = compute_pull_request_stats(pull_requests)
+
+    assert [(stats.number, stats.author, stats.stats.churn) for stats in result] == [(1, "alice", 3), (2, "bob", 2), (3, "alice", 5)]
+    by_author = stats_by_author(result)
+    assert by_author["alice"].churn == 8
+    assert by_author["alice"].files_changed == 3
+    assert by_author["alice"].by_file_type["py"].additions == 4
+    assert by_author["bob"].by_file_type == {"md": LineStats(additions=1, deletions=1, files_changed=1, hunks=1)}
+
+def test_compute_pull_request_stats_in_processes() -> None:
+    """Test that the process pool gives the same stats as computing inline"""
+    pull_requests = [create_pull_request(number, "alice", {f"file{number}.py": PYTHON_PATCH}) for number in range(10)]
+
+    in_processes = compute_pull_request_stats(pull_requests, processes=2, chunksize=2)
+
+    assert in_processes == compute_pull_request_stats(pull_requests)
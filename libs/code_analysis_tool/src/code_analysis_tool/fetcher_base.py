@@ -0,0 +1,165 @@
+import inspect
+import functools
+import threading
+from abc import abstractmethod
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, Optional, TypeVar
+
+from code_analysis_tool.interfaces import SourceControlFetcher
+from code_analysis_tool.models.repository import Repository
+from code_analysis_tool.models.pull_request import PullRequest
+from code_analysis_tool.models.user import User
+from .rest_client import map_concurrently
+
+T = TypeVar('T')
+F = TypeVar('F', bound=Callable[..., Any])
+
+def fetch_scope(method: F) -> F:
+    """
+    Decorator running a ModelInterning client method within a fetch scope. Generator
+    methods stay in the scope until they are exhausted or closed.
+    """
+    if inspect.isasyncgenfunction(method):
+        @functools.wraps(method)
+        async def async_generator_wrapper(self: "ModelInterning", *args: Any, **kwargs: Any) -> Any:
+            with self._fetch_scope():
+                async for item in method(self, *args, **kwargs):
+                    yield item
+        return async_generator_wrapper
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def coroutine_wrapper(self: "ModelInterning", *args: Any, **kwargs: Any) -> Any:
+            with self._fetch_scope():
+                return await method(self, *args, **kwargs)
+        return coroutine_wrapper
+    if inspect.isgeneratorfunction(method):
+        @functools.wraps(method)
+        def generator_wrapper(self: "ModelInterning", *args: Any, **kwargs: Any) -> Any:
+            with self._fetch_scope():
+                yield from method(self, *args, **kwargs)
+        return generator_wrapper
+
+    @functools.wraps(method)
+    def wrapper(self: "ModelInterning", *args: Any, **kwargs: Any) -> Any:
+        with self._fetch_scope():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+class ModelInterning:
+    """
+    Mixin for clients that convert API payloads to models: converted users and repositories
+    are kept by ID, so every pull request from a fetch shares one instance of each.
+
+    The tables only live as long as a fetch. Public methods are marked with fetch_scope, and
+    once no fetch is running the tables are emptied, so a long-lived client neither grows
+    without bound nor keeps returning users and repositories converted long ago.
+    Overlapping and nested fetches share the tables.
+    """
+
+    def __init__(self) -> None:
+        self._users: dict[str, User] = {}
+        self._repositories: dict[str, Repository] = {}
+        self._running_fetches = 0
+        self._fetch_lock = threading.Lock()
+
+    @contextmanager
+    def _fetch_scope(self) -> Iterator[None]:
+        with self._fetch_lock:
+            self._running_fetches += 1
+        try:
+            yield
+        finally:
+            with self._fetch_lock:
+                self._running_fetches -= 1
+                if self._running_fetches == 0:
+                    self._users.clear()
+                    self._repositories.clear()
+
+    @staticmethod
+    def _intern(interned: dict[str, T], key: str, create: Callable[[], T]) -> T:
+        """Return the instance stored under key, creating and storing it on first use."""
+        instance = interned.get(key)
+        if instance is None:
+            # setdefault is atomic, so concurrent fetches agree on a single instance
+            instance = interned.setdefault(key, create())
+        return instance
+
+    def _interned_repository(self, repo_name: str) -> Optional[Repository]:
+        """The converted repository with this full name, if there is one."""
+        for repository in list(self._repositories.values()):
+            if repository.full_name == repo_name:
+                return repository
+        return None
+
+class ConcurrentFetcher(ModelInterning, SourceControlFetcher):
+    """
+    Base for source control fetchers that fetch a user's repositories concurrently,
+    on up to max_workers threads. Subclasses set max_workers and implement
+    _fetch_repository.
+    """
+
+    max_workers: int
+
+    @abstractmethod
+    def _fetch_repository(self, repo_name: str) -> Repository:
+        """Fetch and convert a repository by its full name."""
+        pass
+
+    @fetch_scope
+    def get_repository(self, repo_name: str) -> Repository:
+        """Get a repository by its full name, without a request if it has already been converted."""
+        try:
+            return self._interned_repository(repo_name) or self._fetch_repository(repo_name)
+        except Exception as e:
+            raise Exception(f"Failed to fetch repository {repo_name}: {str(e)}")
+
+    def _fetch_repository_pull_requests(self, repository: Repository, since_date: Optional[str]) -> List[PullRequest]:
+        """Fetch the merged pull requests of one of the repositories of get_merged_pull_requests_for_user."""
+        return self.get_merged_pull_requests(repository.full_name, since_date)
+
+    def _fetch_merged_pull_requests_concurrently(
+        self,
+        repositories: List[Repository],
+        since_date: Optional[str]
+    ) -> Iterator[tuple[int, List[PullRequest]]]:
+        """Fetch merged pull requests for each repository on a bounded worker pool, yielding (index, pulls) as they complete."""
+        return map_concurrently(
+            lambda repo: self._fetch_repository_pull_requests(repo, since_date),
+            repositories,
+            self.max_workers,
+            thread_name_prefix="repository-fetch"
+        )
+
+    @fetch_scope
+    def get_merged_pull_requests_for_user(
+        self,
+        user_id: str,
+        since_date: Optional[str] = None
+    ) -> List[PullRequest]:
+        try:
+            repositories = self.get_user_repositories(user_id)
+            merged_pulls_by_repo: List[List[PullRequest]] = [[] for _ in repositories]
+            for index, merged_pulls in self._fetch_merged_pull_requests_concurrently(repositories, since_date):
+                merged_pulls_by_repo[index] = merged_pulls
+
+            # Keep the repository order regardless of which fetch finished first
+            return [pr for merged_pulls in merged_pulls_by_repo for pr in merged_pulls]
+        except Exception as e:
+            raise Exception(f"Failed to fetch merged pull requests for user ID {user_id}: {str(e)}")
+
+    @fetch_scope
+    def iter_merged_pull_requests_for_user(
+        self,
+        user_id: str,
+        since_date: Optional[str] = None
+    ) -> Iterator[PullRequest]:
+        """
+        Like get_merged_pull_requests_for_user but yields each repository's pull requests
+        as soon as that repository has been fetched, in completion order.
+        """
+        try:
+            repositories = self.get_user_repositories(user_id)
+            for _, merged_pulls in self._fetch_merged_pull_requests_concurrently(repositories, since_date):
+                yield from merged_pulls
+        except Exception as e:
+            raise Exception(f"Failed to fetch merged pull requests for user ID {user_id}: {str(e)}")
@@ -0,0 +1,94 @@
+import asyncio
+from typing import AsyncIterator, Iterator, List, Optional
+
+from code_analysis_tool.fetcher_base import ConcurrentFetcher, ModelInterning, fetch_scope
+from code_analysis_tool.models.pull_request import PullRequest
+from code_analysis_tool.models.repository import Repository
+from code_analysis_tool.models.user import User
+
+class FakeFetcher(ConcurrentFetcher):
+    """Converts users and repositories from names, counting repository fetches"""
+
+    def __init__(self, repo_names: List[str]) -> None:
+        super().__init__()
+        self.max_workers = 2
+        self.repo_names = repo_names
+        self.fetched: List[str] = []
+
+    def _convert_repository(self, repo_name: str) -> Repository:
+        owner_login = repo_name.split("/")[0]
+        owner = self._intern(self._users, owner_login, lambda: User(id=owner_login, login=owner_login))
+        return self._intern(self._repositories, repo_name, lambda: Repository(
+            id=repo_name,
+            name=repo_name.split("/")[1],
+            full_name=repo_name,
+            owner=owner
+        ))
+
+    def _fetch_repository(self, repo_name: str) -> Repository:
+        self.fetched.append(repo_name)
+        return self._convert_repository(repo_name)
+
+    def get_user_by_id(self, user_id: str) -> Optional[User]:
+        return None
+
+    def get_user_repositories(self, user_id: str) -> List[Repository]:
+        return list(self.iter_user_repositories(user_id))
+
+    @fetch_scope
+    def iter_user_repositories(self, user_id: str) -> Iterator[Repository]:
+        for repo_name in self.repo_names:
+            yield self._convert_repository(repo_name)
+
+    def get_merged_pull_requests(self, repo_name: str, since_date: Optional[str] = None) -> List[PullRequest]:
+        # Called for every repository of the user, which were converted earlier in the same fetch
+        self.get_repository(repo_name)
+        return []
+
+def test_repositories_are_reused_within_a_fetch() -> None:
+    fetcher = FakeFetcher(["owner/a", "owner/b"])
+
+    fetcher.get_merged_pull_requests_for_user("owner")
+
+    assert fetcher.fetched == []
+
+def test_tables_are_emptied_after_a_fetch() -> None:
+    fetcher = FakeFetcher(["owner/a", "owner/b"])
+
+    first = fetcher.get_user_repositories("owner")
+    second = fetcher.get_user_repositories("owner")
+
+    assert first[0].owner is first[1].owner
+    assert second[0] == first[0] and second[0] is not first[0]
+    assert not fetcher._users and not fetcher._repositories
+
+def test_generator_keeps_its_scope_until_closed() -> None:
+    fetcher = FakeFetcher(["owner/a", "owner/b"])
+
+    repositories = fetcher.iter_user_repositories("owner")
+    first = next(repositories)
+    assert fetcher._repositories == {"owner/a": first}
+
+    repositories.close()
+    assert not fetcher._repositories
+
+def test_async_methods_are_scoped() -> None:
+    class AsyncFetcher(ModelInterning):
+        @fetch_scope
+        async def get_user(self, login: str) -> User:
+            await asyncio.sleep(0)
+            return self._intern(self._users, login, lambda: User(id=login, login=login))
+
+        @fetch_scope
+        async def iter_users(self, logins: List[str]) -> AsyncIterator[User]:
+            for login in logins:
+                yield await self.get_user(login)
+
+    fetcher = AsyncFetcher()
+
+    async def fetch() -> List[User]:
+        return [user async for user in fetcher.iter_users(["a", "a"])]
+    users = asyncio.run(fetch())
+
+    assert users[0] is users[1]
+    assert not fetcher._users
@@ -0,0 +1,106 @@
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from github import Auth, GithubIntegration
+from github.Consts import DEFAULT_BASE_URL
+
+class InstallationTokenAuth(Auth.Auth):
+    """
+    PyGithub Auth for a GitHub App installation that mints installation tokens and
+    caches them until shortly before they expire.
+
+    One instance can be shared by every thread and Github instance using the installation.
+    Requests only read the cached token, a new one is minted once when the cached token
+    is within refresh_margin_secs of expiring, while the other threads wait for it.
+    Compared to PyGithub's AppInstallationAuth this never mints concurrently and
+    refreshes early enough that long paginations don't run into an expired token.
+    """
+
+    def __init__(
+        self,
+        app_id: int | str,
+        private_key: str,
+        installation_id: int,
+        refresh_margin_secs: int = 300,
+        permissions: Optional[dict[str, str]] = None,
+        base_url: str = DEFAULT_BASE_URL,
+        integration: Optional[GithubIntegration] = None
+    ) -> None:
+        """
+        Args:
+            app_id: ID of the GitHub App
+            private_key: PEM private key of the GitHub App
+            installation_id: ID of the installation to mint tokens for
+            refresh_margin_secs: How long before expiry a token is replaced
+            permissions: Permissions to restrict the tokens to, defaults to all of the installation's
+            base_url: GitHub API URL, for GitHub Enterprise
+            integration: GithubIntegration to mint tokens with, created from the app credentials if not given
+        """
+        self.app_id = app_id
+        self.installation_id = installation_id
+        self.refresh_margin = timedelta(seconds=refresh_margin_secs)
+        self.permissions = permissions
+        self._integration = integration or GithubIntegration(auth=Auth.AppAuth(app_id, private_key), base_url=base_url)
+        self._token: Optional[str] = None
+        self._expires_at: Optional[datetime] = None
+        self._lock = threading.Lock()
+
+    @property
+    def token_type(self) -> str:
+        return "token"
+
+    def _is_fresh(self) -> bool:
+        return self._token is not None and datetime.now(timezone.utc) < self._expires_at - self.refresh_margin
+
+    @property
+    def token(self) -> str:
+        # Reading the cached token doesn't need the lock, only minting does
+        if self._is_fresh():
+            return self._token
+        with self._lock:
+            # Another thread may have minted while this one waited for the lock
+            if not self._is_fresh():
+                try:
+                    authorization = self._integration.get_access_token(self.installation_id, permissions=self.permissions)
+                except Exception as e:
+                    raise RuntimeError(f"Failed to mint a token for installation {self.installation_id} of GitHub App {self.app_id}: {str(e)}") from e
+                # Set the expiry first so an unlocked reader never sees the new token with the old expiry
+                self._expires_at = authorization.expires_at
+                self._token = authorization.token
+            return self._token
+
+    @property
+    def _masked_token(self) -> str:
+        return "token (installation token removed)"
+
+def installation_auths(
+    app_id: int | str,
+    private_key: str,
+    refresh_margin_secs: int = 300,
+    base_url: str = DEFAULT_BASE_URL
+) -> dict[str, InstallationTokenAuth]:
+    """
+    Create an InstallationTokenAuth for every installation of a GitHub App, by the login of
+    the account it is installed on. An installation token can only access its own account's
+    repositories, so use one GitHubClient per installation, picked by the repository owner,
+    rather than pooling them in one client.
+
+    Args:
+        app_id: ID of the GitHub App
+        private_key: PEM private key of the GitHub App
+        refresh_margin_secs: How long before expiry a token is replaced
+        base_url: GitHub API URL, for GitHub Enterprise
+    """
+    integration = GithubIntegration(auth=Auth.AppAuth(app_id, private_key), base_url=base_url)
+    return {
+        installation.account.login: InstallationTokenAuth(
+            app_id,
+            private_key,
+            installation.id,
+            refresh_margin_secs=refresh_margin_secs,
+            base_url=base_url,
+            integration=integration
+        )
+        for installation in integration.get_installations()
+    }
@@ -0,0 +1,83 @@
+import threading
+import time
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, patch
+
+from code_analysis_tool.github_app_auth import InstallationTokenAuth, installation_auths
+from code_analysis_tool.github_client import GitHubClient
+
+def create_integration(expires_in: timedelta = timedelta(hours=1)) -> Mock:
+    integration = Mock()
+    minted = []
+    def get_access_token(installation_id: int, permissions: dict | None = None) -> Mock:
+        minted.append(installation_id)
+        return Mock(token=f"token-{len(minted)}", expires_at=datetime.now(timezone.utc) + expires_in)
+    integration.get_access_token.side_effect = get_access_token
+    return integration
+
+def test_token_is_cached() -> None:
+    integration = create_integration()
+    auth = InstallationTokenAuth(1, "key", 42, integration=integration)
+
+    assert [auth.token for _ in range(3)] == ["token-1"] * 3
+    integration.get_access_token.assert_called_once_with(42, permissions=None)
+
+    headers: dict[str, str] = {}
+    auth.authentication(headers)
+    assert headers == {"Authorization": "token token-1"}
+
+def test_token_refreshed_within_margin() -> None:
+    # Tokens expire in 4 minutes, inside the 5 minute refresh margin, so each read mints again
+    integration = create_integration(expires_in=timedelta(minutes=4))
+    auth = InstallationTokenAuth(1, "key", 42, refresh_margin_secs=300, integration=integration)
+
+    assert auth.token == "token-1"
+    assert auth.token == "token-2"
+
+def test_concurrent_readers_mint_once() -> None:
+    integration = create_integration()
+    original = integration.get_access_token.side_effect
+    def slow_get_access_token(*args, **kwargs) -> Mock:
+        time.sleep(0.05)
+        return original(*args, **kwargs)
+    integration.get_access_token.side_effect = slow_get_access_token
+    auth = InstallationTokenAuth(1, "key", 42, integration=integration)
+    barrier = threading.Barrier(8)
+    tokens = []
+
+    def read() -> None:
+        barrier.wait()
+        tokens.append(auth.token)
+    threads = [threading.Thread(target=read) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert tokens == ["token-1"] * 8
+    integration.get_access_token.assert_called_once()
+
+def test_mint_failure() -> None:
+    integration = Mock()
+    integration.get_access_token.side_effect = Exception("Bad credentials")
+    auth = InstallationTokenAuth(1, "key", 42, integration=integration)
+
+    with pytest.raises(RuntimeError) as exc_info:
+        auth.token
+
+    assert str(exc_info.value) == "Failed to mint a token for installation 42 of GitHub App 1: Bad credentials"
+
+def test_installation_auths_by_owner() -> None:
+    integration = create_integration()
+    integration.get_installations.return_value = [
+        Mock(id=1, account=Mock(login="org-a")),
+        Mock(id=2, account=Mock(login="org-b"))
+    ]
+
+    with patch("code_analysis_tool.github_app_auth.GithubIntegration", return_value=integration):
+        auths = installation_auths(1, "key")
+
+    assert {owner: auth.installation_id for owner, auth in auths.items()} == {"org-a": 1, "org-b": 2}
+    github_client = GitHubClient(auths["org-a"])
+    assert github_client.github.requester.auth is auths["org-a"]
@@ -1,43 +1,285 @@
-from typing import List, Optional
+import time
+import threading
+from abc import abstractmethod
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterator, List, Optional, Sequence
 from loguru import logger
+import requests
+from requests.adapters import HTTPAdapter
 
 from github import Github, Auth
 from github.PaginatedList import PaginatedList
 from github.Repository import Repository as GithubRepository
 from github.PullRequest import PullRequest as GithubPullRequest
 from github.NamedUser import NamedUser
+from github.PullRequestReview import PullRequestReview
 from dateutil.parser import parse
 
-from code_analysis_tool.interfaces import SourceControlFetcher
 from code_analysis_tool.models.repository import Repository
 from code_analysis_tool.models.pull_request import PullRequest
+from code_analysis_tool.models.review import Review
 from code_analysis_tool.models.user import User
-from .pull_request_utils import get_raw_diff
+from .diff_cache import DiffCache
+from .fetcher_base import ConcurrentFetcher, ModelInterning, fetch_scope
+from .pull_request_utils import get_raw_diff, get_streamed_diff, filename, diff
 
-class GitHubClient(SourceControlFetcher):
-    def __init__(self, access_token: str) -> None:
-        auth = Auth.Token(access_token)
-        self.github = Github(auth=auth)
+# The search API returns at most this many results for a query
+SEARCH_RESULT_LIMIT = 1000
+
+# Results per page of the search API
+SEARCH_PAGE_SIZE = 100
+
+# Fields of a RepositoryOwner, which only User and Organization implement
+OWNER_FIELDS = """
+    login
+    ... on User { databaseId name email }
+    ... on Organization { databaseId name email }
+"""
+
+# Fields of an Actor, like a pull request author, which can also be a Bot
+AUTHOR_FIELDS = f"""
+    {OWNER_FIELDS}
+    ... on Bot {{ databaseId }}
+"""
+
+REPOSITORY_FIELDS = f"""
+    databaseId
+    name
+    nameWithOwner
+    description
+    isPrivate
+    owner {{ {OWNER_FIELDS} }}
+"""
+
+PULL_REQUEST_FIELDS = f"""
+    databaseId
+    number
+    title
+    body
+    createdAt
+    updatedAt
+    mergedAt
+    merged
+    additions
+    deletions
+    changedFiles
+    headRefOid
+    author {{ {AUTHOR_FIELDS} }}
+    repository {{ {REPOSITORY_FIELDS} }}
+"""
+
+def pull_requests_by_number_query(numbers: Sequence[int]) -> str:
+    """GraphQL query for several pull requests of a repository by number, aliased as pr<number>."""
+    pull_requests = "\n".join(f"pr{number}: pullRequest(number: {number}) {{ {PULL_REQUEST_FIELDS} }}" for number in numbers)
+    return f"""
+query($owner: String!, $name: String!) {{
+  repository(owner: $owner, name: $name) {{
+    {pull_requests}
+  }}
+}}
+"""
+
+class GraphQLConversion(ModelInterning):
+    """
+    Mixin converting GitHub GraphQL payloads, selected with the fields above, to models.
+    Subclasses implement _graphql_diff_loader to load the diffs of converted pull requests.
+    """
+
+    @abstractmethod
+    def _graphql_diff_loader(self, repo_name: str, number: int, head_sha: str) -> Callable[[], dict[filename, diff]]:
+        """Loader for the diff of a pull request, called when its file_diffs are first read."""
+        pass
+
+    def _convert_graphql_user(self, actor: Optional[dict[str, Any]]) -> User:
+        """Convert a GraphQL actor to platform-agnostic User model."""
+        # Deleted accounts come back as null authors, GitHub shows them as "ghost"
+        actor = actor or {"login": "ghost"}
+        user_id = str(actor.get("databaseId", ""))
+        return self._intern(self._users, user_id or actor["login"], lambda: User(
+            id=user_id,
+            login=actor["login"],
+            name=actor.get("name") or None,
+            # Email is an empty string when it's private or the token lacks the user:email scope
+            email=actor.get("email") or None
+        ))
+
+    def _convert_graphql_repository(self, repo: dict[str, Any]) -> Repository:
+        """Convert a GraphQL repository to platform-agnostic Repository model."""
+        return self._intern(self._repositories, str(repo["databaseId"]), lambda: Repository(
+            id=str(repo["databaseId"]),
+            name=repo["name"],
+            full_name=repo["nameWithOwner"],
+            owner=self._convert_graphql_user(repo["owner"]),
+            description=repo["description"],
+            private=repo["isPrivate"]
+        ))
+
+    def _convert_graphql_pull_request(self, pr: dict[str, Any]) -> PullRequest:
+        """Convert a GraphQL pull request to platform-agnostic PullRequest model."""
+        repository = self._convert_graphql_repository(pr["repository"])
+        return PullRequest(
+            id=str(pr["databaseId"]),
+            number=pr["number"],
+            title=pr["title"],
+            author=self._convert_graphql_user(pr["author"]),
+            repository=repository,
+            created_at=parse(pr["createdAt"]),
+            merged_at=parse(pr["mergedAt"]) if pr["mergedAt"] else None,
+            merged=pr["merged"],
+            description=pr["body"],
+            additions=pr["additions"],
+            deletions=pr["deletions"],
+            changed_files=pr["changedFiles"],
+            file_diffs=None,  # Don't load diffs immediately
+            _diff_loader=self._graphql_diff_loader(repository.full_name, pr["number"], pr["headRefOid"])
+        )
+
+    def _convert_graphql_pull_requests_by_number(self, repository: dict[str, Any], numbers: Sequence[int]) -> List[PullRequest]:
+        """Convert the pull requests of a pull_requests_by_number_query response, skipping numbers that weren't found."""
+        return [self._convert_graphql_pull_request(repository[f"pr{number}"]) for number in numbers if repository.get(f"pr{number}")]
+
+class GitHubClient(GraphQLConversion, ConcurrentFetcher):
+    def __init__(
+        self,
+        access_token: str | Auth.Auth | Sequence[str | Auth.Auth],
+        max_workers: int = 8,
+        rate_limit_floor: int = 50,
+        diff_cache: Optional[DiffCache] = None,
+        stream_diffs: bool = False
+    ) -> None:
+        """
+        Args:
+            access_token: GitHub personal access token or other PyGithub Auth, or several of them
+                whose rate limits are pooled by sending each request with the one that has the most budget left
+            max_workers: Maximum number of repositories fetched concurrently
+            rate_limit_floor: Remaining request budget below which workers wait for the rate limit to reset
+            diff_cache: Cache that pull request diffs are read from and stored in
+            stream_diffs: Load each pull request's diff as one streamed unified diff instead of paging
+                through its files, which is faster and complete for very large pull requests
+        """
+        super().__init__()
+        credentials = [access_token] if isinstance(access_token, (str, Auth.Auth)) else list(access_token)
+        if not credentials:
+            raise ValueError("At least one access token is required")
+        # PyGithub's default fixed delay between requests is shared by all threads and would
+        # serialize concurrent fetches. Rate limits are handled by its retry policy and
+        # _wait_for_rate_limit instead.
+        self._githubs: List[Github] = [
+            Github(
+                auth=Auth.Token(credential) if isinstance(credential, str) else credential,
+                per_page=100,
+                pool_size=max_workers,
+                seconds_between_requests=None
+            )
+            for credential in credentials
+        ]
+        self._next_github = 0
+        self._github_lock = threading.Lock()
+        self.max_workers = max_workers
+        self.rate_limit_floor = rate_limit_floor
+        self.diff_cache = diff_cache
+        self.stream_diffs = stream_diffs
+        self._diff_session: Optional[requests.Session] = None
+        if stream_diffs:
+            self._diff_session = requests.Session()
+            self._diff_session.mount("https://", HTTPAdapter(pool_maxsize=max_workers))
+        # Search has its own rate limit of 30 requests a minute per token: (remaining, reset time) by Github instance
+        self._search_rate_limits: dict[Github, tuple[int, float]] = {}
+        self._search_lock = threading.Lock()
+
+    @staticmethod
+    def _remaining(github: Github) -> float:
+        """Remaining budget from the last response headers, infinite if there hasn't been a response yet."""
+        # Read from the last response headers, this doesn't make a request
+        remaining, _ = github.requester.rate_limiting
+        return float("inf") if remaining < 0 else remaining
+
+    @property
+    def github(self) -> Github:
+        """
+        The Github instance to send the next request with: the one whose token has the most
+        remaining budget, rotating between ties. Objects fetched through an instance, like
+        paginated lists, keep using that instance's token.
+        """
+        if len(self._githubs) == 1:
+            return self._githubs[0]
+        with self._github_lock:
+            self._next_github = (self._next_github + 1) % len(self._githubs)
+            rotated = self._githubs[self._next_github:] + self._githubs[:self._next_github]
+        return max(rotated, key=self._remaining)
+
+    @github.setter
+    def github(self, github: Github) -> None:
+        self._githubs = [github]
+
+    def _wait_for_rate_limit(self) -> None:
+        """Sleep until a rate limit resets if the remaining budget of every token is nearly spent."""
+        remaining = max(self._remaining(github) for github in self._githubs)
+        if remaining >= self.rate_limit_floor:
+            return
+        delay = min(github.requester.rate_limiting_resettime for github in self._githubs) - time.time()
+        if delay > 0:
+            logger.warning(f"{remaining:.0f} GitHub requests left, waiting {delay:.0f}s for the rate limit to reset")
+            time.sleep(delay)
+
+    def _query(self, query: str, variables: dict[str, Any]) -> dict[str, Any]:
+        self._wait_for_rate_limit()
+        _, response = self.github.requester.graphql_query(query, variables)
+        return response["data"]
+
+    def _diff_loader(
+        self,
+        repo_name: str,
+        number: int,
+        head_sha: str,
+        load: Callable[[], dict[filename, diff]]
+    ) -> Callable[[], dict[filename, diff]]:
+        """
+        Wrap a diff loader so it goes through the diff cache, if there is one.
+        load is replaced by a streamed diff request when stream_diffs is set.
+        """
+        if self.stream_diffs:
+            load = lambda: get_streamed_diff(self.github.requester, repo_name, number, self._diff_session)
+        if self.diff_cache is None:
+            return load
+
+        def load_cached() -> dict[filename, diff]:
+            diffs = self.diff_cache.get(repo_name, number, head_sha)
+            if diffs is None:
+                diffs = load()
+                self.diff_cache.put(repo_name, number, head_sha, diffs)
+            return diffs
+        return load_cached
+
+    def _graphql_diff_loader(self, repo_name: str, number: int, head_sha: str) -> Callable[[], dict[filename, diff]]:
+        return self._diff_loader(
+            repo_name,
+            number,
+            head_sha,
+            lambda: get_raw_diff(self.github.get_repo(repo_name).get_pull(number))
+        )
 
     def _convert_user(self, github_user: NamedUser) -> User:
         """Convert GitHub user to platform-agnostic User model."""
-        return User(
+        # Pull request authors are partial users, reading name and email fetches the whole user,
+        # so interning also saves a request per repeated author
+        return self._intern(self._users, str(github_user.id), lambda: User(
             id=str(github_user.id),
             login=github_user.login,
             name=github_user.name,
             email=github_user.email
-        )
+        ))
 
     def _convert_repository(self, github_repo: GithubRepository) -> Repository:
         """Convert GitHub repository to platform-agnostic Repository model."""
-        return Repository(
+        return self._intern(self._repositories, str(github_repo.id), lambda: Repository(
             id=str(github_repo.id),
             name=github_repo.name,
             full_name=github_repo.full_name,
             owner=self._convert_user(github_repo.owner),
             description=github_repo.description,
             private=github_repo.private
-        )
+        ))
 
     def _convert_pull_request(self, github_pr: GithubPullRequest) -> PullRequest:
         """Convert GitHub pull request to platform-agnostic PullRequest model."""
@@ -49,12 +291,44 @@ class GitHubClient(SourceControlFetcher):
             repository=self._convert_repository(github_pr.base.repo),
             created_at=github_pr.created_at,
             merged_at=github_pr.merged_at,
-            merged=github_pr.merged,
+            merged=github_pr.merged_at is not None,
             description=github_pr.body,
             file_diffs=None,  # Don't load diffs immediately
-            _diff_loader=lambda: get_raw_diff(github_pr)  # Provide loader function
+            _diff_loader=self._diff_loader(
+                github_pr.base.repo.full_name,
+                github_pr.number,
+                github_pr.head.sha,
+                lambda: get_raw_diff(github_pr)
+            )
+        )
+
+    def _convert_review(self, github_review: PullRequestReview) -> Review:
+        """Convert GitHub pull request review to platform-agnostic Review model."""
+        return Review(
+            id=str(github_review.id),
+            # Reviews by deleted accounts have no user, GitHub shows them as "ghost"
+            author=self._convert_user(github_review.user) if github_review.user else User(id="", login="ghost"),
+            state=github_review.state,
+            submitted_at=github_review.submitted_at
         )
 
+    @fetch_scope
+    def get_pull_request_reviews(self, repo_name: str, number: int) -> List[Review]:
+        """Get the reviews of a pull request, oldest first."""
+        try:
+            self._wait_for_rate_limit()
+            # Listing the reviews directly saves fetching the repository and pull request first
+            reviews: PaginatedList[PullRequestReview] = PaginatedList(
+                PullRequestReview,
+                self.github.requester,
+                f"/repos/{repo_name}/pulls/{number}/reviews",
+                None
+            )
+            return [self._convert_review(review) for review in reviews]
+        except Exception as e:
+            raise Exception(f"Failed to fetch reviews for pull request {repo_name}#{number}: {str(e)}")
+
+    @fetch_scope
     def get_user_by_id(self, user_id: str) -> Optional[User]:
         try:
             github_user = self.github.get_user(user_id)
@@ -63,12 +337,20 @@ class GitHubClient(SourceControlFetcher):
             raise Exception(f"Failed to find user with ID {user_id}: {str(e)}")
 
     def get_user_repositories(self, user_id: str) -> List[Repository]:
+        return list(self.iter_user_repositories(user_id))
+
+    def _fetch_repository(self, repo_name: str) -> Repository:
+        return self._convert_repository(self.github.get_repo(repo_name))
+
+    @fetch_scope
+    def iter_user_repositories(self, user_id: str) -> Iterator[Repository]:
         try:
             user = self.github.get_user(user_id)
             if not user:
                 raise Exception(f"No GitHub user found with ID: {user_id}")
-            
-            return [self._convert_repository(repo) for repo in user.get_repos()]
+
+            for repo in user.get_repos():
+                yield self._convert_repository(repo)
         except Exception as e:
             raise Exception(f"Failed to fetch repositories for user ID {user_id}: {str(e)}")
 
@@ -77,40 +359,105 @@ class GitHubClient(SourceControlFetcher):
         repo_name: str, 
         since_date: Optional[str] = None
     ) -> List[PullRequest]:
+        return list(self.iter_merged_pull_requests(repo_name, since_date))
+
+    @fetch_scope
+    def iter_merged_pull_requests(
+        self,
+        repo_name: str,
+        since_date: Optional[str] = None
+    ) -> Iterator[PullRequest]:
         try:
-            repo = self.github.get_repo(repo_name)
-            pulls: PaginatedList[GithubPullRequest] = repo.get_pulls(state="closed", sort="updated", direction="desc")
-            
-            merged_pulls = []
-            for pr in pulls:
-                if not pr.merged:
-                    continue
-                if since_date:
-                    since_datetime = parse(since_date).astimezone()
-                    if pr.merged_at < since_datetime.astimezone(pr.merged_at.tzinfo):
-                        break
-                
-                merged_pulls.append(self._convert_pull_request(pr))
-            
-            return merged_pulls
+            since_datetime: Optional[datetime] = parse(since_date).astimezone(timezone.utc) if since_date else None
+            merged_pulls = self._search_merged_pull_requests(repo_name, since_datetime) if since_datetime else None
+            if merged_pulls is None:
+                merged_pulls = self._list_merged_pull_requests(repo_name, since_datetime)
+            yield from merged_pulls
         except ValueError as e:
             raise ValueError(f"Value error, potential issue in date format: {str(e)}")
         except Exception as e:
             raise Exception(f"Failed to fetch pull requests for repository {repo_name}: {str(e)}")
 
-    def get_merged_pull_requests_for_user(
-        self, 
-        user_id: str, 
-        since_date: Optional[str] = None
-    ) -> List[PullRequest]:
-        try:
-            repositories = self.get_user_repositories(user_id)
-            all_merged_pulls = []
-            
-            for repo in repositories:
-                merged_pulls = self.get_merged_pull_requests(repo.full_name, since_date)
-                all_merged_pulls.extend(merged_pulls)
-            
-            return all_merged_pulls
-        except Exception as e:
-            raise Exception(f"Failed to fetch merged pull requests for user ID {user_id}: {str(e)}")
+    def _search_merged_pull_requests(self, repo_name: str, since_datetime: datetime) -> Optional[Iterator[PullRequest]]:
+        """
+        Use the search API so that only pull requests merged since the date are transferred.
+        Search results are issues, so each page's pull requests are then fetched by number
+        with one GraphQL query rather than a REST request each.
+        Returns None if there are more matches than the search API can return.
+        """
+        query = f"repo:{repo_name} is:pr is:merged merged:>={since_datetime.isoformat(timespec='seconds')}"
+        # The first page is fetched up front, its total_count tells whether search can return every match
+        search = self._search_issues(query, page=1)
+        if search["total_count"] > SEARCH_RESULT_LIMIT:
+            logger.info(f"{search['total_count']} pull requests merged in {repo_name} since {since_datetime}, listing them instead of searching")
+            return None
+
+        def pages() -> Iterator[PullRequest]:
+            nonlocal search
+            page = 1
+            while search["items"]:
+                yield from self._get_pull_requests_by_number(repo_name, [issue["number"] for issue in search["items"]])
+                if page * SEARCH_PAGE_SIZE >= search["total_count"]:
+                    return
+                page += 1
+                search = self._search_issues(query, page)
+        return pages()
+
+    def _search_issues(self, query: str, page: int) -> dict[str, Any]:
+        """
+        Get a page of issue search results. Search has its own rate limit, so requests wait
+        here for the token's search budget rather than in _wait_for_rate_limit.
+        """
+        github = self.github
+        with self._search_lock:
+            remaining, reset_time = self._search_rate_limits.get(github, (1, 0.0))
+            if remaining > 0:
+                # Claim the request before sending it so concurrent searches can't overspend the budget
+                self._search_rate_limits[github] = (remaining - 1, reset_time)
+            else:
+                # Holding the lock while waiting also holds back the other searches
+                delay = reset_time - time.time()
+                if delay > 0:
+                    logger.warning(f"GitHub search rate limit spent, waiting {delay:.0f}s for it to reset")
+                    time.sleep(delay)
+                self._search_rate_limits.pop(github, None)
+
+        requester = github.requester
+        core_rate_limit = (requester.rate_limiting, requester.rate_limiting_resettime)
+        headers, search = requester.requestJsonAndCheck(
+            "GET",
+            "/search/issues",
+            parameters={"q": query, "per_page": SEARCH_PAGE_SIZE, "page": page}
+        )
+        if "x-ratelimit-remaining" in headers:
+            with self._search_lock:
+                self._search_rate_limits[github] = (int(headers["x-ratelimit-remaining"]), float(headers.get("x-ratelimit-reset", 0)))
+            # PyGithub tracks the budget of the last response, keep _wait_for_rate_limit reading the core budget
+            requester.rate_limiting, requester.rate_limiting_resettime = core_rate_limit
+        return search
+
+    def _get_pull_requests_by_number(self, repo_name: str, numbers: List[int]) -> List[PullRequest]:
+        """Fetch several pull requests of a repository with one GraphQL query."""
+        owner, name = repo_name.split("/", 1)
+        repository = self._query(pull_requests_by_number_query(numbers), {"owner": owner, "name": name})["repository"]
+        return self._convert_graphql_pull_requests_by_number(repository, numbers)
+
+    def _list_merged_pull_requests(self, repo_name: str, since_datetime: Optional[datetime]) -> Iterator[PullRequest]:
+        """List closed pull requests, most recently updated first, and yield the merged ones."""
+        repo = self.github.get_repo(repo_name)
+        pulls: PaginatedList[GithubPullRequest] = repo.get_pulls(state="closed", sort="updated", direction="desc")
+
+        for pr in pulls:
+            # Merging updates a pull request so updated_at >= merged_at, nothing after this can have been merged since
+            if since_datetime and pr.updated_at < since_datetime:
+                break
+            # merged_at is part of the list payload, pr.merged would fetch each pull request again
+            if pr.merged_at is None:
+                continue
+            if since_datetime and pr.merged_at < since_datetime:
+                continue
+            yield self._convert_pull_request(pr)
+
+    def _fetch_repository_pull_requests(self, repository: Repository, since_date: Optional[str]) -> List[PullRequest]:
+        self._wait_for_rate_limit()
+        return self.get_merged_pull_requests(repository.full_name, since_date)
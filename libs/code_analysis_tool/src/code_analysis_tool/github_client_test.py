@@ -1,14 +1,19 @@
+import re
+import time
+import threading
+from pathlib import Path
 from datetime import datetime, timezone
 import pytest
 from unittest.mock import Mock, patch
-from typing import Generator
+from typing import Generator, Optional
 
 from github.Repository import Repository as GithubRepository
 from github.PullRequest import PullRequest as GithubPullRequest
 from github.NamedUser import NamedUser
 from github.File import File
 
-from code_analysis_tool.github_client import GitHubClient
+from code_analysis_tool.diff_cache import DiffCache
+from code_analysis_tool.github_client import GitHubClient, SEARCH_RESULT_LIMIT, pull_requests_by_number_query
 from code_analysis_tool.models.repository import Repository
 from code_analysis_tool.models.pull_request import PullRequest
 from code_analysis_tool.models.user import User
@@ -84,34 +89,35 @@ def test_get_user_repositories_success(github_client: GitHubClient) -> None:
     github_client.github.get_user.assert_called_once_with("test_user")
     mock_user.get_repos.assert_called_once()
 
-def test_get_merged_pull_requests_success(github_client: GitHubClient) -> None:
-    mock_repo = Mock(spec=GithubRepository)
+def create_mock_pull_request(number: int, merged_at: Optional[datetime], updated_at: Optional[datetime] = None) -> Mock:
     mock_user = Mock(spec=NamedUser)
     mock_user.id = 123
     mock_user.login = "test_user"
     mock_user.name = "Test User"
     mock_user.email = "test@example.com"
-    
-    # Create mock PRs
-    mock_pr1 = Mock(spec=GithubPullRequest)
-    mock_pr1.id = 1
-    mock_pr1.number = 1
-    mock_pr1.title = "PR 1"
-    mock_pr1.user = mock_user
-    mock_pr1.base.repo = mock_repo
-    mock_pr1.created_at = datetime(2024, 1, 15, tzinfo=timezone.utc)
-    mock_pr1.merged_at = datetime(2024, 1, 15, tzinfo=timezone.utc)
-    mock_pr1.merged = True
-    mock_pr1.body = "PR 1 description"
-    
+
+    mock_pr = Mock(spec=GithubPullRequest)
+    mock_pr.id = number
+    mock_pr.number = number
+    mock_pr.title = f"PR {number}"
+    mock_pr.user = mock_user
+    mock_pr.base.repo = Mock(spec=GithubRepository)
+    mock_pr.created_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    mock_pr.updated_at = updated_at or merged_at or datetime(2024, 1, 1, tzinfo=timezone.utc)
+    mock_pr.merged_at = merged_at
+    mock_pr.body = f"PR {number} description"
+
     # Mock file diffs
     mock_file = Mock(spec=File)
     mock_file.filename = "test.py"
     mock_file.patch = "diff content"
-    mock_pr1.get_files = Mock(return_value=[mock_file])
-    
-    mock_pr2 = Mock(spec=GithubPullRequest)
-    mock_pr2.merged = False
+    mock_pr.get_files = Mock(return_value=[mock_file])
+    return mock_pr
+
+def test_get_merged_pull_requests_success(github_client: GitHubClient) -> None:
+    mock_repo = Mock(spec=GithubRepository)
+    mock_pr1 = create_mock_pull_request(1, datetime(2024, 1, 15, tzinfo=timezone.utc))
+    mock_pr2 = create_mock_pull_request(2, None)
     
     mock_pulls = Mock()
     mock_pulls.__iter__ = lambda self: iter([mock_pr1, mock_pr2])
@@ -119,11 +125,12 @@ def test_get_merged_pull_requests_success(github_client: GitHubClient) -> None:
     mock_repo.get_pulls.return_value = mock_pulls
     github_client.github.get_repo = Mock(return_value=mock_repo)
     
-    result = github_client.get_merged_pull_requests("owner/repo", "2024-01-01")
+    result = github_client.get_merged_pull_requests("owner/repo")
     
     assert len(result) == 1
     assert isinstance(result[0], PullRequest)
     assert result[0].number == 1
+    assert result[0].merged is True
     
     # Test that diffs haven't been loaded yet
     assert result[0]._file_diffs is None
@@ -135,6 +142,181 @@ def test_get_merged_pull_requests_success(github_client: GitHubClient) -> None:
     github_client.github.get_repo.assert_called_once_with("owner/repo")
     mock_repo.get_pulls.assert_called_once_with(state='closed', sort='updated', direction='desc')
 
+def test_diffs_go_through_diff_cache(tmp_path: Path) -> None:
+    cache = DiffCache(str(tmp_path))
+    mock_pr = create_mock_pull_request(1, datetime(2024, 1, 15, tzinfo=timezone.utc))
+    mock_pr.base.repo.full_name = "owner/repo"
+    mock_pr.head.sha = "abc123"
+
+    for _ in range(2):
+        github_client = GitHubClient("fake_token", diff_cache=cache)
+        mock_repo = Mock(spec=GithubRepository)
+        mock_repo.get_pulls.return_value = [mock_pr]
+        github_client.github.get_repo = Mock(return_value=mock_repo)
+
+        [result] = github_client.get_merged_pull_requests("owner/repo")
+
+        assert result.file_diffs == {"test.py": "diff content"}
+
+    # The second client is served from the cache
+    mock_pr.get_files.assert_called_once()
+    assert cache.get("owner/repo", 1, "abc123") == {"test.py": "diff content"}
+
+def test_stream_diffs_loads_unified_diff() -> None:
+    github_client = GitHubClient("fake_token", stream_diffs=True)
+    mock_pr = create_mock_pull_request(1, datetime(2024, 1, 15, tzinfo=timezone.utc))
+    mock_pr.base.repo.full_name = "owner/repo"
+    mock_repo = Mock(spec=GithubRepository)
+    mock_repo.get_pulls.return_value = [mock_pr]
+    github_client.github.get_repo = Mock(return_value=mock_repo)
+
+    with patch("code_analysis_tool.github_client.get_streamed_diff", return_value={"test.py": "streamed"}) as mock_streamed_diff:
+        [result] = github_client.get_merged_pull_requests("owner/repo")
+        assert result.file_diffs == {"test.py": "streamed"}
+
+    mock_streamed_diff.assert_called_once_with(github_client.github.requester, "owner/repo", 1, github_client._diff_session)
+    mock_pr.get_files.assert_not_called()
+
+def graphql_pull_request(number: int, merged_at: str) -> dict:
+    owner = {"databaseId": 456, "login": "owner"}
+    return {
+        "databaseId": number * 10,
+        "number": number,
+        "title": f"PR {number}",
+        "body": None,
+        "createdAt": "2024-01-01T00:00:00Z",
+        "updatedAt": merged_at,
+        "mergedAt": merged_at,
+        "merged": True,
+        "additions": 1,
+        "deletions": 1,
+        "changedFiles": 1,
+        "headRefOid": f"sha{number}",
+        "author": {"databaseId": 123, "login": "test_user"},
+        "repository": {"databaseId": 1, "name": "repo", "nameWithOwner": "owner/repo", "description": None, "isPrivate": False, "owner": owner}
+    }
+
+def search_response(total_count: int, numbers: list[int], remaining: int = 29, reset_time: float = 0) -> tuple[dict, dict]:
+    headers = {"x-ratelimit-remaining": str(remaining), "x-ratelimit-reset": str(reset_time)}
+    return headers, {"total_count": total_count, "items": [{"number": number} for number in numbers]}
+
+@pytest.fixture
+def mock_requester(github_client: GitHubClient) -> Mock:
+    github_client.github = Mock()
+    github_client.github.requester.rate_limiting = (4000, 5000)
+    github_client.github.requester.rate_limiting_resettime = 0
+    return github_client.github.requester
+
+def test_get_merged_pull_requests_since_date_uses_search(github_client: GitHubClient, mock_requester: Mock) -> None:
+    mock_requester.requestJsonAndCheck.return_value = search_response(2, [1, 2])
+    mock_requester.graphql_query.return_value = ({}, {"data": {"repository": {
+        "pr1": graphql_pull_request(1, "2024-01-15T00:00:00Z"),
+        "pr2": graphql_pull_request(2, "2024-01-14T00:00:00Z")
+    }}})
+
+    result = github_client.get_merged_pull_requests("owner/repo", "2024-01-01T00:00:00Z")
+
+    assert [pr.number for pr in result] == [1, 2]
+    assert result[0].id == "10"
+    assert result[0].merged_at == datetime(2024, 1, 15, tzinfo=timezone.utc)
+    mock_requester.requestJsonAndCheck.assert_called_once_with("GET", "/search/issues", parameters={
+        "q": "repo:owner/repo is:pr is:merged merged:>=2024-01-01T00:00:00+00:00",
+        "per_page": 100,
+        "page": 1
+    })
+    # Every search hit comes from a single GraphQL query
+    mock_requester.graphql_query.assert_called_once()
+    assert mock_requester.graphql_query.call_args.args[1] == {"owner": "owner", "name": "repo"}
+    github_client.github.get_repo.assert_not_called()
+    # The search budget in the response doesn't replace the core budget
+    assert mock_requester.rate_limiting == (4000, 5000)
+
+def test_pull_requests_by_number_query() -> None:
+    query = pull_requests_by_number_query([1, 2])
+
+    assert "pr1: pullRequest(number: 1)" in query
+    assert "pr2: pullRequest(number: 2)" in query
+    # A repository owner is a RepositoryOwner, which only User and Organization implement,
+    # GitHub rejects the whole query for a spread on another type
+    owners = re.findall(r"owner \{((?:[^{}]|\{[^{}]*\})*)\}", query)
+    assert len(owners) == 2
+    assert all("... on User" in owner and "... on Bot" not in owner for owner in owners)
+    authors = re.findall(r"author \{((?:[^{}]|\{[^{}]*\})*)\}", query)
+    assert len(authors) == 2
+    assert all("... on Bot" in author for author in authors)
+
+def test_search_waits_for_search_rate_limit(github_client: GitHubClient, mock_requester: Mock) -> None:
+    mock_requester.requestJsonAndCheck.return_value = search_response(0, [], remaining=0, reset_time=time.time() + 30)
+
+    with patch("code_analysis_tool.github_client.time.sleep") as mock_sleep:
+        github_client.get_merged_pull_requests("owner/repo", "2024-01-01T00:00:00Z")
+        mock_sleep.assert_not_called()
+        github_client.get_merged_pull_requests("owner/repo", "2024-01-01T00:00:00Z")
+
+    mock_sleep.assert_called_once()
+    assert 0 < mock_sleep.call_args.args[0] <= 30
+
+def test_get_merged_pull_requests_falls_back_to_listing(github_client: GitHubClient, mock_requester: Mock) -> None:
+    mock_requester.requestJsonAndCheck.return_value = search_response(SEARCH_RESULT_LIMIT + 1, [])
+    since = datetime(2024, 1, 10, tzinfo=timezone.utc)
+    recent = create_mock_pull_request(1, datetime(2024, 1, 15, tzinfo=timezone.utc))
+    # Merged before the date but updated after it, e.g. a late comment
+    merged_before = create_mock_pull_request(2, datetime(2024, 1, 5, tzinfo=timezone.utc), updated_at=datetime(2024, 1, 12, tzinfo=timezone.utc))
+    unmerged = create_mock_pull_request(3, None, updated_at=datetime(2024, 1, 11, tzinfo=timezone.utc))
+    stale = create_mock_pull_request(4, datetime(2024, 1, 1, tzinfo=timezone.utc))
+    never_reached = Mock(spec=GithubPullRequest)
+
+    mock_repo = Mock(spec=GithubRepository)
+    mock_pulls = Mock()
+    mock_pulls.__iter__ = lambda self: iter([recent, merged_before, unmerged, stale, never_reached])
+    mock_repo.get_pulls.return_value = mock_pulls
+    github_client.github.get_repo = Mock(return_value=mock_repo)
+
+    result = github_client.get_merged_pull_requests("owner/repo", since.isoformat())
+
+    assert [pr.number for pr in result] == [1]
+
+def test_iter_merged_pull_requests_streams(github_client: GitHubClient) -> None:
+    fetched = []
+    def pulls() -> Generator[Mock, None, None]:
+        for number in (1, 2):
+            fetched.append(number)
+            yield create_mock_pull_request(number, datetime(2024, 1, 15, tzinfo=timezone.utc))
+    mock_repo = Mock(spec=GithubRepository)
+    mock_repo.get_pulls.return_value = pulls()
+    github_client.github.get_repo = Mock(return_value=mock_repo)
+
+    merged_pulls = github_client.iter_merged_pull_requests("owner/repo")
+
+    assert next(merged_pulls).number == 1
+    assert fetched == [1]
+    assert [pr.number for pr in merged_pulls] == [2]
+
+def test_pull_requests_share_users_and_repositories(github_client: GitHubClient) -> None:
+    first = create_mock_pull_request(1, datetime(2024, 1, 15, tzinfo=timezone.utc))
+    second = create_mock_pull_request(2, datetime(2024, 1, 14, tzinfo=timezone.utc))
+    second.user = first.user
+    second.base.repo = first.base.repo
+    first.base.repo.id = 1
+    mock_repo = Mock(spec=GithubRepository)
+    mock_repo.get_pulls.return_value = [first, second]
+    github_client.github.get_repo = Mock(return_value=mock_repo)
+
+    result = github_client.get_merged_pull_requests("owner/repo")
+
+    assert result[0].author is result[1].author
+    assert result[0].repository is result[1].repository
+    with pytest.raises(AttributeError):
+        result[0].author.name = "changed"
+
+def test_iter_user_repositories_failure(github_client: GitHubClient) -> None:
+    github_client.github.get_user = Mock(side_effect=Exception("User not found"))
+
+    with pytest.raises(Exception) as exc_info:
+        list(github_client.iter_user_repositories("nonexistent"))
+
+    assert str(exc_info.value) == "Failed to fetch repositories for user ID nonexistent: User not found"
+
 def test_get_merged_pull_requests_invalid_date(github_client: GitHubClient) -> None:
     mock_repo = Mock(spec=GithubRepository)
     mock_pr = Mock(spec=GithubPullRequest)
@@ -162,7 +344,9 @@ def test_get_merged_pull_requests_for_user_success(github_client: GitHubClient)
     
     # Setup the chain of mock returns
     github_client.get_user_repositories = Mock(return_value=[mock_repo1, mock_repo2])
-    github_client.get_merged_pull_requests = Mock(side_effect=[[mock_pr1], [mock_pr2]])
+    # Repositories are fetched concurrently so answer by name rather than call order
+    pulls_by_repo = {"owner/repo1": [mock_pr1], "owner/repo2": [mock_pr2]}
+    github_client.get_merged_pull_requests = Mock(side_effect=lambda repo_name, since_date: pulls_by_repo[repo_name])
     
     result = github_client.get_merged_pull_requests_for_user("test_user", "2024-01-01")
     
@@ -177,4 +361,124 @@ def test_get_merged_pull_requests_for_user_failure(github_client: GitHubClient)
     with pytest.raises(Exception) as exc_info:
         github_client.get_merged_pull_requests_for_user("test_user")
     
-    assert "Failed to fetch merged pull requests for user ID test_user" in str(exc_info.value) 
\ No newline at end of file
+    assert "Failed to fetch merged pull requests for user ID test_user" in str(exc_info.value) 
+
+def test_iter_merged_pull_requests_for_user_yields_as_completed(github_client: GitHubClient) -> None:
+    repos = []
+    for i in range(5):
+        mock_repo = Mock(spec=GithubRepository)
+        mock_repo.full_name = f"owner/repo{i}"
+        repos.append(mock_repo)
+    github_client.get_user_repositories = Mock(return_value=repos)
+    github_client.get_merged_pull_requests = Mock(side_effect=lambda repo_name, since_date: [repo_name])
+
+    result = list(github_client.iter_merged_pull_requests_for_user("test_user", "2024-01-01"))
+
+    assert sorted(result) == [f"owner/repo{i}" for i in range(5)]
+    assert github_client.get_merged_pull_requests.call_count == 5
+
+def test_get_merged_pull_requests_for_user_runs_concurrently(github_client: GitHubClient) -> None:
+    barrier = threading.Barrier(3, timeout=5)
+    repos = []
+    for i in range(3):
+        mock_repo = Mock(spec=GithubRepository)
+        mock_repo.full_name = f"owner/repo{i}"
+        repos.append(mock_repo)
+
+    def fetch(repo_name: str, since_date: str) -> list:
+        # Only passes if all three repositories are being fetched at the same time
+        barrier.wait()
+        return [repo_name]
+
+    github_client.get_user_repositories = Mock(return_value=repos)
+    github_client.get_merged_pull_requests = Mock(side_effect=fetch)
+
+    result = github_client.get_merged_pull_requests_for_user("test_user")
+
+    assert result == ["owner/repo0", "owner/repo1", "owner/repo2"]
+
+def test_get_merged_pull_requests_for_user_repo_failure(github_client: GitHubClient) -> None:
+    mock_repo = Mock(spec=GithubRepository)
+    mock_repo.full_name = "owner/repo1"
+    github_client.get_user_repositories = Mock(return_value=[mock_repo])
+    github_client.get_merged_pull_requests = Mock(side_effect=Exception("API error"))
+
+    with pytest.raises(Exception) as exc_info:
+        list(github_client.iter_merged_pull_requests_for_user("test_user"))
+
+    assert "Failed to fetch merged pull requests for user ID test_user" in str(exc_info.value)
+
+def test_get_pull_request_reviews(github_client: GitHubClient) -> None:
+    reviewer = Mock(spec=NamedUser)
+    reviewer.id = 456
+    reviewer.login = "reviewer"
+    reviewer.name = "Reviewer"
+    reviewer.email = None
+    approved = Mock(id=2, user=reviewer, state="APPROVED", submitted_at=datetime(2024, 1, 3, tzinfo=timezone.utc))
+    deleted = Mock(id=1, user=None, state="COMMENTED", submitted_at=datetime(2024, 1, 2, tzinfo=timezone.utc))
+
+    with patch("code_analysis_tool.github_client.PaginatedList", return_value=[deleted, approved]) as mock_paginated_list:
+        result = github_client.get_pull_request_reviews("owner/repo", 12)
+
+    assert mock_paginated_list.call_args.args[2] == "/repos/owner/repo/pulls/12/reviews"
+    assert [(review.id, review.author.login, review.state) for review in result] == [("1", "ghost", "COMMENTED"), ("2", "reviewer", "APPROVED")]
+    assert result[1].submitted_at == datetime(2024, 1, 3, tzinfo=timezone.utc)
+
+def test_get_pull_request_reviews_failure(github_client: GitHubClient) -> None:
+    with patch("code_analysis_tool.github_client.PaginatedList", side_effect=Exception("Not Found")):
+        with pytest.raises(Exception) as exc_info:
+            github_client.get_pull_request_reviews("owner/repo", 12)
+
+    assert str(exc_info.value) == "Failed to fetch reviews for pull request owner/repo#12: Not Found"
+
+def test_wait_for_rate_limit(github_client: GitHubClient) -> None:
+    github_client.github = Mock()
+    github_client.github.requester.rate_limiting = (10, 5000)
+    github_client.github.requester.rate_limiting_resettime = time.time() + 30
+
+    with patch("code_analysis_tool.github_client.time.sleep") as mock_sleep:
+        github_client._wait_for_rate_limit()
+
+    mock_sleep.assert_called_once()
+    assert 0 < mock_sleep.call_args.args[0] <= 30
+
+def create_pooled_github(remaining: int, reset_in: float = 30) -> Mock:
+    github = Mock()
+    github.requester.rate_limiting = (remaining, 5000)
+    github.requester.rate_limiting_resettime = time.time() + reset_in
+    return github
+
+def test_token_pool_picks_most_remaining_budget() -> None:
+    github_client = GitHubClient(["token1", "token2", "token3"])
+    assert len(github_client._githubs) == 3
+    low, high, unknown = create_pooled_github(100), create_pooled_github(4000), create_pooled_github(-1)
+    github_client._githubs = [low, high]
+
+    assert {id(github_client.github) for _ in range(4)} == {id(high)}
+
+    # Tokens without a response yet are tried before the others, ties rotate
+    github_client._githubs = [low, unknown, high, create_pooled_github(-1)]
+    picked = [github_client.github for _ in range(4)]
+    assert {id(github) for github in picked} == {id(github_client._githubs[1]), id(github_client._githubs[3])}
+
+def test_token_pool_waits_only_when_every_token_is_spent(github_client: GitHubClient) -> None:
+    github_client._githubs = [create_pooled_github(10, reset_in=60), create_pooled_github(4000)]
+
+    with patch("code_analysis_tool.github_client.time.sleep") as mock_sleep:
+        github_client._wait_for_rate_limit()
+        mock_sleep.assert_not_called()
+
+        github_client._githubs = [create_pooled_github(10, reset_in=60), create_pooled_github(5, reset_in=20)]
+        github_client._wait_for_rate_limit()
+
+    mock_sleep.assert_called_once()
+    assert 0 < mock_sleep.call_args.args[0] <= 20
+
+def test_wait_for_rate_limit_with_budget(github_client: GitHubClient) -> None:
+    github_client.github = Mock()
+    github_client.github.requester.rate_limiting = (4000, 5000)
+
+    with patch("code_analysis_tool.github_client.time.sleep") as mock_sleep:
+        github_client._wait_for_rate_limit()
+
+    mock_sleep.assert_not_called()
@@ -0,0 +1,120 @@
+from datetime import datetime
+from typing import Any, Iterator, List, Optional
+from dateutil.parser import parse
+from loguru import logger
+
+from code_analysis_tool.github_client import GitHubClient, SEARCH_RESULT_LIMIT, REPOSITORY_FIELDS, PULL_REQUEST_FIELDS
+from code_analysis_tool.fetcher_base import fetch_scope
+from code_analysis_tool.models.repository import Repository
+from code_analysis_tool.models.pull_request import PullRequest
+from code_analysis_tool.models.user import User
+
+USER_QUERY = f"""
+query($login: String!) {{
+  user(login: $login) {{ databaseId login name email }}
+}}
+"""
+
+USER_REPOSITORIES_QUERY = f"""
+query($login: String!, $cursor: String) {{
+  user(login: $login) {{
+    repositories(first: 100, after: $cursor, ownerAffiliations: [OWNER]) {{
+      pageInfo {{ hasNextPage endCursor }}
+      nodes {{ {REPOSITORY_FIELDS} }}
+    }}
+  }}
+}}
+"""
+
+MERGED_PULL_REQUESTS_QUERY = f"""
+query($owner: String!, $name: String!, $cursor: String) {{
+  repository(owner: $owner, name: $name) {{
+    pullRequests(states: MERGED, first: 100, after: $cursor, orderBy: {{field: UPDATED_AT, direction: DESC}}) {{
+      pageInfo {{ hasNextPage endCursor }}
+      nodes {{ {PULL_REQUEST_FIELDS} }}
+    }}
+  }}
+}}
+"""
+
+SEARCH_MERGED_PULL_REQUESTS_QUERY = f"""
+query($query: String!, $cursor: String) {{
+  search(query: $query, type: ISSUE, first: 100, after: $cursor) {{
+    issueCount
+    pageInfo {{ hasNextPage endCursor }}
+    nodes {{ ... on PullRequest {{ {PULL_REQUEST_FIELDS} }} }}
+  }}
+}}
+"""
+
+class GitHubGraphQLClient(GitHubClient):
+    """
+    GitHub client that fetches users, repositories and pull requests with the GraphQL API.
+
+    A page of 100 pull requests, including their author, repository, merge info and
+    change stats, is a single request. The REST client needs extra lazy requests per
+    pull request for fields like `merged`, the author's name and the repository owner.
+    Diffs are still loaded lazily through REST when file_diffs is accessed.
+    """
+
+    def _paginate(self, query: str, variables: dict[str, Any], path: List[str]) -> Iterator[dict[str, Any]]:
+        """Yield the nodes of the connection found at path, following cursors until the last page."""
+        cursor = None
+        while True:
+            connection = self._query(query, {**variables, "cursor": cursor})
+            for key in path:
+                connection = connection[key]
+            yield from connection["nodes"]
+            if not connection["pageInfo"]["hasNextPage"]:
+                return
+            cursor = connection["pageInfo"]["endCursor"]
+
+    @fetch_scope
+    def get_user_by_id(self, user_id: str) -> Optional[User]:
+        try:
+            return self._convert_graphql_user(self._query(USER_QUERY, {"login": user_id})["user"])
+        except Exception as e:
+            raise Exception(f"Failed to find user with ID {user_id}: {str(e)}")
+
+    @fetch_scope
+    def iter_user_repositories(self, user_id: str) -> Iterator[Repository]:
+        try:
+            for repo in self._paginate(USER_REPOSITORIES_QUERY, {"login": user_id}, ["user", "repositories"]):
+                yield self._convert_graphql_repository(repo)
+        except Exception as e:
+            raise Exception(f"Failed to fetch repositories for user ID {user_id}: {str(e)}")
+
+    def _search_merged_pull_requests(self, repo_name: str, since_datetime: datetime) -> Optional[Iterator[PullRequest]]:
+        """
+        Search for pull requests merged since the date so GitHub does the filtering.
+        Returns None if there are more matches than the search API can return.
+        """
+        query = f"repo:{repo_name} is:pr is:merged merged:>={since_datetime.isoformat(timespec='seconds')}"
+        # The first page is fetched up front to learn how many pull requests match
+        search = self._query(SEARCH_MERGED_PULL_REQUESTS_QUERY, {"query": query, "cursor": None})["search"]
+        if search["issueCount"] > SEARCH_RESULT_LIMIT:
+            logger.info(f"{search['issueCount']} pull requests merged in {repo_name} since {since_datetime}, listing them instead of searching")
+            return None
+
+        def pages() -> Iterator[PullRequest]:
+            nonlocal search
+            while True:
+                for pr in search["nodes"]:
+                    yield self._convert_graphql_pull_request(pr)
+                if not search["pageInfo"]["hasNextPage"]:
+                    return
+                cursor = search["pageInfo"]["endCursor"]
+                search = self._query(SEARCH_MERGED_PULL_REQUESTS_QUERY, {"query": query, "cursor": cursor})["search"]
+        return pages()
+
+    def _list_merged_pull_requests(self, repo_name: str, since_datetime: Optional[datetime]) -> Iterator[PullRequest]:
+        """List merged pull requests, most recently updated first."""
+        owner, name = repo_name.split("/", 1)
+        for pr in self._paginate(MERGED_PULL_REQUESTS_QUERY, {"owner": owner, "name": name}, ["repository", "pullRequests"]):
+            # Merging updates a pull request so updatedAt >= mergedAt, nothing after this can have been merged since
+            if since_datetime and parse(pr["updatedAt"]) < since_datetime:
+                break
+            converted = self._convert_graphql_pull_request(pr)
+            if since_datetime and converted.merged_at < since_datetime:
+                continue
+            yield converted
@@ -0,0 +1,240 @@
+from datetime import datetime, timezone
+import pytest
+from unittest.mock import Mock
+from typing import Any
+
+from code_analysis_tool.github_client import SEARCH_RESULT_LIMIT
+from code_analysis_tool.github_graphql_client import (
+    GitHubGraphQLClient,
+    USER_QUERY,
+    USER_REPOSITORIES_QUERY,
+    MERGED_PULL_REQUESTS_QUERY,
+    SEARCH_MERGED_PULL_REQUESTS_QUERY
+)
+from code_analysis_tool.models.repository import Repository
+from code_analysis_tool.models.pull_request import PullRequest
+from code_analysis_tool.models.user import User
+
+def graphql_user(database_id: int, login: str) -> dict[str, Any]:
+    return {"databaseId": database_id, "login": login, "name": f"{login} name", "email": ""}
+
+def graphql_repository(database_id: int, name: str) -> dict[str, Any]:
+    return {
+        "databaseId": database_id,
+        "name": name,
+        "nameWithOwner": f"owner/{name}",
+        "description": f"{name} description",
+        "isPrivate": False,
+        "owner": graphql_user(456, "owner"),
+    }
+
+def graphql_pull_request(number: int, merged_at: str) -> dict[str, Any]:
+    return {
+        "databaseId": number * 10,
+        "number": number,
+        "title": f"PR {number}",
+        "body": f"PR {number} description",
+        "createdAt": "2024-01-10T00:00:00Z",
+        "updatedAt": merged_at,
+        "mergedAt": merged_at,
+        "merged": True,
+        "additions": 10,
+        "deletions": 2,
+        "changedFiles": 1,
+        "headRefOid": f"sha{number}",
+        "author": graphql_user(123, "test_user"),
+        "repository": graphql_repository(1, "repo"),
+    }
+
+def connection(path: list[str], nodes: list[dict], end_cursor: str | None) -> tuple[dict, dict]:
+    page: dict[str, Any] = {"nodes": nodes, "pageInfo": {"hasNextPage": end_cursor is not None, "endCursor": end_cursor}}
+    for key in reversed(path):
+        page = {key: page}
+    return {}, {"data": page}
+
+def selections(query: str, field: str) -> list[str]:
+    """The selection set of every occurrence of field in query."""
+    found = []
+    start = query.find(f"{field} {{")
+    while start != -1:
+        depth = 0
+        for end in range(query.index("{", start), len(query)):
+            depth += {"{": 1, "}": -1}.get(query[end], 0)
+            if depth == 0:
+                break
+        found.append(query[query.index("{", start) + 1:end])
+        start = query.find(f"{field} {{", end)
+    return found
+
+@pytest.fixture
+def github_client() -> GitHubGraphQLClient:
+    client = GitHubGraphQLClient("fake_token")
+    client.github = Mock()
+    client.github.requester.rate_limiting = (-1, -1)
+    return client
+
+def test_get_user_by_id_success(github_client: GitHubGraphQLClient) -> None:
+    github_client.github.requester.graphql_query.return_value = ({}, {"data": {"user": graphql_user(123, "test_user")}})
+
+    result = github_client.get_user_by_id("test_user")
+
+    assert result == User(id="123", login="test_user", name="test_user name", email=None)
+    assert github_client.github.requester.graphql_query.call_args.args[1] == {"login": "test_user"}
+
+def test_get_user_by_id_failure(github_client: GitHubGraphQLClient) -> None:
+    github_client.github.requester.graphql_query.side_effect = Exception("User not found")
+
+    with pytest.raises(Exception) as exc_info:
+        github_client.get_user_by_id("test_user")
+
+    assert "Failed to find user with ID test_user" in str(exc_info.value)
+
+def test_user_query_selects_user_fields_only() -> None:
+    # The user field is a User, spreads on other types are rejected by GitHub's validator
+    [user] = selections(USER_QUERY, "user(login: $login)")
+
+    assert "..." not in user
+    assert user.split() == ["databaseId", "login", "name", "email"]
+
+@pytest.mark.parametrize("query", [USER_REPOSITORIES_QUERY, MERGED_PULL_REQUESTS_QUERY, SEARCH_MERGED_PULL_REQUESTS_QUERY])
+def test_queries_only_spread_owner_types_under_owner(query: str) -> None:
+    # A repository owner is a RepositoryOwner, which only User and Organization implement
+    owners = selections(query, "owner")
+
+    assert owners
+    assert all("... on Bot" not in owner for owner in owners)
+
+@pytest.mark.parametrize("query", [MERGED_PULL_REQUESTS_QUERY, SEARCH_MERGED_PULL_REQUESTS_QUERY])
+def test_queries_spread_bot_under_author(query: str) -> None:
+    [author] = selections(query, "author")
+
+    assert "... on Bot" in author
+
+def test_get_user_repositories_paginates(github_client: GitHubGraphQLClient) -> None:
+    path = ["user", "repositories"]
+    github_client.github.requester.graphql_query.side_effect = [
+        connection(path, [graphql_repository(0, "repo0")], "cursor1"),
+        connection(path, [graphql_repository(1, "repo1")], None),
+    ]
+
+    result = github_client.get_user_repositories("test_user")
+
+    assert [repo.full_name for repo in result] == ["owner/repo0", "owner/repo1"]
+    assert all(isinstance(repo, Repository) for repo in result)
+    cursors = [call.args[1]["cursor"] for call in github_client.github.requester.graphql_query.call_args_list]
+    assert cursors == [None, "cursor1"]
+
+def search_page(nodes: list[dict], end_cursor: str | None, issue_count: int | None = None) -> tuple[dict, dict]:
+    return {}, {"data": {"search": {
+        "issueCount": len(nodes) if issue_count is None else issue_count,
+        "nodes": nodes,
+        "pageInfo": {"hasNextPage": end_cursor is not None, "endCursor": end_cursor},
+    }}}
+
+def test_get_merged_pull_requests_searches_since_date(github_client: GitHubGraphQLClient) -> None:
+    github_client.github.requester.graphql_query.side_effect = [
+        search_page([graphql_pull_request(2, "2024-01-20T00:00:00Z")], "cursor1", issue_count=2),
+        search_page([graphql_pull_request(1, "2024-01-15T00:00:00Z")], None, issue_count=2),
+    ]
+
+    result = github_client.get_merged_pull_requests("owner/repo", "2024-01-01T00:00:00Z")
+
+    assert [pr.number for pr in result] == [2, 1]
+    first_call, second_call = github_client.github.requester.graphql_query.call_args_list
+    assert first_call.args[1] == {"query": "repo:owner/repo is:pr is:merged merged:>=2024-01-01T00:00:00+00:00", "cursor": None}
+    assert second_call.args[1]["cursor"] == "cursor1"
+    pr = result[0]
+    assert isinstance(pr, PullRequest)
+    assert pr.author.login == "test_user"
+    assert pr.repository.owner.login == "owner"
+    assert pr.merged_at == datetime(2024, 1, 20, tzinfo=timezone.utc)
+    assert (pr.additions, pr.deletions, pr.changed_files) == (10, 2, 1)
+    assert pr._file_diffs is None
+
+def test_get_merged_pull_requests_single_request_per_page(github_client: GitHubGraphQLClient) -> None:
+    path = ["repository", "pullRequests"]
+    github_client.github.requester.graphql_query.return_value = connection(
+        path,
+        [graphql_pull_request(2, "2024-01-20T00:00:00Z"), graphql_pull_request(1, "2024-01-15T00:00:00Z")],
+        None
+    )
+
+    result = github_client.get_merged_pull_requests("owner/repo")
+
+    assert github_client.github.requester.graphql_query.call_count == 1
+    assert [pr.number for pr in result] == [2, 1]
+
+def test_get_merged_pull_requests_falls_back_to_listing(github_client: GitHubGraphQLClient) -> None:
+    merged_before = graphql_pull_request(2, "2023-12-20T00:00:00Z")
+    merged_before["updatedAt"] = "2024-01-05T00:00:00Z"
+    github_client.github.requester.graphql_query.side_effect = [
+        search_page([], "unused", issue_count=SEARCH_RESULT_LIMIT + 1),
+        connection(
+            ["repository", "pullRequests"],
+            [graphql_pull_request(3, "2024-01-20T00:00:00Z"), merged_before, graphql_pull_request(1, "2023-12-15T00:00:00Z")],
+            "more"
+        ),
+    ]
+
+    result = github_client.get_merged_pull_requests("owner/repo", "2024-01-01")
+
+    assert [pr.number for pr in result] == [3]
+    assert github_client.github.requester.graphql_query.call_count == 2
+
+def test_iter_merged_pull_requests_yields_before_next_page(github_client: GitHubGraphQLClient) -> None:
+    github_client.github.requester.graphql_query.side_effect = [
+        search_page([graphql_pull_request(2, "2024-01-20T00:00:00Z")], "cursor1"),
+        search_page([graphql_pull_request(1, "2024-01-15T00:00:00Z")], None),
+    ]
+
+    merged_pulls = github_client.iter_merged_pull_requests("owner/repo", "2024-01-01")
+
+    assert next(merged_pulls).number == 2
+    assert github_client.github.requester.graphql_query.call_count == 1
+    assert [pr.number for pr in merged_pulls] == [1]
+    assert github_client.github.requester.graphql_query.call_count == 2
+
+def test_pull_requests_share_users_and_repositories(github_client: GitHubGraphQLClient) -> None:
+    github_client.github.requester.graphql_query.return_value = connection(
+        ["repository", "pullRequests"],
+        [graphql_pull_request(2, "2024-01-20T00:00:00Z"), graphql_pull_request(1, "2024-01-15T00:00:00Z")],
+        None
+    )
+
+    first, second = github_client.get_merged_pull_requests("owner/repo")
+
+    assert first.author is second.author
+    assert first.repository is second.repository
+    # Interning is scoped to a fetch, a later fetch converts users and repositories again
+    later = github_client.get_merged_pull_requests("owner/repo")[0]
+    assert later.repository == first.repository
+    assert later.repository is not first.repository
+    assert not github_client._users and not github_client._repositories
+
+def test_get_merged_pull_requests_loads_diffs_lazily(github_client: GitHubGraphQLClient) -> None:
+    github_client.github.requester.graphql_query.return_value = connection(
+        ["repository", "pullRequests"], [graphql_pull_request(1, "2024-01-15T00:00:00Z")], None
+    )
+    mock_file = Mock(filename="test.py", patch="diff content")
+    github_client.github.get_repo.return_value.get_pull.return_value.get_files.return_value = [mock_file]
+
+    result = github_client.get_merged_pull_requests("owner/repo")
+
+    assert result[0].file_diffs == {"test.py": "diff content"}
+    github_client.github.get_repo.assert_called_once_with("owner/repo")
+    github_client.github.get_repo.return_value.get_pull.assert_called_once_with(1)
+
+def test_get_merged_pull_requests_invalid_date(github_client: GitHubGraphQLClient) -> None:
+    with pytest.raises(ValueError) as exc_info:
+        github_client.get_merged_pull_requests("owner/repo", "invalid_date")
+
+    assert "Value error, potential issue in date format" in str(exc_info.value)
+
+def test_deleted_author(github_client: GitHubGraphQLClient) -> None:
+    pr = graphql_pull_request(1, "2024-01-15T00:00:00Z")
+    pr["author"] = None
+    github_client.github.requester.graphql_query.return_value = connection(["repository", "pullRequests"], [pr], None)
+
+    result = github_client.get_merged_pull_requests("owner/repo")
+
+    assert result[0].author.login == "ghost"
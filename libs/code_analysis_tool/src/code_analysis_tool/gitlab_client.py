@@ -0,0 +1,173 @@
+from datetime import datetime, timezone
+from typing import Any, Iterator, List, Optional
+from urllib.parse import quote
+from dateutil.parser import parse
+import requests
+
+from code_analysis_tool.models.repository import Repository
+from code_analysis_tool.models.pull_request import PullRequest
+from code_analysis_tool.models.user import User
+from .pull_request_utils import filename, diff
+from .fetcher_base import ConcurrentFetcher, fetch_scope
+from .rest_client import LinkHeaderPagination, RestClient
+
+DEFAULT_BASE_URL = "https://gitlab.com/api/v4"
+
+class GitLabPagination(LinkHeaderPagination):
+    """GitLab offset pagination, which reports the page count in X-Total-Pages for lists of up to 10,000 items."""
+
+    def page_count(self, response: requests.Response, body: Any) -> Optional[int]:
+        total_pages = response.headers.get("X-Total-Pages")
+        return int(total_pages) if total_pages else None
+
+class GitLabClient(ConcurrentFetcher):
+    """
+    Source control fetcher for GitLab, where repositories are projects and pull requests
+    are merge requests. The merge request's iid, its number within the project, is used
+    as the pull request number.
+    """
+
+    def __init__(
+        self,
+        access_token: str,
+        base_url: str = DEFAULT_BASE_URL,
+        max_workers: int = 8,
+        max_retries: int = 3
+    ) -> None:
+        """
+        Args:
+            access_token: GitLab personal, project or group access token
+            base_url: GitLab API URL, for self-managed instances
+            max_workers: Maximum number of concurrent requests
+            max_retries: Number of times a request is retried after a rate limit or server error
+        """
+        super().__init__()
+        self.rest = RestClient(
+            base_url,
+            headers={"PRIVATE-TOKEN": access_token},
+            max_workers=max_workers,
+            max_retries=max_retries
+        )
+        self.pagination = GitLabPagination()
+        self.max_workers = max_workers
+
+    @staticmethod
+    def _project_path(repo_name: str) -> str:
+        """Project path for URLs, where the namespace separators must be encoded."""
+        return f"projects/{quote(repo_name, safe='')}"
+
+    def _convert_user(self, gitlab_user: dict[str, Any]) -> User:
+        """Convert a GitLab user to platform-agnostic User model."""
+        return self._intern(self._users, str(gitlab_user["id"]), lambda: User(
+            id=str(gitlab_user["id"]),
+            login=gitlab_user["username"],
+            name=gitlab_user.get("name"),
+            # Only set when the user made their email public
+            email=gitlab_user.get("public_email") or None
+        ))
+
+    def _convert_repository(self, project: dict[str, Any]) -> Repository:
+        """Convert a GitLab project to platform-agnostic Repository model."""
+        namespace = project["namespace"]
+        return self._intern(self._repositories, str(project["id"]), lambda: Repository(
+            id=str(project["id"]),
+            name=project["path"],
+            full_name=project["path_with_namespace"],
+            # The namespace is the owning user or group
+            owner=self._intern(self._users, f"namespace:{namespace['id']}", lambda: User(
+                id=str(namespace["id"]),
+                login=namespace["full_path"],
+                name=namespace.get("name")
+            )),
+            description=project.get("description"),
+            private=project.get("visibility") != "public"
+        ))
+
+    def _convert_merge_request(self, repository: Repository, merge_request: dict[str, Any]) -> PullRequest:
+        """Convert a GitLab merge request to platform-agnostic PullRequest model."""
+        return PullRequest(
+            id=str(merge_request["id"]),
+            number=merge_request["iid"],
+            title=merge_request["title"],
+            author=self._convert_user(merge_request["author"]),
+            repository=repository,
+            created_at=parse(merge_request["created_at"]),
+            merged_at=parse(merge_request["merged_at"]) if merge_request.get("merged_at") else None,
+            merged=merge_request["state"] == "merged",
+            description=merge_request.get("description"),
+            file_diffs=None,  # Don't load diffs immediately
+            _diff_loader=lambda: self.get_diff(repository.full_name, merge_request["iid"])
+        )
+
+    @fetch_scope
+    def get_user_by_id(self, user_id: str) -> Optional[User]:
+        """Get a user by username."""
+        try:
+            users = self.rest.get_json("users", {"username": user_id})
+            return self._convert_user(users[0]) if users else None
+        except Exception as e:
+            raise Exception(f"Failed to find user with ID {user_id}: {str(e)}")
+
+    def get_user_repositories(self, user_id: str) -> List[Repository]:
+        return list(self.iter_user_repositories(user_id))
+
+    @fetch_scope
+    def iter_user_repositories(self, user_id: str) -> Iterator[Repository]:
+        """Yield the projects owned by a user, by username or ID."""
+        try:
+            for project in self.rest.iter_items(f"users/{quote(user_id, safe='')}/projects", {"per_page": 100}, self.pagination):
+                yield self._convert_repository(project)
+        except Exception as e:
+            raise Exception(f"Failed to fetch repositories for user ID {user_id}: {str(e)}")
+
+    def _fetch_repository(self, repo_name: str) -> Repository:
+        """Fetch a project by its full path, e.g. "group/subgroup/project"."""
+        return self._convert_repository(self.rest.get_json(self._project_path(repo_name)))
+
+    def get_merged_pull_requests(
+        self,
+        repo_name: str,
+        since_date: Optional[str] = None
+    ) -> List[PullRequest]:
+        return list(self.iter_merged_pull_requests(repo_name, since_date))
+
+    @fetch_scope
+    def iter_merged_pull_requests(
+        self,
+        repo_name: str,
+        since_date: Optional[str] = None
+    ) -> Iterator[PullRequest]:
+        try:
+            since_datetime: Optional[datetime] = parse(since_date).astimezone(timezone.utc) if since_date else None
+            repository = self.get_repository(repo_name)
+            params: dict[str, Any] = {"state": "merged", "order_by": "updated_at", "sort": "desc", "per_page": 100}
+            if since_datetime:
+                # Merging updates a merge request, so GitLab can leave out everything not updated since
+                params["updated_after"] = since_datetime.isoformat()
+
+            for merge_request in self.rest.iter_items(f"{self._project_path(repo_name)}/merge_requests", params, self.pagination):
+                converted = self._convert_merge_request(repository, merge_request)
+                if since_datetime and (converted.merged_at is None or converted.merged_at < since_datetime):
+                    continue
+                yield converted
+        except ValueError as e:
+            raise ValueError(f"Value error, potential issue in date format: {str(e)}")
+        except Exception as e:
+            raise Exception(f"Failed to fetch pull requests for repository {repo_name}: {str(e)}")
+
+    def get_diff(self, repo_name: str, number: int) -> dict[filename, diff]:
+        """Get the diff of a merge request organized by filename."""
+        try:
+            file_diffs = self.rest.iter_items(
+                f"{self._project_path(repo_name)}/merge_requests/{number}/diffs",
+                {"per_page": 100},
+                self.pagination
+            )
+            # Deleted files are named by their old path, like the other clients
+            return {
+                file_diff["old_path"] if file_diff.get("deleted_file") else file_diff["new_path"]: file_diff["diff"]
+                for file_diff in file_diffs
+                if file_diff.get("diff")
+            }
+        except Exception as e:
+            raise Exception(f"Failed to get diffs for MR !{number}: {str(e)}")
@@ -0,0 +1,114 @@
+from datetime import datetime, timezone
+from typing import Any
+from unittest.mock import Mock
+import pytest
+
+from code_analysis_tool.gitlab_client import GitLabClient
+from code_analysis_tool.models.user import User
+from code_analysis_tool.rest_client_test import make_response
+
+PROJECT = {
+    "id": 7,
+    "path": "project",
+    "path_with_namespace": "group/sub/project",
+    "namespace": {"id": 3, "full_path": "group/sub", "name": "Sub"},
+    "description": "A project",
+    "visibility": "private"
+}
+AUTHOR = {"id": 2, "username": "author", "name": "Author"}
+
+def merge_request(iid: int, merged_at: str) -> dict[str, Any]:
+    return {
+        "id": 100 + iid,
+        "iid": iid,
+        "title": f"MR {iid}",
+        "description": "description",
+        "state": "merged",
+        "author": AUTHOR,
+        "created_at": "2024-01-01T00:00:00Z",
+        "merged_at": merged_at
+    }
+
+@pytest.fixture
+def client() -> GitLabClient:
+    return GitLabClient("fake_token")
+
+def test_sends_private_token(client: GitLabClient) -> None:
+    assert client.rest.session.headers["PRIVATE-TOKEN"] == "fake_token"
+
+def test_get_user_by_id(client: GitLabClient) -> None:
+    client.rest.session.get = Mock(return_value=make_response([{**AUTHOR, "public_email": "author@example.com"}]))
+
+    assert client.get_user_by_id("author") == User(id="2", login="author", name="Author", email="author@example.com")
+    assert client.rest.session.get.call_args.kwargs["params"] == {"username": "author"}
+
+def test_get_user_by_id_not_found(client: GitLabClient) -> None:
+    client.rest.session.get = Mock(return_value=make_response([]))
+
+    assert client.get_user_by_id("nobody") is None
+
+def test_get_user_repositories(client: GitLabClient) -> None:
+    client.rest.session.get = Mock(return_value=make_response([PROJECT], headers={"X-Total-Pages": "1"}))
+
+    repositories = client.get_user_repositories("author")
+
+    assert len(repositories) == 1
+    assert repositories[0].full_name == "group/sub/project"
+    assert repositories[0].owner.login == "group/sub"
+    assert repositories[0].private
+
+def test_get_merged_pull_requests_filters_by_merge_date(client: GitLabClient) -> None:
+    def get(url: str, params: Any = None, **kwargs: Any) -> Any:
+        if url.endswith("/projects/group%2Fsub%2Fproject"):
+            return make_response(PROJECT)
+        assert url.endswith("/projects/group%2Fsub%2Fproject/merge_requests")
+        assert params["state"] == "merged"
+        assert params["updated_after"] == "2024-02-01T00:00:00+00:00"
+        return make_response(
+            [merge_request(2, "2024-02-15T00:00:00Z"), merge_request(1, "2024-01-15T00:00:00Z")],
+            headers={"X-Total-Pages": "1"}
+        )
+    client.rest.session.get = Mock(side_effect=get)
+
+    pull_requests = client.get_merged_pull_requests("group/sub/project", "2024-02-01T00:00:00Z")
+
+    assert [pr.number for pr in pull_requests] == [2]
+    assert pull_requests[0].id == "102"
+    assert pull_requests[0].merged
+    assert pull_requests[0].merged_at == datetime(2024, 2, 15, tzinfo=timezone.utc)
+    assert pull_requests[0].repository.full_name == "group/sub/project"
+
+def test_get_merged_pull_requests_failure(client: GitLabClient) -> None:
+    client.rest.session.get = Mock(return_value=make_response({"message": "404 Project Not Found"}, status_code=404))
+
+    with pytest.raises(Exception) as exc_info:
+        client.get_merged_pull_requests("group/missing")
+
+    assert "Failed to fetch pull requests for repository group/missing" in str(exc_info.value)
+
+def test_get_diff(client: GitLabClient) -> None:
+    client.rest.session.get = Mock(return_value=make_response([
+        {"old_path": "a.py", "new_path": "a.py", "diff": "@@ -1 +1 @@\n-old\n+new\n", "deleted_file": False},
+        {"old_path": "gone.py", "new_path": "gone.py", "diff": "@@ -1 +0,0 @@\n-gone\n", "deleted_file": True},
+        {"old_path": "image.png", "new_path": "image.png", "diff": "", "deleted_file": False}
+    ], headers={"X-Total-Pages": "1"}))
+
+    assert client.get_diff("group/sub/project", 2) == {
+        "a.py": "@@ -1 +1 @@\n-old\n+new\n",
+        "gone.py": "@@ -1 +0,0 @@\n-gone\n"
+    }
+
+def test_get_merged_pull_requests_for_user_keeps_repository_order(client: GitLabClient) -> None:
+    other = {**PROJECT, "id": 8, "path": "other", "path_with_namespace": "group/sub/other"}
+
+    def get(url: str, params: Any = None, **kwargs: Any) -> Any:
+        if url.endswith("/users/author/projects"):
+            return make_response([PROJECT, other])
+        if url.endswith("group%2Fsub%2Fproject/merge_requests"):
+            return make_response([merge_request(1, "2024-02-15T00:00:00Z")])
+        return make_response([merge_request(2, "2024-02-15T00:00:00Z")])
+    client.rest.session.get = Mock(side_effect=get)
+
+    pull_requests = client.get_merged_pull_requests_for_user("author")
+
+    assert [(pr.repository.full_name, pr.number) for pr in pull_requests] == [("group/sub/project", 1), ("group/sub/other", 2)]
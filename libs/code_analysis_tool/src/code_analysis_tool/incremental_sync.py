@@ -0,0 +1,146 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Iterable, List, Optional
+from loguru import logger
+
+from state_manager.checkpoint import CheckpointStateManager
+from state_manager.interfaces import BaseState, StateManager
+
+from code_analysis_tool.interfaces import SourceControlFetcher
+from code_analysis_tool.models.pull_request import PullRequest
+
+@dataclass
+class RepositoryCursor:
+    """
+    How far a repository has been synced: the newest merged at timestamp, and the
+    pull requests merged within the overlap window before it by number, so pull
+    requests merged in the same second or fetched again by the overlap are skipped.
+    """
+    merged_at: str
+    seen: dict[str, str] = field(default_factory=dict)
+
+class IncrementalSyncState(BaseState):
+    """Sync cursor per repository full name"""
+    id: str
+    cursors: dict[str, RepositoryCursor]
+    last_updated_date: datetime
+    def __init__(self, id: str, cursors: Optional[dict[str, RepositoryCursor]] = None):
+        self.id: str = id
+        self.cursors: dict[str, RepositoryCursor] = cursors or {}
+        super().__init__()
+
+class IncrementalSync:
+    """
+    Fetches only the pull requests merged since the previous run of each repository,
+    keeping a cursor per repository in a StateManager instead of every caller tracking
+    since_date by hand.
+
+    Cursors only advance in commit, after the caller has handled the pull requests,
+    so a failed run fetches the same pull requests again rather than dropping them.
+    With a CheckpointStateManager each commit is a cheap checkpoint.
+    """
+
+    def __init__(
+        self,
+        fetcher: SourceControlFetcher,
+        state_manager: StateManager[IncrementalSyncState],
+        initial_since_date: Optional[str] = None,
+        overlap_secs: int = 0,
+        state_id: str = "incremental_sync"
+    ) -> None:
+        """
+        Args:
+            fetcher: Source control fetcher to get pull requests from
+            state_manager: State manager that stores the cursors
+            initial_since_date: Date to sync repositories without a cursor from, all history if None
+            overlap_secs: How far before the cursor to fetch again, for APIs like search whose
+                index can lag behind merges. Pull requests already synced are skipped.
+            state_id: ID of a new state
+        """
+        self.fetcher = fetcher
+        self.state_manager = state_manager
+        self.initial_since_date = initial_since_date
+        self.overlap = timedelta(seconds=overlap_secs)
+        self.state: IncrementalSyncState = state_manager.get_state() or IncrementalSyncState(id=state_id)
+
+    def cursor(self, repo_name: str) -> Optional[RepositoryCursor]:
+        return self.state.cursors.get(repo_name)
+
+    def fetch_new_pull_requests(self, repo_name: str) -> List[PullRequest]:
+        """
+        Get the pull requests merged in a repository since its cursor, or since
+        initial_since_date on the first sync. Doesn't advance the cursor.
+
+        Args:
+            repo_name: Full name of the repository
+
+        Returns:
+            Pull requests that haven't been committed yet
+        """
+        cursor = self.cursor(repo_name)
+        if cursor is None:
+            return self.fetcher.get_merged_pull_requests(repo_name, self.initial_since_date)
+
+        since = datetime.fromisoformat(cursor.merged_at) - self.overlap
+        return [
+            pr for pr in self.fetcher.iter_merged_pull_requests(repo_name, since.isoformat())
+            if pr.merged_at is not None and pr.merged_at >= since and str(pr.number) not in cursor.seen
+        ]
+
+    def commit(self, repo_name: str, pull_requests: Iterable[PullRequest]) -> None:
+        """
+        Advance a repository's cursor past pull requests that have been handled and save it.
+
+        Args:
+            repo_name: Full name of the repository
+            pull_requests: Pull requests from fetch_new_pull_requests that have been handled
+        """
+        merged = [pr for pr in pull_requests if pr.merged_at is not None]
+        if not merged:
+            return
+
+        cursor = self.cursor(repo_name) or RepositoryCursor(merged_at=merged[0].merged_at.isoformat())
+        seen = {**cursor.seen, **{str(pr.number): pr.merged_at.isoformat() for pr in merged}}
+        newest = max([datetime.fromisoformat(cursor.merged_at)] + [pr.merged_at for pr in merged])
+        # Only pull requests within the overlap window can be fetched again
+        oldest_refetched = newest - self.overlap
+        self.state.cursors[repo_name] = RepositoryCursor(
+            merged_at=newest.isoformat(),
+            seen={number: merged_at for number, merged_at in seen.items() if datetime.fromisoformat(merged_at) >= oldest_refetched}
+        )
+        self._save()
+
+    def _save(self) -> None:
+        if isinstance(self.state_manager, CheckpointStateManager):
+            self.state_manager.checkpoint(self.state)
+        else:
+            self.state_manager.save_state(self.state)
+
+    def sync(
+        self,
+        repo_names: Iterable[str],
+        handle: Callable[[str, List[PullRequest]], None]
+    ) -> dict[str, int]:
+        """
+        Fetch the new pull requests of each repository, pass them to handle and commit them.
+
+        Args:
+            repo_names: Full names of the repositories to sync
+            handle: Called with the repository name and its new pull requests, e.g. to store them.
+                The cursor only advances once it returns.
+
+        Returns:
+            Number of new pull requests by repository
+        """
+        synced: dict[str, int] = {}
+        for repo_name in repo_names:
+            try:
+                pull_requests = self.fetch_new_pull_requests(repo_name)
+            except Exception as e:
+                raise Exception(f"Failed to sync repository {repo_name}: {str(e)}")
+            if pull_requests:
+                handle(repo_name, pull_requests)
+                self.commit(repo_name, pull_requests)
+            logger.info(f"Synced {len(pull_requests)} new pull request(s) from {repo_name}")
+            synced[repo_name] = len(pull_requests)
+        return synced
@@ -0,0 +1,118 @@
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+from unittest.mock import Mock
+import pytest
+
+from state_manager.checkpoint import CheckpointStateManager
+from state_manager.local import LocalFileStateManager
+
+from code_analysis_tool.incremental_sync import IncrementalSync, IncrementalSyncState
+from code_analysis_tool.interfaces import SourceControlFetcher
+from code_analysis_tool.models.pull_request import PullRequest
+from code_analysis_tool.models.repository import Repository
+from code_analysis_tool.models.user import User
+
+OWNER = User(id="1", login="owner")
+REPO = Repository(id="10", name="repo", full_name="owner/repo", owner=OWNER)
+
+def pull_request(number: int, merged_at: datetime) -> PullRequest:
+    return PullRequest(
+        id=str(1000 + number),
+        number=number,
+        title=f"PR {number}",
+        author=OWNER,
+        repository=REPO,
+        created_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        merged_at=merged_at,
+        merged=True,
+        description=None
+    )
+
+class FakeFetcher(SourceControlFetcher):
+    """Serves a fixed list of pull requests, filtered by since_date like the real clients"""
+
+    def __init__(self, pull_requests: List[PullRequest]) -> None:
+        self.pull_requests = pull_requests
+        self.since_dates: List[Optional[str]] = []
+
+    def get_user_by_id(self, user_id: str) -> Optional[User]:
+        return None
+
+    def get_user_repositories(self, user_id: str) -> List[Repository]:
+        return [REPO]
+
+    def get_merged_pull_requests(self, repo_name: str, since_date: Optional[str] = None) -> List[PullRequest]:
+        self.since_dates.append(since_date)
+        since = datetime.fromisoformat(since_date) if since_date else None
+        return [pr for pr in self.pull_requests if since is None or pr.merged_at >= since]
+
+    def get_merged_pull_requests_for_user(self, user_id: str, since_date: Optional[str] = None) -> List[PullRequest]:
+        return self.get_merged_pull_requests(REPO.full_name, since_date)
+
+@pytest.fixture
+def state_manager(tmp_path: Path) -> LocalFileStateManager[IncrementalSyncState]:
+    return LocalFileStateManager(str(tmp_path / "state.json"), IncrementalSyncState)
+
+def test_first_sync_uses_initial_since_date(state_manager: LocalFileStateManager) -> None:
+    fetcher = FakeFetcher([pull_request(1, datetime(2024, 2, 1, tzinfo=timezone.utc))])
+    sync = IncrementalSync(fetcher, state_manager, initial_since_date="2024-01-01T00:00:00+00:00")
+
+    assert [pr.number for pr in sync.fetch_new_pull_requests("owner/repo")] == [1]
+    assert fetcher.since_dates == ["2024-01-01T00:00:00+00:00"]
+
+def test_next_run_only_fetches_new_pull_requests(state_manager: LocalFileStateManager) -> None:
+    newest = datetime(2024, 2, 1, tzinfo=timezone.utc)
+    fetcher = FakeFetcher([pull_request(1, datetime(2024, 1, 15, tzinfo=timezone.utc)), pull_request(2, newest)])
+    handle = Mock()
+    IncrementalSync(fetcher, state_manager).sync(["owner/repo"], handle)
+
+    # A pull request merged in the same second as the newest synced one is still picked up
+    fetcher.pull_requests.append(pull_request(3, newest))
+    fetcher.pull_requests.append(pull_request(4, datetime(2024, 2, 2, tzinfo=timezone.utc)))
+    synced = IncrementalSync(fetcher, state_manager).sync(["owner/repo"], handle)
+
+    assert synced == {"owner/repo": 2}
+    assert [pr.number for pr in handle.call_args.args[1]] == [3, 4]
+    assert fetcher.since_dates[-1] == newest.isoformat()
+    assert state_manager.get_state().cursors["owner/repo"].merged_at == "2024-02-02T00:00:00+00:00"
+
+def test_overlap_refetches_without_duplicates(state_manager: LocalFileStateManager) -> None:
+    fetcher = FakeFetcher([pull_request(1, datetime(2024, 2, 1, 12, tzinfo=timezone.utc))])
+    IncrementalSync(fetcher, state_manager, overlap_secs=3600).sync(["owner/repo"], Mock())
+
+    # Merged before the cursor but only indexed after the last run
+    fetcher.pull_requests.append(pull_request(2, datetime(2024, 2, 1, 11, 30, tzinfo=timezone.utc)))
+    sync = IncrementalSync(fetcher, state_manager, overlap_secs=3600)
+
+    assert [pr.number for pr in sync.fetch_new_pull_requests("owner/repo")] == [2]
+    assert fetcher.since_dates[-1] == "2024-02-01T11:00:00+00:00"
+
+def test_cursor_only_advances_after_handling(state_manager: LocalFileStateManager) -> None:
+    fetcher = FakeFetcher([pull_request(1, datetime(2024, 2, 1, tzinfo=timezone.utc))])
+    handle = Mock(side_effect=RuntimeError("insert failed"))
+
+    with pytest.raises(RuntimeError):
+        IncrementalSync(fetcher, state_manager).sync(["owner/repo"], handle)
+
+    assert state_manager.get_state() is None
+    assert [pr.number for pr in IncrementalSync(fetcher, state_manager).fetch_new_pull_requests("owner/repo")] == [1]
+
+def test_commits_are_checkpointed(tmp_path: Path, state_manager: LocalFileStateManager) -> None:
+    fetcher = FakeFetcher([pull_request(1, datetime(2024, 2, 1, tzinfo=timezone.utc))])
+    with CheckpointStateManager(state_manager, str(tmp_path / "checkpoints.log")) as checkpoints:
+        checkpoints.checkpoint = Mock(wraps=checkpoints.checkpoint)
+        IncrementalSync(fetcher, checkpoints).sync(["owner/repo"], Mock())
+
+        checkpoints.checkpoint.assert_called_once()
+
+    assert state_manager.get_state().cursors["owner/repo"].merged_at == "2024-02-01T00:00:00+00:00"
+
+def test_fetch_failure_names_repository(state_manager: LocalFileStateManager) -> None:
+    fetcher = Mock(spec=SourceControlFetcher)
+    fetcher.get_merged_pull_requests.side_effect = Exception("API down")
+
+    with pytest.raises(Exception) as exc_info:
+        IncrementalSync(fetcher, state_manager).sync(["owner/repo"], Mock())
+
+    assert "Failed to sync repository owner/repo" in str(exc_info.value)
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import AsyncIterator, Iterator, List, Optional
 from code_analysis_tool.models.repository import Repository
 from code_analysis_tool.models.pull_request import PullRequest
 from code_analysis_tool.models.user import User
@@ -33,4 +33,73 @@ class SourceControlFetcher(ABC):
         since_date: Optional[str] = None
     ) -> List[PullRequest]:
         """Get merged pull requests from all repositories of a user."""
-        pass 
\ No newline at end of file
+        pass
+
+    def iter_user_repositories(self, user_id: str) -> Iterator[Repository]:
+        """
+        Yield the repositories of a user as they are fetched.
+        Implementations that page through results should override this to yield each page as it arrives.
+        """
+        yield from self.get_user_repositories(user_id)
+
+    def iter_merged_pull_requests(
+        self,
+        repo_name: str,
+        since_date: Optional[str] = None
+    ) -> Iterator[PullRequest]:
+        """
+        Yield merged pull requests from a repository as they are fetched.
+        Implementations that page through results should override this to yield each page as it arrives.
+        """
+        yield from self.get_merged_pull_requests(repo_name, since_date)
+
+class AsyncSourceControlFetcher(ABC):
+    """Interface for source control operations from async code, returning the same models as SourceControlFetcher."""
+
+    @abstractmethod
+    async def get_user_by_id(self, user_id: str) -> Optional[User]:
+        """Get user by their ID."""
+        pass
+
+    @abstractmethod
+    async def get_user_repositories(self, user_id: str) -> List[Repository]:
+        """Get all repositories that a user contributes to."""
+        pass
+
+    @abstractmethod
+    async def get_merged_pull_requests(
+        self,
+        repo_name: str,
+        since_date: Optional[str] = None
+    ) -> List[PullRequest]:
+        """Get merged pull requests from a repository."""
+        pass
+
+    @abstractmethod
+    async def get_merged_pull_requests_for_user(
+        self,
+        user_id: str,
+        since_date: Optional[str] = None
+    ) -> List[PullRequest]:
+        """Get merged pull requests from all repositories of a user."""
+        pass
+
+    async def iter_user_repositories(self, user_id: str) -> AsyncIterator[Repository]:
+        """
+        Yield the repositories of a user as they are fetched.
+        Implementations that page through results should override this to yield each page as it arrives.
+        """
+        for repo in await self.get_user_repositories(user_id):
+            yield repo
+
+    async def iter_merged_pull_requests(
+        self,
+        repo_name: str,
+        since_date: Optional[str] = None
+    ) -> AsyncIterator[PullRequest]:
+        """
+        Yield merged pull requests from a repository as they are fetched.
+        Implementations that page through results should override this to yield each page as it arrives.
+        """
+        for pr in await self.get_merged_pull_requests(repo_name, since_date):
+            yield pr
@@ -0,0 +1,261 @@
+import re
+import subprocess
+from itertools import islice
+from typing import Iterator, List, Optional
+from dateutil.parser import parse
+
+from code_analysis_tool.interfaces import SourceControlFetcher
+from code_analysis_tool.models.repository import Repository
+from code_analysis_tool.models.pull_request import PullRequest
+from code_analysis_tool.models.user import User
+from .fetcher_base import ModelInterning, fetch_scope
+from .pull_request_utils import filename, diff, iter_lines, parse_unified_diff
+
+# GitHub's default subjects for merge commits and squash merges
+MERGE_SUBJECT = re.compile(r"^Merge pull request #(\d+) from \S+")
+SQUASH_SUBJECT = re.compile(r"^(?P<title>.*) \(#(?P<number>\d+)\)$")
+
+FIELD_SEPARATOR = "\x1f"
+RECORD_SEPARATOR = "\x1e"
+COMMIT_FORMAT = FIELD_SEPARATOR.join(["%H", "%P", "%an", "%ae", "%aI", "%cI", "%s", "%b"]) + RECORD_SEPARATOR
+AUTHOR_FORMAT = FIELD_SEPARATOR.join(["%H", "%an", "%ae", "%aI"]) + RECORD_SEPARATOR
+
+# Number of merge commits whose pull request authors are looked up with one git call
+BATCH_SIZE = 100
+
+class LocalGitClient(ModelInterning, SourceControlFetcher):
+    """
+    Source control fetcher that reads pull requests from local clones, e.g. bare mirrors
+    kept up to date with `git clone --mirror` and `git remote update`, without any API calls.
+
+    Pull requests are recognised from the first-parent history of a branch by GitHub's
+    merge commit subject ("Merge pull request #12 from owner/branch") or squash merge
+    subject ("Title (#12)"). Diffs come from `git diff` against the first parent.
+
+    Git has no accounts, so users are identified by commit email. A merge commit's
+    pull request author is the author of its second parent, and created_at is the
+    author date of the pull request's last commit since git doesn't record when the
+    pull request was opened.
+    """
+
+    def __init__(self, repositories: dict[str, str], branch: str = "HEAD", git_executable: str = "git") -> None:
+        """
+        Args:
+            repositories: Local clone path by repository full name, e.g. {"owner/repo": "/mirrors/repo.git"}
+            branch: Branch whose first-parent history holds the merged pull requests
+            git_executable: Git binary to run
+        """
+        super().__init__()
+        self.repositories = repositories
+        self.branch = branch
+        self.git_executable = git_executable
+
+    def _git(self, repo_name: str, *args: str, input: Optional[str] = None) -> str:
+        result = subprocess.run(
+            [self.git_executable, "-C", self._path(repo_name), *args],
+            input=input,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            errors="replace"
+        )
+        if result.returncode != 0:
+            raise Exception(result.stderr.strip())
+        return result.stdout
+
+    def _iter_records(self, repo_name: str, *args: str) -> Iterator[list[str]]:
+        """Stream the records of a git log with COMMIT_FORMAT, split into fields."""
+        process = subprocess.Popen(
+            [self.git_executable, "-C", self._path(repo_name), *args],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="replace"
+        )
+        try:
+            pending = ""
+            for chunk in iter(lambda: process.stdout.read(64 * 1024), ""):
+                pending += chunk
+                *records, pending = pending.split(RECORD_SEPARATOR)
+                for record in records:
+                    yield record.lstrip("\n").split(FIELD_SEPARATOR)
+            if process.wait() != 0:
+                raise Exception(process.stderr.read().strip())
+        finally:
+            # Stop git if the caller stopped iterating early
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+            process.stderr.close()
+
+    def _path(self, repo_name: str) -> str:
+        if repo_name not in self.repositories:
+            raise Exception(f"No local clone configured for repository {repo_name}")
+        return self.repositories[repo_name]
+
+    def _user(self, name: str, email: str) -> User:
+        return self._intern(self._users, email, lambda: User(id=email, login=email, name=name or None, email=email or None))
+
+    def _repository(self, repo_name: str) -> Repository:
+        owner, _, name = repo_name.rpartition("/")
+        return self._intern(self._repositories, repo_name, lambda: Repository(
+            id=repo_name,
+            name=name,
+            full_name=repo_name,
+            owner=self._intern(self._users, owner, lambda: User(id=owner, login=owner)),
+            description=None,
+            private=False
+        ))
+
+    def _matches_user(self, user: User, user_id: str) -> bool:
+        return user_id.lower() in (user.login.lower(), (user.name or "").lower())
+
+    @fetch_scope
+    def get_user_by_id(self, user_id: str) -> Optional[User]:
+        """Find a commit author by email or name across the configured repositories."""
+        try:
+            for repo_name in self.repositories:
+                # --author matches anywhere in "name <email>", so confirm the match exactly
+                output = self._git(repo_name, "log", "--all", "-i", "-F", f"--author={user_id}", f"--format={AUTHOR_FORMAT}")
+                for record in output.split(RECORD_SEPARATOR):
+                    fields = record.lstrip("\n").split(FIELD_SEPARATOR)
+                    if len(fields) < 3:
+                        continue
+                    user = self._user(fields[1], fields[2])
+                    if self._matches_user(user, user_id):
+                        return user
+            return None
+        except Exception as e:
+            raise Exception(f"Failed to find user with ID {user_id}: {str(e)}")
+
+    @fetch_scope
+    def get_user_repositories(self, user_id: str) -> List[Repository]:
+        """Get the configured repositories that have commits authored by the user."""
+        try:
+            return [
+                self._repository(repo_name)
+                for repo_name in self.repositories
+                if self._git(repo_name, "log", "--all", "-i", "-F", "-1", f"--author={user_id}", "--format=%H").strip()
+            ]
+        except Exception as e:
+            raise Exception(f"Failed to fetch repositories for user ID {user_id}: {str(e)}")
+
+    def get_merged_pull_requests(
+        self,
+        repo_name: str,
+        since_date: Optional[str] = None
+    ) -> List[PullRequest]:
+        return list(self.iter_merged_pull_requests(repo_name, since_date))
+
+    @fetch_scope
+    def iter_merged_pull_requests(
+        self,
+        repo_name: str,
+        since_date: Optional[str] = None
+    ) -> Iterator[PullRequest]:
+        try:
+            args = ["log", "--first-parent", f"--format={COMMIT_FORMAT}"]
+            if since_date:
+                args.append(f"--since={parse(since_date).isoformat()}")
+            records = self._iter_records(repo_name, *args, self.branch, "--")
+            repository = self._repository(repo_name)
+            while batch := list(islice(records, BATCH_SIZE)):
+                yield from self._convert_commits(repository, batch)
+        except ValueError as e:
+            raise ValueError(f"Value error, potential issue in date format: {str(e)}")
+        except Exception as e:
+            raise Exception(f"Failed to fetch pull requests for repository {repo_name}: {str(e)}")
+
+    def _convert_commits(self, repository: Repository, records: list[list[str]]) -> Iterator[PullRequest]:
+        """Convert the pull request commits among a batch of first-parent log records."""
+        commits = []
+        for sha, parents, author_name, author_email, authored_at, committed_at, subject, body in records:
+            parents = parents.split()
+            if (merge := MERGE_SUBJECT.match(subject)) and len(parents) > 1:
+                # GitHub puts the pull request title on the first line of the merge commit body
+                title, _, description = body.strip().partition("\n")
+                commits.append((sha, parents, int(merge.group(1)), title, description, None, committed_at))
+            elif (squash := SQUASH_SUBJECT.match(subject)) and parents:
+                author = (author_name, author_email, authored_at)
+                commits.append((sha, parents, int(squash.group("number")), squash.group("title"), body, author, committed_at))
+
+        # Merge commits are made by whoever merged, the pull request author wrote the merged branch
+        heads = [parents[1] for _, parents, _, _, _, author, _ in commits if author is None]
+        head_authors = self._authors(repository.full_name, heads) if heads else {}
+
+        for sha, parents, number, title, description, author, committed_at in commits:
+            author_name, author_email, authored_at = author or head_authors[parents[1]]
+            yield PullRequest(
+                id=sha,
+                number=number,
+                title=title,
+                author=self._user(author_name, author_email),
+                repository=repository,
+                created_at=parse(authored_at),
+                merged_at=parse(committed_at),
+                merged=True,
+                description=description.strip() or None,
+                file_diffs=None,  # Don't load diffs immediately
+                _diff_loader=lambda base=parents[0], head=sha: self.get_diff(repository.full_name, base, head)
+            )
+
+    def _authors(self, repo_name: str, shas: list[str]) -> dict[str, tuple[str, str, str]]:
+        """Look up (name, email, date) of many commits with one git call."""
+        output = self._git(repo_name, "log", "--no-walk=unsorted", "--stdin", f"--format={AUTHOR_FORMAT}", input="\n".join(shas) + "\n")
+        authors = {}
+        for record in output.split(RECORD_SEPARATOR):
+            fields = record.lstrip("\n").split(FIELD_SEPARATOR)
+            if len(fields) == 4:
+                authors[fields[0]] = (fields[1], fields[2], fields[3])
+        return authors
+
+    def get_diff(self, repo_name: str, base: str, head: str) -> dict[filename, diff]:
+        """Get the diff between two commits organized by filename."""
+        process = subprocess.Popen(
+            [self.git_executable, "-C", self._path(repo_name), "diff", "--no-color", "--no-ext-diff", base, head, "--"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+        try:
+            diffs = dict(parse_unified_diff(iter_lines(iter(lambda: process.stdout.read(64 * 1024), b""))))
+            if process.wait() != 0:
+                raise Exception(f"Failed to get diff {base}..{head}: {process.stderr.read().decode('utf-8', errors='replace').strip()}")
+            return diffs
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+            process.stderr.close()
+
+    @fetch_scope
+    def get_merged_pull_requests_for_user(
+        self,
+        user_id: str,
+        since_date: Optional[str] = None
+    ) -> List[PullRequest]:
+        try:
+            return [
+                pr
+                for repo in self.get_user_repositories(user_id)
+                for pr in self.iter_merged_pull_requests(repo.full_name, since_date)
+            ]
+        except Exception as e:
+            raise Exception(f"Failed to fetch merged pull requests for user ID {user_id}: {str(e)}")
+
+    @fetch_scope
+    def get_merged_pull_requests_authored_by(
+        self,
+        user_id: str,
+        since_date: Optional[str] = None
+    ) -> List[PullRequest]:
+        """
+        Like get_merged_pull_requests_for_user, but only the pull requests authored by
+        the user, matched by commit email or name.
+        """
+        try:
+            return [pr for pr in self.get_merged_pull_requests_for_user(user_id, since_date) if self._matches_user(pr.author, user_id)]
+        except Exception as e:
+            raise Exception(f"Failed to fetch pull requests authored by user ID {user_id}: {str(e)}")
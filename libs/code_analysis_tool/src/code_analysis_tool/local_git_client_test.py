@@ -0,0 +1,127 @@
+import os
+import subprocess
+import pytest
+from datetime import datetime, timezone
+from pathlib import Path
+
+from code_analysis_tool.local_git_client import LocalGitClient
+from code_analysis_tool.models.pull_request import PullRequest
+from code_analysis_tool.models.user import User
+
+def git(repo: Path, *args: str, author: tuple[str, str] = ("Maintainer", "maintainer@example.com"), date: str = "2024-01-01T00:00:00+00:00") -> str:
+    env = {
+        **os.environ,
+        "GIT_AUTHOR_NAME": author[0],
+        "GIT_AUTHOR_EMAIL": author[1],
+        "GIT_AUTHOR_DATE": date,
+        "GIT_COMMITTER_NAME": "Maintainer",
+        "GIT_COMMITTER_EMAIL": "maintainer@example.com",
+        "GIT_COMMITTER_DATE": date,
+        "GIT_CONFIG_GLOBAL": os.devnull,
+        "GIT_CONFIG_SYSTEM": os.devnull,
+    }
+    return subprocess.run(["git", "-C", str(repo), *args], env=env, check=True, capture_output=True, text=True).stdout
+
+def commit_file(repo: Path, name: str, content: str, message: str, **kwargs) -> None:
+    (repo / name).write_text(content)
+    git(repo, "add", name, **kwargs)
+    git(repo, "commit", "-m", message, **kwargs)
+
+@pytest.fixture(scope="module")
+def bare_clone(tmp_path_factory: pytest.TempPathFactory) -> str:
+    """
+    History on main:
+      - initial commit
+      - merge of PR #1 by alice, adding feature.py
+      - squash merge of PR #2 by bob, changing app.py
+      - direct commit that isn't a pull request
+    """
+    repo = tmp_path_factory.mktemp("work")
+    git(repo, "init", "-b", "main")
+    commit_file(repo, "app.py", "print('hello')\n", "Initial commit")
+
+    alice = ("Alice", "alice@example.com")
+    git(repo, "checkout", "-b", "feature")
+    commit_file(repo, "feature.py", "def feature():\n    pass\n", "Add feature", author=alice, date="2024-01-05T00:00:00+00:00")
+    git(repo, "checkout", "main")
+    git(repo, "merge", "--no-ff", "feature", "-m", "Merge pull request #1 from alice/feature\n\nAdd feature module\n\nAdds the feature.", date="2024-01-10T00:00:00+00:00")
+
+    bob = ("Bob", "bob@example.com")
+    commit_file(repo, "app.py", "print('hello world')\n", "Greet the world (#2)\n\n* Greet the world", author=bob, date="2024-01-20T00:00:00+00:00")
+    commit_file(repo, "notes.txt", "notes\n", "Direct commit", date="2024-01-25T00:00:00+00:00")
+
+    clone = tmp_path_factory.mktemp("mirror") / "repo.git"
+    git(repo, "clone", "--bare", str(repo), str(clone))
+    return str(clone)
+
+@pytest.fixture
+def client(bare_clone: str) -> LocalGitClient:
+    return LocalGitClient({"owner/repo": bare_clone})
+
+def test_get_merged_pull_requests(client: LocalGitClient) -> None:
+    result = client.get_merged_pull_requests("owner/repo")
+
+    assert [pr.number for pr in result] == [2, 1]
+    squashed, merged = result
+    assert isinstance(merged, PullRequest)
+    assert merged.title == "Add feature module"
+    assert merged.description == "Adds the feature."
+    assert merged.author == User(id="alice@example.com", login="alice@example.com", name="Alice", email="alice@example.com")
+    assert merged.merged_at == datetime(2024, 1, 10, tzinfo=timezone.utc)
+    assert merged.created_at == datetime(2024, 1, 5, tzinfo=timezone.utc)
+    assert merged.repository.full_name == "owner/repo"
+    assert merged.repository.owner.login == "owner"
+    assert squashed.title == "Greet the world"
+    assert squashed.author.name == "Bob"
+    assert squashed.merged is True
+
+def test_diffs_load_lazily_from_git(client: LocalGitClient) -> None:
+    squashed, merged = client.get_merged_pull_requests("owner/repo")
+
+    assert merged._file_diffs is None
+    assert merged.file_diffs == {"feature.py": "@@ -0,0 +1,2 @@\n+def feature():\n+    pass"}
+    assert squashed.file_diffs == {"app.py": "@@ -1 +1 @@\n-print('hello')\n+print('hello world')"}
+
+def test_get_merged_pull_requests_since_date(client: LocalGitClient) -> None:
+    result = client.get_merged_pull_requests("owner/repo", "2024-01-15T00:00:00Z")
+
+    assert [pr.number for pr in result] == [2]
+
+def test_get_merged_pull_requests_invalid_date(client: LocalGitClient) -> None:
+    with pytest.raises(ValueError) as exc_info:
+        client.get_merged_pull_requests("owner/repo", "invalid-date")
+
+    assert "Value error, potential issue in date format" in str(exc_info.value)
+
+def test_get_merged_pull_requests_unknown_repository(client: LocalGitClient) -> None:
+    with pytest.raises(Exception) as exc_info:
+        client.get_merged_pull_requests("owner/missing")
+
+    assert str(exc_info.value) == "Failed to fetch pull requests for repository owner/missing: No local clone configured for repository owner/missing"
+
+def test_iter_merged_pull_requests_stops_early(client: LocalGitClient) -> None:
+    merged_pulls = client.iter_merged_pull_requests("owner/repo")
+
+    assert next(merged_pulls).number == 2
+    merged_pulls.close()
+
+def test_get_user_by_id(client: LocalGitClient) -> None:
+    assert client.get_user_by_id("alice@example.com").name == "Alice"
+    assert client.get_user_by_id("bob").login == "bob@example.com"
+    assert client.get_user_by_id("example.com") is None
+
+def test_get_merged_pull_requests_for_user(client: LocalGitClient) -> None:
+    assert [repo.full_name for repo in client.get_user_repositories("alice@example.com")] == ["owner/repo"]
+    assert client.get_user_repositories("carol@example.com") == []
+
+    result = client.get_merged_pull_requests_for_user("alice@example.com")
+
+    # Every merged pull request of the user's repositories, like the API clients
+    assert [pr.number for pr in result] == [2, 1]
+    assert result[0].repository is result[1].repository
+
+def test_get_merged_pull_requests_authored_by(client: LocalGitClient) -> None:
+    result = client.get_merged_pull_requests_authored_by("alice@example.com")
+
+    assert [pr.number for pr in result] == [1]
+    assert client.get_merged_pull_requests_authored_by("carol@example.com") == []
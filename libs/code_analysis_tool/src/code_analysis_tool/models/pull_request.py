@@ -6,6 +6,11 @@ from code_analysis_tool.models.repository import Repository
 from loguru import logger
 
 class PullRequest:
+    __slots__ = (
+        "id", "number", "title", "author", "repository", "created_at", "merged_at", "merged",
+        "description", "additions", "deletions", "changed_files", "_file_diffs", "_diff_loader"
+    )
+
     def __init__(self, 
                  id: str,
                  number: int,
@@ -16,6 +21,9 @@ class PullRequest:
                  merged_at: Optional[datetime],
                  merged: bool,
                  description: Optional[str],
+                 additions: Optional[int] = None,
+                 deletions: Optional[int] = None,
+                 changed_files: Optional[int] = None,
                  file_diffs: Optional[dict] = None,
                  _diff_loader: Optional[callable] = None
                  ) -> None:
@@ -28,9 +36,17 @@ class PullRequest:
         self.merged_at = merged_at
         self.merged = merged
         self.description = description
+        self.additions = additions
+        self.deletions = deletions
+        self.changed_files = changed_files
         self._file_diffs = file_diffs
         self._diff_loader = _diff_loader
 
+    @property
+    def diffs_loaded(self) -> bool:
+        """Whether accessing file_diffs can return without a request"""
+        return self._file_diffs is not None or self._diff_loader is None
+
     @property
     def file_diffs(self) -> dict:
         if self._file_diffs is None and self._diff_loader is not None:
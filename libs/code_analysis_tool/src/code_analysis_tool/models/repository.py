@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from typing import Optional
 from .user import User
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Repository:
     """Platform-agnostic repository model."""
     id: str
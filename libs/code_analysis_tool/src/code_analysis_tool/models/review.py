@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+from .user import User
+
+@dataclass(frozen=True, slots=True)
+class Review:
+    """Platform-agnostic pull request review model."""
+    id: str
+    author: User
+    # e.g. APPROVED, CHANGES_REQUESTED, COMMENTED
+    state: str
+    submitted_at: Optional[datetime] = None
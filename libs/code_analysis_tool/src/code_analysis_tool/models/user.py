@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from typing import Optional
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class User:
     """Platform-agnostic user model."""
     id: str
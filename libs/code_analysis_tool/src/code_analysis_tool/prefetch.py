@@ -0,0 +1,32 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List
+
+from code_analysis_tool.models.pull_request import PullRequest
+
+def prefetch_diffs(pull_requests: Iterable[PullRequest], concurrency: int = 8) -> List[PullRequest]:
+    """
+    Load the diffs of many pull requests in parallel so that later access to
+    file_diffs doesn't block on a request per pull request.
+
+    Pull requests whose diffs are already loaded are skipped. A failed load is
+    logged and leaves an empty diff, the same as accessing file_diffs directly.
+    Keep concurrency at or below the client's max_workers, which sizes its
+    connection pool.
+
+    Args:
+        pull_requests: Pull requests to load the diffs for
+        concurrency: Maximum number of diffs loaded at the same time
+
+    Returns:
+        The pull requests, in the order given
+    """
+    pull_requests = list(pull_requests)
+    pending = [pr for pr in pull_requests if not pr.diffs_loaded]
+    if not pending:
+        return pull_requests
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="diff-prefetch") as executor:
+        # file_diffs caches the loaded diffs on each pull request
+        list(executor.map(lambda pr: pr.file_diffs, pending))
+
+    return pull_requests
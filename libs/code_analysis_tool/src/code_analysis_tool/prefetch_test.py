@@ -0,0 +1,62 @@
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from code_analysis_tool.models.pull_request import PullRequest
+from code_analysis_tool.models.repository import Repository
+from code_analysis_tool.models.user import User
+from code_analysis_tool.prefetch import prefetch_diffs
+
+def create_pull_request(number: int, diff_loader: Optional[Callable[[], dict]] = None, file_diffs: Optional[dict] = None) -> PullRequest:
+    user = User(id="1", login="test_user", name=None, email=None)
+    return PullRequest(
+        id=str(number),
+        number=number,
+        title=f"PR {number}",
+        author=user,
+        repository=Repository(id="1", name="repo", full_name="owner/repo", owner=user, description=None, private=False),
+        created_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        merged_at=datetime(2024, 1, 2, tzinfo=timezone.utc),
+        merged=True,
+        description=None,
+        file_diffs=file_diffs,
+        _diff_loader=diff_loader
+    )
+
+def test_prefetch_diffs_loads_concurrently() -> None:
+    # Every loader waits for the others, so this only finishes if they run at the same time
+    barrier = threading.Barrier(3, timeout=5)
+    def loader(number: int) -> Callable[[], dict]:
+        def load() -> dict:
+            barrier.wait()
+            return {f"file{number}.py": f"diff{number}"}
+        return load
+    pull_requests = [create_pull_request(number, loader(number)) for number in range(3)]
+
+    result = prefetch_diffs(pull_requests, concurrency=3)
+
+    assert result == pull_requests
+    assert all(pr.diffs_loaded for pr in pull_requests)
+    assert [pr.file_diffs for pr in pull_requests] == [{f"file{n}.py": f"diff{n}"} for n in range(3)]
+
+def test_prefetch_diffs_skips_loaded() -> None:
+    calls = []
+    loaded = create_pull_request(1, lambda: calls.append(1), file_diffs={"a.py": "diff"})
+    without_loader = create_pull_request(2)
+
+    prefetch_diffs([loaded, without_loader])
+
+    assert calls == []
+    assert loaded.file_diffs == {"a.py": "diff"}
+    assert without_loader.file_diffs == {}
+
+def test_prefetch_diffs_failure_leaves_empty_diff() -> None:
+    def fail() -> dict:
+        raise Exception("API error")
+    failing = create_pull_request(1, fail)
+    working = create_pull_request(2, lambda: {"b.py": "diff"})
+
+    prefetch_diffs(iter([failing, working]), concurrency=2)
+
+    assert failing.file_diffs == {}
+    assert working.file_diffs == {"b.py": "diff"}
@@ -1,9 +1,13 @@
 from github.PullRequest import PullRequest
-from typing import TypeAlias
+from github.Requester import Requester
+from typing import Iterable, Iterator, Optional, TypeAlias
+import requests
 
 filename: TypeAlias = str
 diff: TypeAlias = str
 
+DIFF_MEDIA_TYPE = "application/vnd.github.diff"
+
 def get_raw_diff(pr: PullRequest) -> dict[filename, diff]:
     """
     Get the raw diff content of a pull request organized by filename.
@@ -18,4 +22,105 @@ def get_raw_diff(pr: PullRequest) -> dict[filename, diff]:
         files = pr.get_files()
         return {file.filename: file.patch for file in files if file.patch is not None}
     except Exception as e:
-        raise Exception(f"Failed to get diffs for PR #{pr.number}: {str(e)}")
\ No newline at end of file
+        raise Exception(f"Failed to get diffs for PR #{pr.number}: {str(e)}")
+
+def get_streamed_diff(
+    requester: Requester,
+    repo_name: str,
+    number: int,
+    session: Optional[requests.Session] = None
+) -> dict[filename, diff]:
+    """
+    Get the diff of a pull request organized by filename from a single streamed request.
+
+    Unlike get_raw_diff this doesn't page through the pull request's files, isn't limited
+    to 3000 files and includes the patches GitHub omits from the files API for large files.
+
+    Args:
+        requester: Requester of the Github instance, used for its base URL and authentication
+        repo_name: Full name of the repository, e.g. "owner/repo"
+        number: Pull request number
+        session: Session to reuse connections from
+
+    Returns:
+        Dictionary where keys are filenames and values are the corresponding diff content
+    """
+    try:
+        return dict(iter_streamed_diff(requester, repo_name, number, session))
+    except Exception as e:
+        raise Exception(f"Failed to get diffs for PR #{number}: {str(e)}")
+
+def iter_streamed_diff(
+    requester: Requester,
+    repo_name: str,
+    number: int,
+    session: Optional[requests.Session] = None
+) -> Iterator[tuple[filename, diff]]:
+    """Stream a pull request's diff and yield (filename, patch) for each file as it is received."""
+    headers = {"Accept": DIFF_MEDIA_TYPE}
+    if requester.auth is not None:
+        requester.auth.authentication(headers)
+    url = f"{requester.base_url}/repos/{repo_name}/pulls/{number}"
+
+    with (session or requests).get(url, headers=headers, stream=True, timeout=60) as response:
+        response.raise_for_status()
+        yield from parse_unified_diff(iter_lines(response.iter_content(chunk_size=64 * 1024)))
+
+def iter_lines(chunks: Iterable[bytes]) -> Iterator[str]:
+    """
+    Split a stream of byte chunks into lines, without their line endings.
+    Only splits on newlines, unlike str.splitlines which would also split diff content on form feeds and the like.
+    """
+    pending = b""
+    for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8", errors="replace")
+    if pending:
+        yield pending.decode("utf-8", errors="replace")
+
+def parse_unified_diff(lines: Iterable[str]) -> Iterator[tuple[filename, diff]]:
+    """
+    Parse a multi-file git unified diff incrementally.
+
+    Yields (filename, patch) for each file with hunks, where the patch starts at the
+    first hunk header like the files API's patch field. Files without hunks, such as
+    binary files or pure renames, are skipped. Deleted files are named by their old path.
+
+    Args:
+        lines: Lines of the diff, without line endings
+    """
+    current_file: Optional[str] = None
+    old_file: Optional[str] = None
+    patch_lines: list[str] = []
+    in_hunks = False
+
+    for line in lines:
+        if line.startswith("diff --git "):
+            if current_file is not None and patch_lines:
+                yield current_file, "\n".join(patch_lines)
+            current_file, old_file, patch_lines, in_hunks = None, None, [], False
+        elif in_hunks:
+            patch_lines.append(line)
+        elif line.startswith("@@"):
+            in_hunks = True
+            current_file = current_file or old_file
+            patch_lines.append(line)
+        elif line.startswith("--- "):
+            old_file = _diff_path(line[4:])
+        elif line.startswith("+++ "):
+            current_file = _diff_path(line[4:])
+
+    if current_file is not None and patch_lines:
+        yield current_file, "\n".join(patch_lines)
+
+def _diff_path(path: str) -> Optional[str]:
+    """Strip the a/ or b/ prefix of a path in a ---/+++ line, None for /dev/null"""
+    path = path.rstrip("\t")
+    if path.startswith('"') and path.endswith('"'):
+        # git quotes paths with unusual characters
+        path = path[1:-1].encode("ascii", errors="backslashreplace").decode("unicode_escape").encode("latin-1").decode("utf-8", errors="replace")
+    if path == "/dev/null":
+        return None
+    return path[2:] if path[:2] in ("a/", "b/") else path
@@ -1,8 +1,8 @@
 import pytest
 from typing import Any
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, Mock, patch
 from github.PullRequest import PullRequest
-from code_analysis_tool.pull_request_utils import get_raw_diff
+from code_analysis_tool.pull_request_utils import get_raw_diff, get_streamed_diff, iter_lines, parse_unified_diff
 
 def create_mock_file(filename: str, patch_content: str | None) -> Mock:
     """Helper function to create a mock file object"""
@@ -52,4 +52,101 @@ def test_get_raw_diff_error(mock_pr: Mock) -> None:
         get_raw_diff(mock_pr)
 
     assert str(exc_info.value) == "Failed to get diffs for PR #123: API error"
-    mock_pr.get_files.assert_called_once()
\ No newline at end of file
+    mock_pr.get_files.assert_called_once()
+
+SAMPLE_DIFF = """diff --git a/src/app.py b/src/app.py
+index 83db48f..bf269f4 100644
+--- a/src/app.py
++++ b/src/app.py
+@@ -1,3 +1,3 @@
+ import os
+--- removed line that looks like a header
++++ added line that looks like a header
+@@ -10,2 +10,3 @@ def main():
+     run()
++    cleanup()
+diff --git a/logo.png b/logo.png
+new file mode 100644
+index 0000000..1b2c3d4
+Binary files /dev/null and b/logo.png differ
+diff --git a/old.py b/old.py
+deleted file mode 100644
+index 1111111..0000000
+--- a/old.py
++++ /dev/null
+@@ -1 +0,0 @@
+-print("bye")
+\\ No newline at end of file
+diff --git a/docs/README.md b/docs/GUIDE.md
+similarity index 100%
+rename from docs/README.md
+rename to docs/GUIDE.md
+diff --git "a/caf\\303\\251.txt" "b/caf\\303\\251.txt"
+new file mode 100644
+--- /dev/null
++++ "b/caf\\303\\251.txt"
+@@ -0,0 +1 @@
++bonjour
+"""
+
+def test_parse_unified_diff() -> None:
+    """Test splitting a multi-file diff into per-file patches"""
+    result = list(parse_unified_diff(SAMPLE_DIFF.splitlines()))
+
+    assert result == [
+        ("src/app.py", "@@ -1,3 +1,3 @@\n import os\n--- removed line that looks like a header\n+++ added line that looks like a header\n@@ -10,2 +10,3 @@ def main():\n     run()\n+    cleanup()"),
+        ("old.py", "@@ -1 +0,0 @@\n-print(\"bye\")\n\\ No newline at end of file"),
+        ("café.txt", "@@ -0,0 +1 @@\n+bonjour"),
+    ]
+
+def test_parse_unified_diff_is_incremental() -> None:
+    """Test that each file is yielded before the rest of the diff is read"""
+    consumed = []
+    def lines():
+        for line in SAMPLE_DIFF.splitlines():
+            consumed.append(line)
+            yield line
+
+    filename, _ = next(parse_unified_diff(lines()))
+
+    assert filename == "src/app.py"
+    assert consumed[-1] == "diff --git a/logo.png b/logo.png"
+
+def test_iter_lines_across_chunks() -> None:
+    """Test that lines split across chunks are rejoined and only newlines split lines"""
+    chunks = [b"@@ -1 +1 @@\n-a\x0cb\n+caf", b"\xc3", b"\xa9\n", b"+last"]
+
+    assert list(iter_lines(chunks)) == ["@@ -1 +1 @@", "-a\x0cb", "+café", "+last"]
+
+def test_get_streamed_diff() -> None:
+    """Test fetching the diff media type with the requester's authentication"""
+    requester = Mock()
+    requester.base_url = "https://api.github.com"
+    requester.auth.authentication.side_effect = lambda headers: headers.update({"Authorization": "token abc"})
+    response = MagicMock()
+    response.__enter__.return_value = response
+    response.iter_content.return_value = [SAMPLE_DIFF[:100].encode(), SAMPLE_DIFF[100:].encode()]
+    session = Mock()
+    session.get.return_value = response
+
+    result = get_streamed_diff(requester, "owner/repo", 123, session)
+
+    assert list(result) == ["src/app.py", "old.py", "café.txt"]
+    session.get.assert_called_once_with(
+        "https://api.github.com/repos/owner/repo/pulls/123",
+        headers={"Accept": "application/vnd.github.diff", "Authorization": "token abc"},
+        stream=True,
+        timeout=60
+    )
+
+def test_get_streamed_diff_error() -> None:
+    """Test error handling"""
+    requester = Mock()
+    requester.base_url = "https://api.github.com"
+    session = Mock()
+    session.get.side_effect = Exception("Connection reset")
+
+    with pytest.raises(Exception) as exc_info:
+        get_streamed_diff(requester, "owner/repo", 123, session)
+
+    assert str(exc_info.value) == "Failed to get diffs for PR #123: Connection reset"
@@ -0,0 +1,183 @@
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Iterable, Iterator, List, Optional, TypeVar
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+# Responses worth retrying after a pause: rate limits and transient server errors
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+def map_concurrently(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    max_workers: int,
+    thread_name_prefix: str = "rest-fetch"
+) -> Iterator[tuple[int, R]]:
+    """
+    Call fn on each item on up to max_workers threads, yielding (index, result) as calls complete.
+    Stopping early or a failed call cancels the calls that haven't started.
+    """
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+    try:
+        futures = {executor.submit(fn, item): index for index, item in enumerate(items)}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        # Don't keep fetching if the caller stopped iterating or a call failed
+        executor.shutdown(wait=False, cancel_futures=True)
+
+class Pagination(ABC):
+    """
+    How a REST API splits a list into pages. Each method gets the page's response and
+    its body, the JSON that RestClient parsed once for all of them.
+    """
+
+    @abstractmethod
+    def items(self, response: requests.Response, body: Any) -> List[Any]:
+        """The items on a page."""
+        pass
+
+    @abstractmethod
+    def next_url(self, response: requests.Response, body: Any) -> Optional[str]:
+        """URL of the page after this one, None on the last page."""
+        pass
+
+    def page_count(self, response: requests.Response, body: Any) -> Optional[int]:
+        """
+        Total number of pages, if the first page tells. The remaining pages can then be
+        fetched concurrently by number instead of one after the other.
+        """
+        return None
+
+    def page_params(self, page: int) -> dict[str, Any]:
+        """Query parameters selecting a page by number, starting at 1."""
+        return {"page": page}
+
+class RestClient:
+    """
+    Shared HTTP engine for source control REST APIs: a pooled session that retries
+    rate limited and failed requests, pagination that fetches the remaining pages
+    concurrently when the API reports how many there are, and a bounded worker pool
+    for fanning out over repositories.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        headers: Optional[dict[str, str]] = None,
+        auth: Optional[Any] = None,
+        max_workers: int = 8,
+        max_retries: int = 3,
+        backoff_factor: float = 1.0,
+        timeout_secs: float = 60.0
+    ) -> None:
+        """
+        Args:
+            base_url: API URL that paths are relative to
+            headers: Headers sent with every request, e.g. authentication
+            auth: requests auth sent with every request, e.g. a (username, password) tuple
+            max_workers: Maximum number of concurrent requests, which also sizes the connection pool
+            max_retries: Number of times a request is retried after a rate limit, server or connection error
+            backoff_factor: Base of the exponential delay between retries, in seconds, when there's no Retry-After header
+            timeout_secs: Timeout of each request
+        """
+        self.base_url = base_url.rstrip("/")
+        self.max_workers = max_workers
+        self.timeout_secs = timeout_secs
+        self.session = requests.Session()
+        self.session.headers.update(headers or {})
+        self.session.auth = auth
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=["GET"],
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_maxsize=max_workers, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def url(self, path: str) -> str:
+        """Absolute URL of a path, URLs are returned unchanged."""
+        return path if path.startswith(("https://", "http://")) else f"{self.base_url}/{path.lstrip('/')}"
+
+    def get(self, path: str, params: Optional[dict[str, Any]] = None, headers: Optional[dict[str, str]] = None) -> requests.Response:
+        """GET a path or URL, raising for error statuses that are left after retrying."""
+        response = self.session.get(self.url(path), params=params, headers=headers, timeout=self.timeout_secs)
+        response.raise_for_status()
+        return response
+
+    def get_json(self, path: str, params: Optional[dict[str, Any]] = None) -> Any:
+        return self.get(path, params).json()
+
+    def iter_pages(self, path: str, params: dict[str, Any], pagination: Pagination) -> Iterator[List[Any]]:
+        """
+        Yield the items of each page of a list, in order.
+
+        When the first page reports the page count, the remaining pages are fetched
+        concurrently on up to max_workers threads, otherwise the next links are
+        followed one page at a time. Stopping early cancels pages not yet requested.
+
+        Args:
+            path: Path or URL of the list
+            params: Query parameters of the list
+            pagination: How the API pages the list
+        """
+        response = self.get(path, params)
+        body = response.json()
+        yield pagination.items(response, body)
+
+        page_count = pagination.page_count(response, body)
+        if page_count is not None:
+            if page_count > 1:
+                yield from self._fetch_pages(path, params, pagination, page_count)
+            return
+
+        next_url = pagination.next_url(response, body)
+        while next_url:
+            # Next links already carry the query parameters
+            response = self.get(next_url)
+            body = response.json()
+            yield pagination.items(response, body)
+            next_url = pagination.next_url(response, body)
+
+    def _fetch_pages(self, path: str, params: dict[str, Any], pagination: Pagination, page_count: int) -> Iterator[List[Any]]:
+        """Fetch pages 2 to page_count concurrently and yield their items in page order."""
+        def fetch_page(page: int) -> List[Any]:
+            response = self.get(path, {**params, **pagination.page_params(page)})
+            return pagination.items(response, response.json())
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="rest-page")
+        try:
+            pages = executor.map(fetch_page, range(2, page_count + 1))
+            yield from pages
+        finally:
+            # Don't keep fetching if the caller stopped iterating or a page failed
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def iter_items(self, path: str, params: dict[str, Any], pagination: Pagination) -> Iterator[Any]:
+        """Yield every item of a list, in order."""
+        for items in self.iter_pages(path, params, pagination):
+            yield from items
+
+    def map_concurrently(self, fn: Callable[[T], R], items: Iterable[T]) -> Iterator[tuple[int, R]]:
+        """
+        Call fn on each item on up to max_workers threads, yielding (index, result) as calls complete.
+        Stopping early or a failed call cancels the calls that haven't started.
+        """
+        return map_concurrently(fn, items, self.max_workers)
+
+class LinkHeaderPagination(Pagination):
+    """Lists returned as JSON arrays with the next page in the Link header, like GitHub and GitLab."""
+
+    def items(self, response: requests.Response, body: Any) -> List[Any]:
+        return body
+
+    def next_url(self, response: requests.Response, body: Any) -> Optional[str]:
+        return response.links.get("next", {}).get("url")
@@ -0,0 +1,91 @@
+import json
+import threading
+from typing import Any, Optional
+from unittest.mock import Mock
+import pytest
+import requests
+
+from code_analysis_tool.rest_client import LinkHeaderPagination, RestClient
+
+def make_response(body: Any, status_code: int = 200, headers: Optional[dict[str, str]] = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(body).encode()
+    response.headers.update(headers or {})
+    response.url = "https://api.example.com"
+    return response
+
+class TotalPagesPagination(LinkHeaderPagination):
+    def page_count(self, response: requests.Response, body: Any) -> Optional[int]:
+        return int(response.headers["X-Total-Pages"]) if "X-Total-Pages" in response.headers else None
+
+@pytest.fixture
+def client() -> RestClient:
+    return RestClient("https://api.example.com/", max_workers=4)
+
+def test_url_joins_paths_and_keeps_urls(client: RestClient) -> None:
+    assert client.url("/items") == "https://api.example.com/items"
+    assert client.url("items") == "https://api.example.com/items"
+    assert client.url("https://other.example.com/items?page=2") == "https://other.example.com/items?page=2"
+
+def test_iter_pages_follows_next_links(client: RestClient) -> None:
+    pages = {
+        "https://api.example.com/items": make_response([1, 2], headers={"Link": '<https://api.example.com/items?page=2>; rel="next"'}),
+        "https://api.example.com/items?page=2": make_response([3])
+    }
+    client.session.get = Mock(side_effect=lambda url, **kwargs: pages[url])
+
+    assert list(client.iter_pages("items", {"per_page": 2}, LinkHeaderPagination())) == [[1, 2], [3]]
+    # Only the first request carries the parameters, next links already include them
+    assert client.session.get.call_args_list[0].kwargs["params"] == {"per_page": 2}
+    assert client.session.get.call_args_list[1].kwargs["params"] is None
+
+def test_iter_pages_fetches_counted_pages_concurrently_in_order(client: RestClient) -> None:
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+    all_started = threading.Barrier(3, timeout=5)
+
+    def get(url: str, params: dict[str, Any], **kwargs: Any) -> requests.Response:
+        nonlocal in_flight, max_in_flight
+        page = params.get("page", 1)
+        if page == 1:
+            return make_response([1], headers={"X-Total-Pages": "4"})
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        # Pages 2 to 4 only finish once all of them have started
+        all_started.wait()
+        with lock:
+            in_flight -= 1
+        return make_response([page])
+
+    client.session.get = Mock(side_effect=get)
+
+    assert list(client.iter_items("items", {}, TotalPagesPagination())) == [1, 2, 3, 4]
+    assert max_in_flight == 3
+
+def test_get_raises_for_error_status(client: RestClient) -> None:
+    client.session.get = Mock(return_value=make_response({"message": "Not Found"}, status_code=404))
+
+    with pytest.raises(requests.HTTPError):
+        client.get("missing")
+
+def test_retries_are_configured_on_the_session(client: RestClient) -> None:
+    retry = client.session.get_adapter("https://api.example.com").max_retries
+
+    assert retry.total == 3
+    assert 429 in retry.status_forcelist
+    assert retry.respect_retry_after_header
+
+def test_map_concurrently_yields_indexes(client: RestClient) -> None:
+    results = dict(client.map_concurrently(lambda item: item * 2, [1, 2, 3]))
+
+    assert results == {0: 2, 1: 4, 2: 6}
+
+def test_map_concurrently_raises_failures(client: RestClient) -> None:
+    def fail(item: int) -> int:
+        raise ValueError("failed")
+
+    with pytest.raises(ValueError):
+        list(client.map_concurrently(fail, [1]))
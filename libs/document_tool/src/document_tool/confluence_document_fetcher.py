@@ -1,33 +1,69 @@
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
 from datetime import datetime
 from atlassian import Confluence
+import requests
+from requests.adapters import HTTPAdapter
 from urllib3.exceptions import HTTPError
 from loguru import logger
+from document_tool.content_cache import ContentCache
 from document_tool.interfaces import DesignDocumentFetcher
 from document_tool.models.document import Document
 
+# Results per search request, the most Confluence returns
+PAGE_SIZE = 100
+
+# Expands each search result's page body, so bodies don't need a request per page
+BODY_EXPAND = "content.body.storage"
+
+# Expands each search result's version number, which content cache entries are keyed by
+VERSION_EXPAND = "content.version"
+
+# Expands the users who edited each page, to attribute results of multi-user searches
+CONTRIBUTORS_EXPAND = "content.history.contributors.publishers.users"
+
+# Users per contributor in (...) search, which keeps the CQL well within URL length limits
+BATCH_SIZE = 20
+
 class ConfluenceDocumentFetcher(DesignDocumentFetcher):
-    def __init__(self, url: str, username: str, api_token: str) -> None:
+    def __init__(
+        self,
+        url: str,
+        username: str,
+        api_token: str,
+        max_workers: int = 8,
+        content_cache: Optional[ContentCache] = None
+    ) -> None:
         """Initialize the Confluence client.
 
         Args:
             url: Base URL of the Confluence instance
             username: Confluence username
             api_token: Confluence API token
+            max_workers: Maximum number of concurrent requests, which sizes the connection pool
+            content_cache: Cache that page contents are read from and stored in, by page ID and version
         """
-        
+        # requests keeps 10 connections per host by default, size the pool so concurrent
+        # content loads reuse connections instead of opening and dropping new ones
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_maxsize=max_workers))
+        session.mount("http://", HTTPAdapter(pool_maxsize=max_workers))
+        self.max_workers = max_workers
+        self.content_cache = content_cache
         self.confluence = Confluence(
             url=url,
             username=username,
             password=api_token,
-            cloud=True  # Set to False if using Server/Data Center
+            cloud=True,  # Set to False if using Server/Data Center
+            session=session
         )
 
     def get_user_documents(
         self, 
         username: str, 
         start_date: datetime,
-        space_key: Optional[str] = None
+        space_key: Optional[str] = None,
+        include_content: bool = False
     ) -> List[Document]:
         """Fetch pages created by a specific user after a given date.
 
@@ -35,50 +71,159 @@ class ConfluenceDocumentFetcher(DesignDocumentFetcher):
             username: Confluence username for the user (not email)
             start_date: Datetime object representing the start date
             space_key: Optional space key to limit the search to a specific space
+            include_content: Whether to fetch page bodies in the search requests instead of lazily per page
 
         Returns:
             List of Document objects containing page information
         """
+        cql = self._build_cql(f'contributor = {username}', start_date, space_key)
+        return [self._create_document(result) for result in self._search(cql, self._expand(BODY_EXPAND if include_content else None))]
+
+    def get_users_documents(
+        self,
+        usernames: Iterable[str],
+        start_date: datetime,
+        space_key: Optional[str] = None,
+        include_content: bool = False,
+        batch_size: int = BATCH_SIZE
+    ) -> Dict[str, List[Document]]:
+        """Fetch pages created by any of several users after a given date, with batched searches.
+
+        Usernames are searched batch_size at a time with `contributor in (...)` queries that
+        run concurrently, and each page is attributed back to every requested user among its
+        contributors, so a page edited by two of them is listed under both.
+
+        Args:
+            usernames: Confluence usernames or account IDs of the users
+            start_date: Datetime object representing the start date
+            space_key: Optional space key to limit the search to a specific space
+            include_content: Whether to fetch page bodies in the search requests instead of lazily per page
+            batch_size: Number of users per search
+
+        Returns:
+            Documents by username, in the order given
+        """
+        usernames = list(dict.fromkeys(usernames))
+        documents: Dict[str, List[Document]] = {username: [] for username in usernames}
+        batches = [usernames[i:i + batch_size] for i in range(0, len(usernames), batch_size)]
+        if not batches:
+            return documents
+
+        expand = self._expand(CONTRIBUTORS_EXPAND, BODY_EXPAND if include_content else None)
+        def search(batch: List[str]) -> List[dict]:
+            contributors = ", ".join(f'"{username}"' for username in batch)
+            return self._search(self._build_cql(f'contributor in ({contributors})', start_date, space_key), expand)
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches)), thread_name_prefix="confluence-search") as executor:
+            for batch, results in zip(batches, executor.map(search, batches)):
+                requested = {username.lower(): username for username in batch}
+                for result in results:
+                    document = self._create_document(result)
+                    matched = [requested[identifier] for identifier in self._contributor_identifiers(result) if identifier in requested]
+                    if not matched:
+                        logger.warning(f"Couldn't attribute page {document.id} to any of {batch}")
+                    for username in dict.fromkeys(matched):
+                        documents[username].append(document)
+        return documents
+
+    def _expand(self, *expands: Optional[str]) -> Optional[str]:
+        """Comma separated expand parameter, including the version when there is a content cache."""
+        if self.content_cache is not None:
+            expands = (VERSION_EXPAND,) + expands
+        return ",".join(expand for expand in expands if expand) or None
+
+    @staticmethod
+    def _build_cql(contributor_clause: str, start_date: datetime, space_key: Optional[str]) -> str:
+        #cql = f'created >= "{start_date.strftime("%Y-%m-%d")}" and type=page'
+        cql = f'{contributor_clause} and created >= "{start_date.strftime("%Y-%m-%d")}" and type=page'
+        if space_key:
+            cql += f' and space = "{space_key}"'
+        return cql
+
+    @staticmethod
+    def _contributor_identifiers(result: dict) -> List[str]:
+        """Lower case usernames, account IDs and user keys of a search result's contributors."""
+        publishers = result.get("content", {}).get("history", {}).get("contributors", {}).get("publishers", {})
+        identifiers = []
+        for user in publishers.get("users", []):
+            identifiers.extend(user[key].lower() for key in ("username", "accountId", "userKey") if user.get(key))
+        return identifiers
+
+    def _search(self, cql: str, expand: Optional[str] = None) -> List[dict]:
+        """Run a CQL search and return the results of every page.
+
+        Follows the _links.next link of each page, which Cloud returns as a cursor,
+        and falls back to the start offset when there is no link but totalSize says
+        there are more results.
+
+        Args:
+            cql: CQL query
+            expand: Comma separated properties to expand in the results, e.g. BODY_EXPAND
+
+        Returns:
+            Search results across all pages
+        """
+        results: List[dict] = []
         try:
-            #cql = f'created >= "{start_date.strftime("%Y-%m-%d")}" and type=page'
-            cql = f'contributor = {username} and created >= "{start_date.strftime("%Y-%m-%d")}" and type=page'
-            if space_key:
-                cql += f' and space = "{space_key}"'
+            search_results = self.confluence.cql(cql, start=0, limit=PAGE_SIZE, expand=expand)
+            while True:
+                logger.debug(search_results)
+                if not isinstance(search_results, dict):
+                    logger.warning(f"Search results didn't return a dict as expected. Got: {search_results}")
+                    return results
 
-            search_results = self.confluence.cql(cql, limit=100)
-            logger.debug(search_results)
+                page_results = search_results.get("results", [])
+                results.extend(page_results)
+
+                next_link = search_results.get("_links", {}).get("next")
+                if next_link:
+                    if expand and "expand=" not in next_link:
+                        next_link += f"&expand={expand}"
+                    search_results = self.confluence.get(next_link)
+                elif page_results and len(results) < search_results.get("totalSize", 0):
+                    search_results = self.confluence.cql(cql, start=len(results), limit=PAGE_SIZE, expand=expand)
+                else:
+                    return results
         except HTTPError as e:
             raise ConnectionError(f"HTTP error occurred while fetching pages: {str(e)}")
         except Exception as e:
-            raise RuntimeError(f"Error fetching pages: {str(e)}")    
-        
-        if not isinstance(search_results, dict):
-            logger.warning(f"Search results didn't return a dict as expected. Got: {search_results}")
-            return []
-
-        documents = []
-        for result in search_results.get("results", []):
-            logger.debug(result)
-            content_data = result.get("content", {})
-            def create_content_loader(page_id: str):
-                def load_content() -> str:
-                    try:
-                        page = self.confluence.get_page_by_id(page_id, expand='body.storage')
-                        return page.get('body', {}).get('storage', {}).get('value', '')
-                    except Exception as e:
-                        raise RuntimeError(f"Failed to load page content: {str(e)}")
-                return load_content
-
-            document = Document(
-                id=content_data.get("id", ""),
-                title=content_data.get("title", ""),
-                space=content_data.get("space", {}).get("key", ""),
-                last_modified=datetime.strptime(result.get("lastModified", "2025-01-01T05:22:33.000Z"), "%Y-%m-%dT%H:%M:%S.%fZ"),
-                url=content_data.get("_links", {}).get("webui", ""),
-                _content_loader=create_content_loader(content_data.get("id", ""))
-            )
-            documents.append(document)
+            raise RuntimeError(f"Error fetching pages: {str(e)}")
 
-        return documents
+    def _create_content_loader(self, page_id: str, version: Optional[int]) -> Callable[[], str]:
+        def load_content() -> str:
+            try:
+                page = self.confluence.get_page_by_id(page_id, expand='body.storage')
+                return page.get('body', {}).get('storage', {}).get('value', '')
+            except Exception as e:
+                raise RuntimeError(f"Failed to load page content: {str(e)}")
+        if self.content_cache is None or version is None:
+            return load_content
 
+        def load_cached_content() -> str:
+            content = self.content_cache.get(page_id, version)
+            if content is None:
+                content = load_content()
+                self.content_cache.put(page_id, version, content)
+            return content
+        return load_cached_content
 
+    def _create_document(self, result: dict) -> Document:
+        """Create a Document from a CQL search result, with its content if the body was expanded."""
+        logger.debug(result)
+        content_data = result.get("content", {})
+        page_id = content_data.get("id", "")
+        version = content_data.get("version", {}).get("number")
+        content = content_data.get("body", {}).get("storage", {}).get("value")
+        if content is not None and version is not None and self.content_cache is not None:
+            # Expanded bodies fill the cache too, so later lazy runs don't download them again
+            self.content_cache.put(page_id, version, content)
+        return Document(
+            id=page_id,
+            title=content_data.get("title", ""),
+            space=content_data.get("space", {}).get("key", ""),
+            last_modified=datetime.strptime(result.get("lastModified", "2025-01-01T05:22:33.000Z"), "%Y-%m-%dT%H:%M:%S.%fZ"),
+            url=content_data.get("_links", {}).get("webui", ""),
+            version=version,
+            _content_loader=self._create_content_loader(page_id, version),
+            _content=content
+        )
@@ -1,10 +1,11 @@
 from datetime import datetime
-from typing import Dict, Any, Generator
+from typing import Dict, Any, Generator, Optional
 import pytest
 from unittest.mock import Mock, patch
 from urllib3.exceptions import HTTPError
 
 from document_tool.confluence_document_fetcher import ConfluenceDocumentFetcher
+from document_tool.content_cache import LocalContentCache
 from document_tool.models.document import Document
 
 @pytest.fixture
@@ -105,4 +106,157 @@ def test_content_loader_error(fetcher: ConfluenceDocumentFetcher, mock_confluenc
 
     with pytest.raises(RuntimeError) as exc_info:
         documents[0].content
-    assert "Failed to load page content" in str(exc_info.value)
\ No newline at end of file
+    assert "Failed to load page content" in str(exc_info.value)
+def test_connection_pool_sized_to_max_workers() -> None:
+    """Test that the Confluence client shares a session pooling max_workers connections."""
+    with patch('document_tool.confluence_document_fetcher.Confluence') as mock:
+        ConfluenceDocumentFetcher(
+            url="https://example.atlassian.net",
+            username="test_user",
+            api_token="test_token",
+            max_workers=16
+        )
+
+    session = mock.call_args.kwargs["session"]
+    assert session.get_adapter("https://example.atlassian.net")._pool_maxsize == 16
+
+def search_result(page_id: str, body: Optional[str] = None) -> Dict[str, Any]:
+    content: Dict[str, Any] = {
+        "id": page_id,
+        "title": f"Page {page_id}",
+        "space": {"key": "TEST"},
+        "_links": {"webui": f"/pages/{page_id}"}
+    }
+    if body is not None:
+        content["body"] = {"storage": {"value": body}}
+    return {"content": content, "lastModified": "2024-03-20T10:00:00.000Z"}
+
+def test_get_user_documents_follows_next_links(fetcher: ConfluenceDocumentFetcher, mock_confluence: Mock) -> None:
+    """Test that results beyond the first page are fetched through _links.next."""
+    mock_confluence.cql.return_value = {
+        "results": [search_result("1")],
+        "_links": {"next": "/rest/api/search?cql=type%3Dpage&limit=100&cursor=abc"}
+    }
+    mock_confluence.get.return_value = {"results": [search_result("2")], "_links": {}}
+
+    documents = fetcher.get_user_documents(username="test_user", start_date=datetime(2024, 1, 1))
+
+    assert [document.id for document in documents] == ["1", "2"]
+    mock_confluence.cql.assert_called_once()
+    mock_confluence.get.assert_called_once_with("/rest/api/search?cql=type%3Dpage&limit=100&cursor=abc")
+
+def test_get_user_documents_pages_by_start_without_next_link(fetcher: ConfluenceDocumentFetcher, mock_confluence: Mock) -> None:
+    """Test that the start offset is used when totalSize says there are more results but there's no next link."""
+    mock_confluence.cql.side_effect = [
+        {"results": [search_result("1"), search_result("2")], "totalSize": 3},
+        {"results": [search_result("3")], "totalSize": 3}
+    ]
+
+    documents = fetcher.get_user_documents(username="test_user", start_date=datetime(2024, 1, 1))
+
+    assert [document.id for document in documents] == ["1", "2", "3"]
+    assert mock_confluence.cql.call_args_list[1].kwargs["start"] == 2
+
+def test_get_user_documents_include_content(fetcher: ConfluenceDocumentFetcher, mock_confluence: Mock) -> None:
+    """Test that bodies are expanded into the search results instead of fetched per page."""
+    mock_confluence.cql.return_value = {
+        "results": [search_result("1", body="Expanded content")],
+        "_links": {"next": "/rest/api/search?cursor=abc"}
+    }
+    mock_confluence.get.return_value = {"results": [search_result("2", body="More content")]}
+
+    documents = fetcher.get_user_documents(username="test_user", start_date=datetime(2024, 1, 1), include_content=True)
+
+    assert mock_confluence.cql.call_args.kwargs["expand"] == "content.body.storage"
+    mock_confluence.get.assert_called_once_with("/rest/api/search?cursor=abc&expand=content.body.storage")
+    assert all(document.content_loaded for document in documents)
+    assert [document.content for document in documents] == ["Expanded content", "More content"]
+    mock_confluence.get_page_by_id.assert_not_called()
+
+def contributed_result(page_id: str, *contributors: Dict[str, str]) -> Dict[str, Any]:
+    result = search_result(page_id)
+    result["content"]["history"] = {"contributors": {"publishers": {"users": list(contributors)}}}
+    return result
+
+def test_get_users_documents_batches_and_attributes(fetcher: ConfluenceDocumentFetcher, mock_confluence: Mock) -> None:
+    """Test that users are searched in batches and each page is listed under its requested contributors."""
+    def cql(query: str, **kwargs: Any) -> Dict[str, Any]:
+        if '"alice", "bob"' in query:
+            return {"results": [
+                contributed_result("1", {"username": "alice"}),
+                # Edited by both requested users and someone who wasn't requested
+                contributed_result("2", {"username": "Bob"}, {"username": "alice"}, {"username": "zed"})
+            ]}
+        return {"results": [contributed_result("3", {"accountId": "carol-id"})]}
+    mock_confluence.cql.side_effect = cql
+
+    documents = fetcher.get_users_documents(
+        ["alice", "bob", "carol-id", "alice"],
+        start_date=datetime(2024, 1, 1),
+        batch_size=2
+    )
+
+    assert mock_confluence.cql.call_count == 2
+    queries = sorted(call.args[0] for call in mock_confluence.cql.call_args_list)
+    assert queries[0] == 'contributor in ("alice", "bob") and created >= "2024-01-01" and type=page'
+    assert queries[1] == 'contributor in ("carol-id") and created >= "2024-01-01" and type=page'
+    assert mock_confluence.cql.call_args.kwargs["expand"] == "content.history.contributors.publishers.users"
+    assert list(documents) == ["alice", "bob", "carol-id"]
+    assert [document.id for document in documents["alice"]] == ["1", "2"]
+    assert [document.id for document in documents["bob"]] == ["2"]
+    assert [document.id for document in documents["carol-id"]] == ["3"]
+
+def test_get_users_documents_include_content(fetcher: ConfluenceDocumentFetcher, mock_confluence: Mock) -> None:
+    """Test that bodies are expanded alongside the contributors."""
+    mock_confluence.cql.return_value = {"results": []}
+
+    fetcher.get_users_documents(["alice"], start_date=datetime(2024, 1, 1), include_content=True)
+
+    assert mock_confluence.cql.call_args.kwargs["expand"] == "content.history.contributors.publishers.users,content.body.storage"
+
+def test_get_users_documents_without_users(fetcher: ConfluenceDocumentFetcher, mock_confluence: Mock) -> None:
+    """Test that no search is made for an empty list of users."""
+    assert fetcher.get_users_documents([], start_date=datetime(2024, 1, 1)) == {}
+    mock_confluence.cql.assert_not_called()
+
+def test_content_cache_skips_unchanged_pages(mock_confluence: Mock, tmp_path: Any) -> None:
+    """Test that page contents are read from the cache by page ID and version before the API."""
+    cache = LocalContentCache(str(tmp_path / "content.db"))
+    fetcher = ConfluenceDocumentFetcher(
+        url="https://example.atlassian.net",
+        username="test_user",
+        api_token="test_token",
+        content_cache=cache
+    )
+    result = search_result("123")
+    result["content"]["version"] = {"number": 4}
+    mock_confluence.cql.return_value = {"results": [result]}
+    mock_confluence.get_page_by_id.return_value = {"body": {"storage": {"value": "Test content"}}}
+
+    first_run = fetcher.get_user_documents(username="test_user", start_date=datetime(2024, 1, 1))
+    assert first_run[0].version == 4
+    assert first_run[0].content == "Test content"
+    second_run = fetcher.get_user_documents(username="test_user", start_date=datetime(2024, 1, 1))
+    assert second_run[0].content == "Test content"
+
+    assert mock_confluence.cql.call_args.kwargs["expand"] == "content.version"
+    mock_confluence.get_page_by_id.assert_called_once()
+    assert cache.get("123", 4) == "Test content"
+
+def test_expanded_contents_fill_the_cache(mock_confluence: Mock, tmp_path: Any) -> None:
+    """Test that bodies from include_content searches are cached for later lazy runs."""
+    cache = LocalContentCache(str(tmp_path / "content.db"))
+    fetcher = ConfluenceDocumentFetcher(
+        url="https://example.atlassian.net",
+        username="test_user",
+        api_token="test_token",
+        content_cache=cache
+    )
+    result = search_result("123")
+    result["content"]["version"] = {"number": 4}
+    result["content"]["body"] = {"storage": {"value": "Expanded content"}}
+    mock_confluence.cql.return_value = {"results": [result]}
+
+    fetcher.get_user_documents(username="test_user", start_date=datetime(2024, 1, 1), include_content=True)
+
+    assert cache.get("123", 4) == "Expanded content"
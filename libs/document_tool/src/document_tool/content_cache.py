@@ -0,0 +1,168 @@
+import time
+import zlib
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional, TYPE_CHECKING
+from loguru import logger
+
+if TYPE_CHECKING:
+    from google.cloud import storage
+
+class ContentCache(ABC):
+    """
+    Cache of document contents keyed by page ID and version number.
+    A page's content never changes for a given version, so entries never go stale.
+    """
+
+    @abstractmethod
+    def get(self, page_id: str, version: int) -> Optional[str]:
+        """
+        Returns:
+            The cached content, or None on a miss
+        """
+        pass
+
+    @abstractmethod
+    def put(self, page_id: str, version: int, content: str) -> None:
+        """Stores the content of a page version"""
+        pass
+
+class LocalContentCache(ContentCache):
+    """
+    SQLite cache of document contents, one zlib compressed row per page version in a single
+    database file. When the cache grows beyond max_size_bytes the least recently used
+    entries are evicted, by a last used time that is bumped on every hit.
+    """
+
+    def __init__(self, db_path: str, max_size_bytes: int = 256 * 1024 * 1024) -> None:
+        """
+        Args:
+            db_path: Path to the SQLite database file, created if missing
+            max_size_bytes: Total compressed size of entries above which old entries are evicted
+        """
+        self.db_path = db_path
+        self.max_size_bytes = max_size_bytes
+        self._lock = threading.Lock()
+        try:
+            if db_path != ":memory:":
+                Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self.connection = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS content ("
+                "page_id TEXT NOT NULL, version INTEGER NOT NULL, data BLOB NOT NULL, "
+                "size INTEGER NOT NULL, last_used REAL NOT NULL, PRIMARY KEY (page_id, version))"
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS content_last_used ON content (last_used)")
+            self._total_size: int = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM content").fetchone()[0]
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Failed to open content cache database: {str(e)}") from e
+
+    def get(self, page_id: str, version: int) -> Optional[str]:
+        try:
+            with self._lock:
+                row = self.connection.execute(
+                    "SELECT data FROM content WHERE page_id = ? AND version = ?", (page_id, version)
+                ).fetchone()
+                if row is None:
+                    return None
+                self.connection.execute(
+                    "UPDATE content SET last_used = ? WHERE page_id = ? AND version = ?", (time.time(), page_id, version)
+                )
+            return zlib.decompress(row[0]).decode("utf-8")
+        except (sqlite3.Error, zlib.error, UnicodeDecodeError) as e:
+            logger.warning(f"Ignoring unreadable content cache entry for page {page_id} version {version}: {str(e)}")
+            return None
+
+    def put(self, page_id: str, version: int, content: str) -> None:
+        """Stores the content of a page version, evicting old entries if the cache is full"""
+        data = zlib.compress(content.encode("utf-8"))
+        try:
+            with self._lock:
+                row = self.connection.execute(
+                    "SELECT size FROM content WHERE page_id = ? AND version = ?", (page_id, version)
+                ).fetchone()
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO content (page_id, version, data, size, last_used) VALUES (?, ?, ?, ?, ?)",
+                    (page_id, version, data, len(data), time.time())
+                )
+                self._total_size += len(data) - (row[0] if row else 0)
+                if self._total_size > self.max_size_bytes:
+                    self._evict()
+        except sqlite3.Error as e:
+            # The cache is an optimisation, failing to fill it shouldn't fail the caller
+            logger.warning(f"Failed to cache content of page {page_id} version {version}: {str(e)}")
+
+    def _evict(self) -> None:
+        """Removes least recently used entries until the cache fits. Must hold the lock."""
+        evicted = []
+        for page_id, version, size in self.connection.execute("SELECT page_id, version, size FROM content ORDER BY last_used"):
+            if self._total_size <= self.max_size_bytes:
+                break
+            evicted.append((page_id, version))
+            self._total_size -= size
+        self.connection.executemany("DELETE FROM content WHERE page_id = ? AND version = ?", evicted)
+
+    def clear(self) -> None:
+        """Removes every entry"""
+        with self._lock:
+            self.connection.execute("DELETE FROM content")
+            self._total_size = 0
+
+class GCSContentCache(ContentCache):
+    """
+    Google Cloud Storage cache of document contents, shared by every job using the bucket.
+    Each entry is a zlib compressed object under prefix. Size is bounded with the bucket's
+    lifecycle rules, e.g. deleting objects some days after creation, rather than by the cache.
+    The google-cloud-storage client is only imported and created on first use.
+    """
+
+    def __init__(self, bucket_name: str, prefix: str = "document-content", client: Optional["storage.Client"] = None) -> None:
+        """
+        Args:
+            bucket_name: Name of the GCS bucket
+            prefix: Path in the bucket that entries are stored under
+            client: Optional storage client to share with other users of the bucket
+        """
+        self.bucket_name = bucket_name
+        self.prefix = prefix.strip("/")
+        self._client = client
+        self._bucket = None
+
+    @property
+    def client(self) -> "storage.Client":
+        if self._client is None:
+            from google.cloud import storage
+            self._client = storage.Client()
+        return self._client
+
+    @property
+    def bucket(self) -> "storage.Bucket":
+        if self._bucket is None:
+            self._bucket = self.client.bucket(self.bucket_name)
+        return self._bucket
+
+    def _blob_name(self, page_id: str, version: int) -> str:
+        return f"{self.prefix}/{page_id}/{version}.z"
+
+    def get(self, page_id: str, version: int) -> Optional[str]:
+        from google.api_core.exceptions import NotFound
+        try:
+            data = self.bucket.blob(self._blob_name(page_id, version)).download_as_bytes()
+            return zlib.decompress(data).decode("utf-8")
+        except NotFound:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable content cache entry for page {page_id} version {version}: {str(e)}")
+            return None
+
+    def put(self, page_id: str, version: int, content: str) -> None:
+        try:
+            self.bucket.blob(self._blob_name(page_id, version)).upload_from_string(
+                zlib.compress(content.encode("utf-8")),
+                content_type="application/zlib"
+            )
+        except Exception as e:
+            # The cache is an optimisation, failing to fill it shouldn't fail the caller
+            logger.warning(f"Failed to cache content of page {page_id} version {version}: {str(e)}")
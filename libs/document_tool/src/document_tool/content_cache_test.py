@@ -0,0 +1,100 @@
+import os
+from pathlib import Path
+from unittest.mock import Mock
+import zlib
+import pytest
+from google.api_core.exceptions import NotFound
+
+from document_tool.content_cache import GCSContentCache, LocalContentCache
+
+@pytest.fixture
+def cache(tmp_path: Path) -> LocalContentCache:
+    return LocalContentCache(str(tmp_path / "content" / "cache.db"))
+
+def test_put_and_get(cache: LocalContentCache) -> None:
+    cache.put("123", 4, "<p>Design</p>")
+
+    assert cache.get("123", 4) == "<p>Design</p>"
+
+def test_miss_on_different_version(cache: LocalContentCache) -> None:
+    cache.put("123", 4, "<p>Design</p>")
+
+    assert cache.get("123", 5) is None
+    assert cache.get("456", 4) is None
+
+def test_entries_are_compressed(cache: LocalContentCache) -> None:
+    content = "<p>Design</p>" * 10000
+
+    cache.put("123", 1, content)
+
+    assert cache._total_size < len(content) / 10
+
+def test_replacing_an_entry_keeps_the_size(cache: LocalContentCache) -> None:
+    cache.put("123", 1, "content")
+    size = cache._total_size
+
+    cache.put("123", 1, "content")
+
+    assert cache._total_size == size
+
+def test_persists_across_instances(cache: LocalContentCache) -> None:
+    cache.put("123", 1, "content")
+
+    reopened = LocalContentCache(cache.db_path)
+
+    assert reopened.get("123", 1) == "content"
+    assert reopened._total_size == cache._total_size
+
+def test_evicts_least_recently_used(cache: LocalContentCache) -> None:
+    for page_id in range(3):
+        cache.put(str(page_id), 1, os.urandom(100).hex())
+        # Space out last used times so recency is unambiguous
+        cache.connection.execute("UPDATE content SET last_used = ? WHERE page_id = ?", (page_id, str(page_id)))
+    cache.get("0", 1)
+
+    cache.max_size_bytes = cache._total_size
+    cache.put("3", 1, os.urandom(100).hex())
+
+    assert cache.get("1", 1) is None
+    assert cache.get("0", 1) is not None
+    assert cache.get("3", 1) is not None
+    assert cache._total_size <= cache.max_size_bytes
+
+def test_unreadable_entry_is_a_miss(cache: LocalContentCache) -> None:
+    cache.put("123", 1, "content")
+    cache.connection.execute("UPDATE content SET data = ?", (b"not zlib",))
+
+    assert cache.get("123", 1) is None
+
+def test_clear(cache: LocalContentCache) -> None:
+    cache.put("123", 1, "content")
+
+    cache.clear()
+
+    assert cache.get("123", 1) is None
+    assert cache._total_size == 0
+
+def test_gcs_put_and_get() -> None:
+    client = Mock()
+    blob = client.bucket.return_value.blob.return_value
+    cache = GCSContentCache("bucket", prefix="confluence/", client=client)
+
+    cache.put("123", 4, "content")
+    blob.download_as_bytes.return_value = blob.upload_from_string.call_args.args[0]
+
+    assert cache.get("123", 4) == "content"
+    client.bucket.assert_called_once_with("bucket")
+    client.bucket.return_value.blob.assert_called_with("confluence/123/4.z")
+    assert zlib.decompress(blob.upload_from_string.call_args.args[0]) == b"content"
+
+def test_gcs_miss() -> None:
+    client = Mock()
+    client.bucket.return_value.blob.return_value.download_as_bytes.side_effect = NotFound("missing")
+
+    assert GCSContentCache("bucket", client=client).get("123", 4) is None
+
+def test_gcs_put_failure_is_ignored() -> None:
+    client = Mock()
+    client.bucket.return_value.blob.return_value.upload_from_string.side_effect = Exception("forbidden")
+
+    GCSContentCache("bucket", client=client).put("123", 4, "content")
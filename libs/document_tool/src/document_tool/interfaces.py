@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Dict, Iterable, List
 from datetime import datetime
 from typing import Optional
 from document_tool.models.document import Document
@@ -24,4 +24,28 @@ class DesignDocumentFetcher(ABC):
         Returns:
             List of Document objects containing page information
         """
-        pass 
\ No newline at end of file
+        pass
+
+    def get_users_documents(
+        self,
+        user_emails: Iterable[str],
+        start_date: datetime,
+        space_key: Optional[str] = None
+    ) -> Dict[str, List[Document]]:
+        """Fetch pages created by any of several users after a given date.
+
+        Implementations that can search for several users at once should override this
+        to batch the searches instead of running one per user.
+
+        Args:
+            user_emails: Email addresses of the users
+            start_date: Datetime object representing the start date
+            space_key: Optional space key to limit the search to a specific space
+
+        Returns:
+            Documents by user, in the order given
+        """
+        return {
+            user_email: self.get_user_documents(user_email, start_date, space_key)
+            for user_email in dict.fromkeys(user_emails)
+        }
@@ -9,9 +9,15 @@ class Document:
     space: str
     last_modified: datetime
     url: str
+    version: Optional[int] = None
     _content_loader: Optional[Callable[[], str]] = None
     _content: Optional[str] = None
 
+    @property
+    def content_loaded(self) -> bool:
+        """Whether accessing content can return without a request"""
+        return self._content is not None or self._content_loader is None
+
     @property
     def content(self) -> str:
         """Lazy load and return the document content."""
@@ -0,0 +1,39 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List
+from loguru import logger
+
+from document_tool.models.document import Document
+
+def load_contents(documents: Iterable[Document], concurrency: int = 8) -> List[Document]:
+    """
+    Load the content of many documents in parallel so that later access to
+    content doesn't block on a request per document.
+
+    Documents whose content is already loaded are skipped. A failed load is
+    logged and left unloaded, so accessing its content retries and raises the
+    error as usual. Keep concurrency at or below the fetcher's max_workers,
+    which sizes its connection pool.
+
+    Args:
+        documents: Documents to load the content of
+        concurrency: Maximum number of documents loaded at the same time
+
+    Returns:
+        The documents, in the order given
+    """
+    documents = list(documents)
+    pending = [document for document in documents if not document.content_loaded]
+    if not pending:
+        return documents
+
+    def load(document: Document) -> None:
+        try:
+            # content caches the loaded body on each document
+            document.content
+        except RuntimeError as e:
+            logger.warning(f"Failed to load content of document {document.id}: {str(e)}")
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="content-load") as executor:
+        list(executor.map(load, pending))
+
+    return documents
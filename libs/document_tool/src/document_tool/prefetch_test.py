@@ -0,0 +1,52 @@
+import threading
+from datetime import datetime
+from unittest.mock import Mock
+
+from document_tool.models.document import Document
+from document_tool.prefetch import load_contents
+
+def create_document(id: str, loader: Mock) -> Document:
+    return Document(
+        id=id,
+        title=f"Page {id}",
+        space="TEST",
+        last_modified=datetime(2024, 1, 1),
+        url=f"/pages/{id}",
+        _content_loader=loader
+    )
+
+def test_load_contents_loads_in_parallel() -> None:
+    all_started = threading.Barrier(3, timeout=5)
+
+    def load() -> str:
+        # Only returns once all three loads are running at the same time
+        all_started.wait()
+        return "content"
+
+    documents = [create_document(str(i), Mock(side_effect=load)) for i in range(3)]
+
+    result = load_contents(documents, concurrency=3)
+
+    assert result == documents
+    assert all(document.content_loaded for document in documents)
+    assert [document.content for document in documents] == ["content"] * 3
+
+def test_load_contents_skips_loaded_documents() -> None:
+    loader = Mock(return_value="content")
+    loaded = create_document("1", Mock())
+    loaded._content = "already loaded"
+    without_loader = create_document("2", None)
+
+    load_contents([loaded, without_loader, create_document("3", loader)])
+
+    loaded._content_loader.assert_not_called()
+    loader.assert_called_once()
+
+def test_load_contents_leaves_failed_documents_unloaded() -> None:
+    failing = create_document("1", Mock(side_effect=Exception("timeout")))
+    working = create_document("2", Mock(return_value="content"))
+
+    load_contents([failing, working])
+
+    assert not failing.content_loaded
+    assert working.content == "content"
@@ -0,0 +1,47 @@
+"""
+Round-trip latency of the local state manager backends.
+
+Gives a baseline to compare the bucket backends against:
+    uv run python benchmarks/backends.py --iterations 1000
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from state_manager.interfaces import BaseState, StateManager
+from state_manager.local import LocalFileStateManager
+from state_manager.sqlite import SQLiteStateManager
+
+class BenchmarkState(BaseState):
+    def __init__(self, id: str):
+        self.id = id
+        super().__init__()
+
+def time_operation(operation: Callable[[], object], iterations: int) -> float:
+    """Returns the mean duration of the operation in microseconds"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        operation()
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+def benchmark(name: str, state_manager: StateManager, iterations: int) -> None:
+    state = BenchmarkState(id="benchmark")
+    save_us = time_operation(lambda: state_manager.save_state(state), iterations)
+    get_us = time_operation(state_manager.get_state, iterations)
+    print(f"{name:<10} save_state: {save_us:10.1f} us    get_state: {get_us:10.1f} us")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        benchmark("local", LocalFileStateManager(str(Path(tmp_dir) / "state.json"), BenchmarkState), args.iterations)
+        sqlite_manager = SQLiteStateManager(str(Path(tmp_dir) / "state.db"), "benchmark", BenchmarkState)
+        benchmark("sqlite", sqlite_manager, args.iterations)
+        sqlite_manager.close()
+
+if __name__ == "__main__":
+    main()
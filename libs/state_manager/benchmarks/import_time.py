@@ -0,0 +1,39 @@
+"""
+Cold start cost of the state manager backends.
+
+Each measurement runs in a fresh interpreter so module caches don't skew the results:
+    uv run python benchmarks/import_time.py
+"""
+import subprocess
+import sys
+
+MEASUREMENTS = {
+    "import state_manager.gcs": "import state_manager.gcs",
+    "import state_manager.s3": "import state_manager.s3",
+    "import state_manager.local": "import state_manager.local",
+    "GCS first client use": "import state_manager.gcs as m; m.GCSStateManager('bucket', 'path', object).client",
+    "S3 first client use": "import state_manager.s3 as m; m.S3StateManager('bucket', 'key', object).s3_client",
+}
+
+TIMER = "import time; start = time.perf_counter(); {statement}; print((time.perf_counter() - start) * 1000)"
+
+def measure(statement: str, runs: int = 5) -> float:
+    """Returns the best of several runs in milliseconds"""
+    timings = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", TIMER.format(statement=statement)],
+            capture_output=True, text=True, check=True
+        )
+        timings.append(float(result.stdout.strip()))
+    return min(timings)
+
+def main() -> None:
+    for name, statement in MEASUREMENTS.items():
+        try:
+            print(f"{name:<30} {measure(statement):8.1f} ms")
+        except subprocess.CalledProcessError as e:
+            print(f"{name:<30} failed: {e.stderr.strip().splitlines()[-1]}")
+
+if __name__ == "__main__":
+    main()
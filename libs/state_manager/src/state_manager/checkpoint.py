@@ -0,0 +1,194 @@
+import os
+import json
+from pathlib import Path
+from datetime import datetime, timezone
+from typing import Optional, TypeVar, IO
+from loguru import logger
+
+from .interfaces import StateManager
+
+T = TypeVar('T')
+
+class CheckpointStateManager(StateManager[T]):
+    """
+    Append-only checkpoint log on top of another StateManager.
+
+    The wrapped state manager holds a full snapshot of the state. Each call to
+    checkpoint() only appends the fields that changed since the last checkpoint
+    to a local write-ahead log, one JSON record per line, which is far cheaper
+    than rewriting the whole object in a bucket. get_state() replays the log on
+    top of the snapshot and every compact_every records the log is folded into
+    a new snapshot and truncated.
+
+    Records set absolute field values so replaying a record twice is harmless,
+    e.g. after a crash between writing a snapshot and truncating the log.
+    """
+
+    def __init__(
+        self,
+        snapshot_manager: StateManager[T],
+        log_path: str,
+        compact_every: int = 100,
+        fsync: bool = True
+    ) -> None:
+        """
+        Initialize checkpoint state manager.
+
+        Args:
+            snapshot_manager: State manager that stores the compacted snapshots
+            log_path: Path to the local write-ahead log file
+            compact_every: Number of checkpoint records after which the log is compacted
+            fsync: Whether to fsync the log after every record
+        """
+        self.snapshot_manager = snapshot_manager
+        self.log_path = Path(log_path)
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self._log_file: Optional[IO[str]] = None
+        self._last_fields: Optional[dict[str, str]] = None
+        self._pending_records = 0
+
+    def __enter__(self) -> "CheckpointStateManager[T]":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @staticmethod
+    def _encode_fields(state: T) -> dict[str, str]:
+        import jsonpickle
+        return {name: jsonpickle.encode(value) for name, value in vars(state).items()}
+
+    def _read_records(self) -> list[dict[str, str]]:
+        try:
+            lines = self.log_path.read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            return []
+
+        records = []
+        for line_number, line in enumerate(lines, start=1):
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                # Only the last record can be torn by a crash mid-write, anything after it is unreadable anyway
+                logger.warning(f"Ignoring unreadable checkpoint record on line {line_number} of {self.log_path}")
+                break
+        return records
+
+    def _discard_torn_record(self) -> None:
+        """Truncates a last record left without its newline by a crash, so appends start on a new line"""
+        try:
+            with open(self.log_path, "rb+") as log_file:
+                data = log_file.read()
+                if not data or data.endswith(b"\n"):
+                    return
+                logger.warning(f"Discarding torn checkpoint record at the end of {self.log_path}")
+                log_file.truncate(data.rfind(b"\n") + 1)
+                if self.fsync:
+                    os.fsync(log_file.fileno())
+        except FileNotFoundError:
+            return
+
+    def _append_record(self, record: dict[str, str]) -> None:
+        if self._log_file is None:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            self._discard_torn_record()
+            self._log_file = open(self.log_path, "a", encoding="utf-8")
+        self._log_file.write(json.dumps(record) + "\n")
+        self._log_file.flush()
+        if self.fsync:
+            os.fsync(self._log_file.fileno())
+
+    def _truncate_log(self) -> None:
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+        if self.log_path.exists():
+            with open(self.log_path, "w", encoding="utf-8") as log_file:
+                if self.fsync:
+                    os.fsync(log_file.fileno())
+        self._pending_records = 0
+
+    def checkpoint(self, state: T) -> None:
+        """
+        Records the fields of state that changed since the last checkpoint.
+        The first checkpoint without an existing snapshot saves a full snapshot.
+
+        Args:
+            state: The state object to checkpoint
+        """
+        try:
+            if self._last_fields is None and self.get_state() is None:
+                self.save_state(state)
+                return
+
+            state.last_updated_date = datetime.now(timezone.utc)
+            fields = self._encode_fields(state)
+            changes = {name: value for name, value in fields.items() if self._last_fields.get(name) != value}
+            self._append_record(changes)
+            self._last_fields = fields
+            self._pending_records += 1
+        except (OSError, TypeError) as e:
+            raise RuntimeError(f"Failed to checkpoint state: {str(e)}") from e
+
+        if self._pending_records >= self.compact_every:
+            self.compact()
+
+    def compact(self) -> None:
+        """Folds the checkpoint log into a new snapshot and truncates the log"""
+        state = self.get_state()
+        if state is None:
+            self._truncate_log()
+            return
+        self.save_state(state)
+
+    def save_state(self, state: T) -> None:
+        """Save a full snapshot and discard the checkpoint log"""
+        self.snapshot_manager.save_state(state)
+        try:
+            self._truncate_log()
+        except OSError as e:
+            raise RuntimeError(f"Failed to truncate checkpoint log: {str(e)}") from e
+        self._last_fields = self._encode_fields(state)
+
+    def get_state(self) -> Optional[T]:
+        """Retrieve the snapshot with the checkpoint log replayed on top"""
+        import jsonpickle
+        state = self.snapshot_manager.get_state()
+        if state is None:
+            return None
+
+        try:
+            records = self._read_records()
+        except OSError as e:
+            raise RuntimeError(f"Failed to read checkpoint log: {str(e)}") from e
+
+        for record in records:
+            for name, value in record.items():
+                setattr(state, name, jsonpickle.decode(value))
+        self._last_fields = self._encode_fields(state)
+        self._pending_records = len(records)
+        return state
+
+    def get_last_updated(self) -> Optional[datetime]:
+        """Get the last updated timestamp of the latest checkpoint"""
+        state = self.get_state()
+        return state.last_updated_date if state else None
+
+    def clear_state(self) -> None:
+        """Delete the snapshot and the checkpoint log"""
+        self.snapshot_manager.clear_state()
+        try:
+            self._truncate_log()
+            self.log_path.unlink(missing_ok=True)
+        except OSError as e:
+            raise RuntimeError(f"Failed to clear checkpoint log: {str(e)}") from e
+        self._last_fields = None
+
+    def close(self) -> None:
+        """Compacts any outstanding checkpoints and closes the log file"""
+        if self._pending_records > 0:
+            self.compact()
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
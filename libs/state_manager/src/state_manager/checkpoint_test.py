@@ -0,0 +1,148 @@
+import pytest
+from pathlib import Path
+from datetime import datetime, timezone
+from typing import Optional, Generator
+from dataclasses import dataclass
+from unittest.mock import Mock
+
+from .interfaces import BaseState
+from .local import LocalFileStateManager
+from .checkpoint import CheckpointStateManager
+
+@dataclass
+class TestState(BaseState):
+    def __init__(self, id: str, processed: int = 0, last_updated_date: Optional[datetime] = datetime.now(timezone.utc).isoformat()):
+        self.id: str = id
+        self.processed: int = processed
+        super().__init__(last_updated_date)
+    __test__ = False
+
+@pytest.fixture
+def snapshot_manager(tmp_path: Path) -> Mock:
+    # Wrap a real backend so we can count snapshot writes
+    return Mock(wraps=LocalFileStateManager(str(tmp_path / "snapshot.json"), TestState))
+
+@pytest.fixture
+def log_path(tmp_path: Path) -> Path:
+    return tmp_path / "checkpoints.log"
+
+@pytest.fixture
+def state_manager(snapshot_manager: Mock, log_path: Path) -> Generator[CheckpointStateManager, None, None]:
+    manager = CheckpointStateManager(snapshot_manager, str(log_path), compact_every=3)
+    yield manager
+    manager.close()
+
+def test_first_checkpoint_writes_snapshot(state_manager: CheckpointStateManager, snapshot_manager: Mock, log_path: Path) -> None:
+    """Test that checkpointing without a snapshot saves a full snapshot"""
+    state_manager.checkpoint(TestState(id="run"))
+
+    snapshot_manager.save_state.assert_called_once()
+    assert not log_path.exists() or log_path.read_text() == ""
+
+def test_checkpoints_append_only_changed_fields(state_manager: CheckpointStateManager, snapshot_manager: Mock, log_path: Path) -> None:
+    """Test that checkpoints append deltas instead of rewriting the snapshot"""
+    state = TestState(id="run")
+    state_manager.checkpoint(state)
+
+    state.processed = 100
+    state_manager.checkpoint(state)
+
+    assert snapshot_manager.save_state.call_count == 1
+    records = log_path.read_text().splitlines()
+    assert len(records) == 1
+    assert "processed" in records[0]
+    assert "\"id\"" not in records[0]
+
+def test_get_state_replays_log(state_manager: CheckpointStateManager, snapshot_manager: Mock, log_path: Path) -> None:
+    """Test that a new manager resumes from snapshot plus log"""
+    state = TestState(id="run")
+    state_manager.checkpoint(state)
+    state.processed = 100
+    state_manager.checkpoint(state)
+
+    resumed = CheckpointStateManager(snapshot_manager, str(log_path), compact_every=3).get_state()
+
+    assert resumed.id == "run"
+    assert resumed.processed == 100
+    assert isinstance(resumed.last_updated_date, datetime)
+
+def test_log_compacts_after_threshold(state_manager: CheckpointStateManager, snapshot_manager: Mock, log_path: Path) -> None:
+    """Test that the log is folded into a snapshot every compact_every records"""
+    state = TestState(id="run")
+    state_manager.checkpoint(state)
+    for processed in range(1, 4):
+        state.processed = processed
+        state_manager.checkpoint(state)
+
+    assert snapshot_manager.save_state.call_count == 2
+    assert log_path.read_text() == ""
+    assert snapshot_manager.get_state().processed == 3
+
+def test_torn_record_is_ignored(state_manager: CheckpointStateManager, log_path: Path) -> None:
+    """Test that a partially written last record doesn't break recovery"""
+    state = TestState(id="run")
+    state_manager.checkpoint(state)
+    state.processed = 5
+    state_manager.checkpoint(state)
+
+    with open(log_path, "a") as log_file:
+        log_file.write('{"processed": "1')
+
+    assert state_manager.get_state().processed == 5
+
+def test_checkpoints_after_torn_record_are_kept(snapshot_manager: Mock, log_path: Path) -> None:
+    """Test that records appended after a crash don't land on the torn record's line"""
+    state = TestState(id="run")
+    with CheckpointStateManager(snapshot_manager, str(log_path), compact_every=100) as crashed:
+        crashed.checkpoint(state)
+        state.processed = 5
+        crashed.checkpoint(state)
+        crashed._log_file.write('{"processed": "1')
+        crashed._log_file.close()
+        crashed._log_file = None
+        crashed._pending_records = 0
+
+    with CheckpointStateManager(snapshot_manager, str(log_path), compact_every=100) as resumed:
+        state = resumed.get_state()
+        for processed in (50, 60):
+            state.processed = processed
+            resumed.checkpoint(state)
+
+        assert '{"processed": "1' not in log_path.read_text()
+        assert len(log_path.read_text().splitlines()) == 3
+
+    assert snapshot_manager.get_state().processed == 60
+
+def test_close_compacts_pending_checkpoints(snapshot_manager: Mock, log_path: Path) -> None:
+    """Test that closing folds outstanding checkpoints into the snapshot"""
+    with CheckpointStateManager(snapshot_manager, str(log_path), compact_every=100) as state_manager:
+        state = TestState(id="run")
+        state_manager.checkpoint(state)
+        state.processed = 42
+        state_manager.checkpoint(state)
+
+    assert log_path.read_text() == ""
+    assert snapshot_manager.get_state().processed == 42
+
+def test_clear_state(state_manager: CheckpointStateManager, log_path: Path) -> None:
+    """Test clearing the snapshot and the log"""
+    state = TestState(id="run")
+    state_manager.checkpoint(state)
+    state.processed = 1
+    state_manager.checkpoint(state)
+
+    state_manager.clear_state()
+
+    assert state_manager.get_state() is None
+    assert not log_path.exists()
+
+def test_get_last_updated(state_manager: CheckpointStateManager) -> None:
+    """Test getting last updated timestamp"""
+    assert state_manager.get_last_updated() is None
+
+    state = TestState(id="run")
+    state_manager.checkpoint(state)
+    state.processed = 1
+    state_manager.checkpoint(state)
+
+    assert state_manager.get_last_updated() == state.last_updated_date
@@ -1,11 +1,15 @@
-from datetime import datetime, timezone
-import jsonpickle
-from typing import Optional, TypeVar
-from google.cloud import storage
-from google.cloud.storage.blob import Blob
-from google.api_core import exceptions as gcs_exceptions
+import threading
+from datetime import datetime
+from typing import Optional, TypeVar, TYPE_CHECKING
 
 from .interfaces import StateManager
+from .lease import Lease, LeaseRecord
+from .serialization import encode_state, decode_state
+from .threaded import ThreadedAsyncStateManager
+
+if TYPE_CHECKING:
+    from google.cloud import storage
+    from google.cloud.storage.blob import Blob
 
 T = TypeVar('T')
 
@@ -15,46 +19,72 @@ class GCSStateManager(StateManager[T]):
     Stores state as JSON in a GCS bucket.
     """
     
-    def __init__(self, bucket_name: str, state_path: str, state_class: type[T]) -> StateManager[T]:
+    def __init__(
+        self,
+        bucket_name: str,
+        state_path: str,
+        state_class: type[T],
+        client: Optional["storage.Client"] = None
+    ) -> StateManager[T]:
         """
         Initialize GCS state manager.
+        The google-cloud-storage client is only imported and created on first use.
         
         Args:
             bucket_name: Name of the GCS bucket
             state_path: Path/key where state will be stored in the bucket
+            client: Optional storage client to share between state managers
         """
-        self.client = storage.Client()
-        self.bucket = self.client.bucket(bucket_name)
+        self.bucket_name = bucket_name
         self.state_path = state_path
         self.state_class = state_class
+        self._client = client
+        self._client_lock = threading.Lock()
+        self._bucket = None
+
+    @property
+    def client(self) -> "storage.Client":
+        if self._client is None:
+            # Concurrent first uses, e.g. through AsyncGCSStateManager, create a single client
+            with self._client_lock:
+                if self._client is None:
+                    from google.cloud import storage
+                    self._client = storage.Client()
+        return self._client
+
+    @property
+    def bucket(self) -> "storage.Bucket":
+        if self._bucket is None:
+            self._bucket = self.client.bucket(self.bucket_name)
+        return self._bucket
         
-    def _get_blob(self) -> Blob:
+    def _get_blob(self) -> "Blob":
         return self.bucket.blob(self.state_path)
     
     def save_state(self, state: T) -> None:
         """Save state using jsonpickle in GCS"""
+        from google.api_core import exceptions as gcs_exceptions
         try:
             blob = self._get_blob()
-            state.last_updated_date = datetime.now(timezone.utc)
-            state_json = jsonpickle.encode(state)
-            blob.upload_from_string(state_json)
+            blob.upload_from_string(encode_state(state))
         except (gcs_exceptions.GoogleAPIError, TypeError, AttributeError) as e:
             raise RuntimeError(f"Failed to save state to GCS: {str(e)}") from e
     
     def get_state(self) -> Optional[T]:
         """Retrieve and deserialize state from GCS using jsonpickle"""
+        from google.api_core import exceptions as gcs_exceptions
         try:
             blob = self._get_blob()
             if not blob.exists():
                 return None
                 
-            state_json = blob.download_as_string()
-            return jsonpickle.decode(state_json)
+            return decode_state(blob.download_as_string())
         except gcs_exceptions.GoogleAPIError as e:
             raise RuntimeError(f"Failed to retrieve state from GCS: {str(e)}") from e
     
     def get_last_updated(self) -> Optional[datetime]:
         """Get blob's last updated timestamp"""
+        from google.api_core import exceptions as gcs_exceptions
         try:
             blob = self._get_blob()
             if not blob.exists():
@@ -66,9 +96,90 @@ class GCSStateManager(StateManager[T]):
     
     def clear_state(self) -> None:
         """Delete the state blob if it exists"""
+        from google.api_core import exceptions as gcs_exceptions
         try:
             blob = self._get_blob()
             if blob.exists():
                 blob.delete()
         except gcs_exceptions.GoogleAPIError as e:
             raise RuntimeError(f"Failed to clear state: {str(e)}") from e
+
+class AsyncGCSStateManager(ThreadedAsyncStateManager[T]):
+    """
+    Async Google Cloud Storage state manager.
+    Runs GCSStateManager calls in worker threads.
+    """
+
+    def __init__(
+        self,
+        bucket_name: str,
+        state_path: str,
+        state_class: type[T],
+        client: Optional["storage.Client"] = None
+    ) -> None:
+        super().__init__(GCSStateManager(bucket_name, state_path, state_class, client))
+
+class GCSLease(Lease):
+    """
+    Lease stored as a GCS object.
+    Writes use generation preconditions, generation 0 meaning the object must not exist yet.
+    """
+
+    def __init__(
+        self,
+        bucket_name: str,
+        lease_path: str,
+        ttl_secs: int = 300,
+        holder: Optional[str] = None,
+        client: Optional["storage.Client"] = None
+    ) -> None:
+        """
+        Initialize GCS lease.
+
+        Args:
+            bucket_name: Name of the GCS bucket
+            lease_path: Path/key of the lease object in the bucket
+            ttl_secs: How long an acquired or renewed lease is valid for
+            holder: Unique name of this holder
+            client: Optional storage client to share with state managers
+        """
+        super().__init__(ttl_secs=ttl_secs, holder=holder)
+        self.bucket_name = bucket_name
+        self.lease_path = lease_path
+        self._client = client
+        self._client_lock = threading.Lock()
+
+    @property
+    def bucket(self) -> "storage.Bucket":
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    from google.cloud import storage
+                    self._client = storage.Client()
+        return self._client.bucket(self.bucket_name)
+
+    def _read(self) -> tuple[Optional[LeaseRecord], Optional[str]]:
+        from google.api_core import exceptions as gcs_exceptions
+        try:
+            blob = self.bucket.get_blob(self.lease_path)
+            if blob is None:
+                return None, None
+            # If the content changes after the metadata was read, the write conditioned on this generation fails
+            return LeaseRecord.decode(blob.download_as_bytes()), str(blob.generation)
+        except gcs_exceptions.GoogleAPIError as e:
+            raise RuntimeError(f"Failed to read lease from GCS: {str(e)}") from e
+
+    def _write(self, record: LeaseRecord, expected_version: Optional[str]) -> Optional[str]:
+        from google.api_core import exceptions as gcs_exceptions
+        try:
+            blob = self.bucket.blob(self.lease_path)
+            blob.upload_from_string(
+                record.encode(),
+                content_type="application/json",
+                if_generation_match=int(expected_version) if expected_version else 0
+            )
+            return str(blob.generation)
+        except gcs_exceptions.PreconditionFailed:
+            return None
+        except gcs_exceptions.GoogleAPIError as e:
+            raise RuntimeError(f"Failed to write lease to GCS: {str(e)}") from e
@@ -1,5 +1,7 @@
+import time
 import pytest
 import jsonpickle
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Optional, Generator
@@ -8,7 +10,7 @@ from .interfaces import BaseState
 
 from google.api_core import exceptions as gcs_exceptions
 
-from .gcs import GCSStateManager
+from .gcs import GCSStateManager, GCSLease
 
 @dataclass
 class TestState(BaseState):
@@ -155,3 +157,78 @@ def test_clear_state_failure(state_manager: GCSStateManager, mock_storage_client
     
     with pytest.raises(RuntimeError, match="Failed to clear state"):
         state_manager.clear_state()
+
+def test_injected_client_is_used(mock_storage_client: Mock) -> None:
+    """Test that a caller supplied client is shared instead of creating a new one"""
+    shared_client = Mock()
+    first = GCSStateManager("test-bucket", "first.json", TestState, client=shared_client)
+    second = GCSStateManager("test-bucket", "second.json", TestState, client=shared_client)
+
+    assert first.client is second.client is shared_client
+    first.clear_state()
+    shared_client.bucket.assert_called_once_with("test-bucket")
+    mock_storage_client.assert_not_called()
+
+def test_client_created_lazily(mock_storage_client: Mock) -> None:
+    """Test that the default client is only created on first use"""
+    state_manager = GCSStateManager("test-bucket", "test/state.json", TestState)
+    mock_storage_client.assert_not_called()
+
+    state_manager.bucket
+    state_manager.bucket
+
+    mock_storage_client.assert_called_once()
+
+def test_concurrent_first_uses_create_one_client(mock_storage_client: Mock) -> None:
+    """Test that threads racing to the first use share a single client"""
+    def slow_client() -> Mock:
+        time.sleep(0.05)
+        return Mock()
+    mock_storage_client.side_effect = slow_client
+    state_manager = GCSStateManager("test-bucket", "test/state.json", TestState)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        clients = list(executor.map(lambda _: state_manager.client, range(8)))
+
+    mock_storage_client.assert_called_once()
+    assert all(client is clients[0] for client in clients)
+
+def test_lease_acquire_creates_with_generation_zero(mock_storage_client: Mock) -> None:
+    """Test that the first lease write requires the object to not exist"""
+    lease = GCSLease("test-bucket", "lease.json", holder="first")
+    lease.bucket.get_blob.return_value = None
+    mock_blob = Mock(generation=1)
+    lease.bucket.blob.return_value = mock_blob
+
+    assert lease.acquire()
+    assert mock_blob.upload_from_string.call_args.kwargs["if_generation_match"] == 0
+
+def test_lease_renew_matches_generation(mock_storage_client: Mock) -> None:
+    """Test that renewing is conditional on the generation we wrote"""
+    lease = GCSLease("test-bucket", "lease.json", holder="first")
+    lease.bucket.get_blob.return_value = None
+    mock_blob = Mock(generation=7)
+    lease.bucket.blob.return_value = mock_blob
+    lease.acquire()
+
+    assert lease.renew()
+    assert mock_blob.upload_from_string.call_args.kwargs["if_generation_match"] == 7
+
+def test_lease_precondition_failure(mock_storage_client: Mock) -> None:
+    """Test that losing the race for the lease returns False"""
+    lease = GCSLease("test-bucket", "lease.json", holder="first")
+    lease.bucket.get_blob.return_value = None
+    mock_blob = Mock()
+    mock_blob.upload_from_string.side_effect = gcs_exceptions.PreconditionFailed("Generation mismatch")
+    lease.bucket.blob.return_value = mock_blob
+
+    assert not lease.acquire()
+    assert not lease.is_held
+
+def test_lease_api_failure(mock_storage_client: Mock) -> None:
+    """Test that other GCS errors are surfaced"""
+    lease = GCSLease("test-bucket", "lease.json", holder="first")
+    lease.bucket.get_blob.side_effect = gcs_exceptions.GoogleAPIError("API error")
+
+    with pytest.raises(RuntimeError, match="Failed to read lease from GCS"):
+        lease.acquire()
@@ -55,3 +55,49 @@ class StateManager(ABC, Generic[T]):
         Clears/deletes the current state.
         """
         pass
+
+class AsyncStateManager(ABC, Generic[T]):
+    """
+    Asyncio counterpart of StateManager for use from async services
+    e.g. Quart apps, where blocking bucket calls would stall the event loop.
+
+    Type parameter T represents the type of state object being stored/retrieved.
+    Must be a subclass of BaseState.
+    """
+
+    @abstractmethod
+    async def save_state(self, state: T) -> None:
+        """
+        Saves the current state.
+
+        Args:
+            state: The state object to persist
+        """
+        pass
+
+    @abstractmethod
+    async def get_state(self) -> Optional[T]:
+        """
+        Retrieves the current state if it exists.
+
+        Returns:
+            The state object if it exists, None otherwise
+        """
+        pass
+
+    @abstractmethod
+    async def get_last_updated(self) -> Optional[datetime]:
+        """
+        Gets the timestamp of when the state was last updated.
+
+        Returns:
+            datetime of last update if state exists, None otherwise
+        """
+        pass
+
+    @abstractmethod
+    async def clear_state(self) -> None:
+        """
+        Clears/deletes the current state.
+        """
+        pass
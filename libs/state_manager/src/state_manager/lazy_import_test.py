@@ -0,0 +1,21 @@
+import os
+import sys
+import subprocess
+from pathlib import Path
+
+HEAVY_MODULES = ("google", "boto3", "botocore", "jsonpickle")
+
+def test_importing_backends_does_not_import_cloud_sdks() -> None:
+    """Test that cloud SDKs are only imported when a client is first used"""
+    code = (
+        "import sys\n"
+        "import state_manager.gcs, state_manager.s3, state_manager.local, state_manager.sqlite\n"
+        "state_manager.gcs.GCSStateManager('bucket', 'path', object)\n"
+        "state_manager.s3.S3StateManager('bucket', 'key', object)\n"
+        f"print(sorted(m for m in sys.modules if m.split('.')[0] in {HEAVY_MODULES!r}))\n"
+    )
+    env = {**os.environ, "PYTHONPATH": str(Path(__file__).parent.parent)}
+
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True)
+
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,132 @@
+import json
+import socket
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+class LeaseUnavailableError(RuntimeError):
+    """Raised when entering a lease context while another holder has the lease"""
+
+@dataclass
+class LeaseRecord:
+    """Contents of the lease object stored in the bucket"""
+    holder: str
+    expires_at: datetime
+
+    def encode(self) -> str:
+        return json.dumps({"holder": self.holder, "expires_at": self.expires_at.isoformat()})
+
+    @staticmethod
+    def decode(data: str | bytes) -> "LeaseRecord":
+        record = json.loads(data)
+        return LeaseRecord(holder=record["holder"], expires_at=datetime.fromisoformat(record["expires_at"]))
+
+class Lease(ABC):
+    """
+    Time limited, mutually exclusive lease stored as a single object in a bucket.
+    Only one holder can have an unexpired lease at a time, e.g. so that redundant
+    schedulers don't run the same ingestion twice.
+
+    Every write is conditional on the version of the object (GCS generation, S3 ETag)
+    that was last read, so two holders racing for an expired lease can't both win.
+    Expiry is judged with the local clock, so keep the TTL well above any expected clock skew.
+
+    Usable as a context manager which acquires on enter and releases on exit:
+
+        with GCSLease("bucket", "builds/lease.json", ttl_secs=600):
+            run_ingestion()
+    """
+
+    def __init__(self, ttl_secs: int = 300, holder: Optional[str] = None) -> None:
+        """
+        Args:
+            ttl_secs: How long an acquired or renewed lease is valid for
+            holder: Unique name of this holder, defaults to the hostname plus a random suffix
+        """
+        self.ttl = timedelta(seconds=ttl_secs)
+        self.holder = holder or f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+        self.expires_at: Optional[datetime] = None
+        self._version: Optional[str] = None
+
+    @abstractmethod
+    def _read(self) -> tuple[Optional[LeaseRecord], Optional[str]]:
+        """
+        Reads the current lease object.
+
+        Returns:
+            The lease record and its version, or (None, None) if there is no lease object
+        """
+        pass
+
+    @abstractmethod
+    def _write(self, record: LeaseRecord, expected_version: Optional[str]) -> Optional[str]:
+        """
+        Writes the lease object if it is still at the expected version.
+
+        Args:
+            record: The lease record to write
+            expected_version: Version the object must currently have, None if it must not exist
+
+        Returns:
+            The new version, or None if the precondition failed
+        """
+        pass
+
+    @property
+    def is_held(self) -> bool:
+        """Whether this holder currently has an unexpired lease"""
+        return self._version is not None and datetime.now(timezone.utc) < self.expires_at
+
+    def acquire(self) -> bool:
+        """
+        Tries to take the lease. Succeeds if there is no lease, it has expired
+        or it is already held by this holder.
+
+        Returns:
+            True if the lease was acquired
+        """
+        record, version = self._read()
+        now = datetime.now(timezone.utc)
+        if record and record.holder != self.holder and record.expires_at > now:
+            return False
+        return self._write_held(now, version)
+
+    def renew(self) -> bool:
+        """
+        Extends a held lease by the TTL from now.
+
+        Returns:
+            True if the lease was renewed, False if it was lost to another holder
+        """
+        if self._version is None:
+            return False
+        return self._write_held(datetime.now(timezone.utc), self._version)
+
+    def release(self) -> None:
+        """Gives up a held lease by marking it expired, so others can acquire it straight away"""
+        if self._version is None:
+            return
+        self._write(LeaseRecord(holder=self.holder, expires_at=datetime.now(timezone.utc)), self._version)
+        self._version = None
+        self.expires_at = None
+
+    def _write_held(self, now: datetime, expected_version: Optional[str]) -> bool:
+        expires_at = now + self.ttl
+        new_version = self._write(LeaseRecord(holder=self.holder, expires_at=expires_at), expected_version)
+        if new_version is None:
+            self._version = None
+            self.expires_at = None
+            return False
+        self._version = new_version
+        self.expires_at = expires_at
+        return True
+
+    def __enter__(self) -> "Lease":
+        if not self.acquire():
+            raise LeaseUnavailableError(f"Lease is held by another holder, {self.holder} could not acquire it")
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
@@ -0,0 +1,98 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from .lease import Lease, LeaseRecord, LeaseUnavailableError
+
+class InMemoryLease(Lease):
+    """Lease over a shared dict, emulating a bucket with conditional writes"""
+    def __init__(self, store: dict, holder: str, ttl_secs: int = 60) -> None:
+        super().__init__(ttl_secs=ttl_secs, holder=holder)
+        self.store = store
+
+    def _read(self) -> tuple[Optional[LeaseRecord], Optional[str]]:
+        if "record" not in self.store:
+            return None, None
+        return LeaseRecord.decode(self.store["record"]), str(self.store["version"])
+
+    def _write(self, record: LeaseRecord, expected_version: Optional[str]) -> Optional[str]:
+        current_version = str(self.store["version"]) if "record" in self.store else None
+        if current_version != expected_version:
+            return None
+        self.store["record"] = record.encode()
+        self.store["version"] = self.store.get("version", 0) + 1
+        return str(self.store["version"])
+
+@pytest.fixture
+def store() -> dict:
+    return {}
+
+def test_acquire_is_exclusive(store: dict) -> None:
+    """Test that only one holder can acquire an unexpired lease"""
+    first = InMemoryLease(store, "first")
+    second = InMemoryLease(store, "second")
+
+    assert first.acquire()
+    assert first.is_held
+    assert not second.acquire()
+    assert not second.is_held
+
+def test_acquire_expired_lease(store: dict) -> None:
+    """Test that an expired lease can be taken over"""
+    first = InMemoryLease(store, "first", ttl_secs=-1)
+    second = InMemoryLease(store, "second")
+
+    assert first.acquire()
+    assert second.acquire()
+    assert not first.renew()
+
+def test_lost_race_fails(store: dict) -> None:
+    """Test that a write based on a stale read fails"""
+    first = InMemoryLease(store, "first")
+    second = InMemoryLease(store, "second")
+    stale_record, stale_version = second._read()
+
+    assert first.acquire()
+    assert second._write(LeaseRecord("second", datetime.now(timezone.utc)), stale_version) is None
+
+def test_renew_extends_expiry(store: dict) -> None:
+    """Test that renewing moves the expiry forward"""
+    lease = InMemoryLease(store, "first")
+    lease.acquire()
+    first_expiry = lease.expires_at
+
+    assert lease.renew()
+    assert lease.expires_at >= first_expiry
+
+def test_renew_without_acquire(store: dict) -> None:
+    """Test that a lease that was never acquired can't be renewed"""
+    assert not InMemoryLease(store, "first").renew()
+
+def test_release_lets_others_acquire(store: dict) -> None:
+    """Test that releasing makes the lease immediately available"""
+    first = InMemoryLease(store, "first")
+    second = InMemoryLease(store, "second")
+
+    first.acquire()
+    first.release()
+
+    assert not first.is_held
+    assert second.acquire()
+
+def test_context_manager(store: dict) -> None:
+    """Test acquiring and releasing with a context manager"""
+    other = InMemoryLease(store, "other")
+
+    with InMemoryLease(store, "first") as lease:
+        assert lease.is_held
+        with pytest.raises(LeaseUnavailableError):
+            with other:
+                pass
+
+    assert other.acquire()
+
+def test_record_round_trip() -> None:
+    """Test encoding and decoding lease records"""
+    record = LeaseRecord("holder", datetime.now(timezone.utc) + timedelta(minutes=5))
+
+    assert LeaseRecord.decode(record.encode()) == record
@@ -0,0 +1,93 @@
+import os
+import mmap
+import tempfile
+from pathlib import Path
+from datetime import datetime, timezone
+from typing import Optional, TypeVar
+
+from .interfaces import StateManager
+from .serialization import encode_state, decode_state
+
+T = TypeVar('T')
+
+class LocalFileStateManager(StateManager[T]):
+    """
+    Local filesystem implementation of StateManager interface.
+    Stores state as JSON in a single file. Writes go to a temporary file in the
+    same directory which is fsynced and atomically renamed over the state file,
+    so readers only ever see the previous or the new state, never a partial one.
+    """
+
+    def __init__(self, state_path: str, state_class: type[T]) -> None:
+        """
+        Initialize local file state manager.
+
+        Args:
+            state_path: Path to the file where state will be stored
+            state_class: Type of the state object being stored
+        """
+        self.state_path = Path(state_path)
+        self.state_class = state_class
+
+    def _fsync_directory(self) -> None:
+        """Persist the rename itself by syncing the parent directory entry"""
+        if not hasattr(os, "O_DIRECTORY"):
+            return
+        dir_fd = os.open(self.state_path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+    def save_state(self, state: T) -> None:
+        """Atomically save state as JSON to the local file"""
+        try:
+            state_json = encode_state(state)
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+
+            fd, tmp_path = tempfile.mkstemp(
+                dir=self.state_path.parent,
+                prefix=f".{self.state_path.name}.",
+                suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "wb") as tmp_file:
+                    tmp_file.write(state_json.encode("utf-8"))
+                    tmp_file.flush()
+                    os.fsync(tmp_file.fileno())
+                os.replace(tmp_path, self.state_path)
+            except BaseException:
+                Path(tmp_path).unlink(missing_ok=True)
+                raise
+            self._fsync_directory()
+        except (OSError, TypeError, AttributeError) as e:
+            raise RuntimeError(f"Failed to save state to local file: {str(e)}") from e
+
+    def get_state(self) -> Optional[T]:
+        """Retrieve and deserialize state from the local file using a memory map"""
+        try:
+            with open(self.state_path, "rb") as state_file:
+                if os.fstat(state_file.fileno()).st_size == 0:
+                    return None
+                with mmap.mmap(state_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return decode_state(str(mapped, "utf-8"))
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            raise RuntimeError(f"Failed to retrieve state from local file: {str(e)}") from e
+
+    def get_last_updated(self) -> Optional[datetime]:
+        """Get the state file's last modified timestamp"""
+        try:
+            return datetime.fromtimestamp(self.state_path.stat().st_mtime, tz=timezone.utc)
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            raise RuntimeError(f"Failed to get last updated timestamp: {str(e)}") from e
+
+    def clear_state(self) -> None:
+        """Delete the state file if it exists"""
+        try:
+            self.state_path.unlink(missing_ok=True)
+        except OSError as e:
+            raise RuntimeError(f"Failed to clear state: {str(e)}") from e
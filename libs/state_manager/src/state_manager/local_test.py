@@ -0,0 +1,85 @@
+import os
+import pytest
+from pathlib import Path
+from datetime import datetime, timezone
+from typing import Optional
+from dataclasses import dataclass
+from unittest.mock import patch
+
+from .interfaces import BaseState
+from .local import LocalFileStateManager
+
+@dataclass
+class TestState(BaseState):
+    def __init__(self, id: str, last_updated_date: Optional[datetime] = datetime.now(timezone.utc).isoformat()):
+        self.id: str = id
+        super().__init__(last_updated_date)
+    __test__ = False
+
+@pytest.fixture
+def state_path(tmp_path: Path) -> Path:
+    return tmp_path / "nested" / "state.json"
+
+@pytest.fixture
+def state_manager(state_path: Path) -> LocalFileStateManager:
+    return LocalFileStateManager(str(state_path), TestState)
+
+def test_save_and_get_state(state_manager: LocalFileStateManager) -> None:
+    """Test saving and retrieving state"""
+    state_manager.save_state(TestState(id="test-id"))
+
+    retrieved_state = state_manager.get_state()
+
+    assert isinstance(retrieved_state, TestState)
+    assert retrieved_state.id == "test-id"
+    assert isinstance(retrieved_state.last_updated_date, datetime)
+    assert retrieved_state.last_updated_date.tzinfo == timezone.utc
+
+def test_save_state_overwrites_without_leftover_files(state_manager: LocalFileStateManager, state_path: Path) -> None:
+    """Test that repeated saves replace the state file and clean up temporary files"""
+    state_manager.save_state(TestState(id="first"))
+    state_manager.save_state(TestState(id="second"))
+
+    assert state_manager.get_state().id == "second"
+    assert os.listdir(state_path.parent) == ["state.json"]
+
+def test_save_state_failure_keeps_previous_state(state_manager: LocalFileStateManager, state_path: Path) -> None:
+    """Test that a failed write leaves the previous state intact"""
+    state_manager.save_state(TestState(id="original"))
+
+    with patch("state_manager.local.os.replace", side_effect=OSError("disk full")):
+        with pytest.raises(RuntimeError, match="Failed to save state to local file"):
+            state_manager.save_state(TestState(id="new"))
+
+    assert state_manager.get_state().id == "original"
+    assert os.listdir(state_path.parent) == ["state.json"]
+
+def test_get_nonexistent_state(state_manager: LocalFileStateManager) -> None:
+    """Test retrieving state that doesn't exist"""
+    assert state_manager.get_state() is None
+
+def test_get_empty_state_file(state_manager: LocalFileStateManager, state_path: Path) -> None:
+    """Test retrieving state from an empty file"""
+    state_path.parent.mkdir(parents=True)
+    state_path.touch()
+
+    assert state_manager.get_state() is None
+
+def test_clear_state(state_manager: LocalFileStateManager) -> None:
+    """Test clearing state"""
+    state_manager.save_state(TestState(id="test-id"))
+    state_manager.clear_state()
+
+    assert state_manager.get_state() is None
+    # Clearing twice is a no-op
+    state_manager.clear_state()
+
+def test_get_last_updated(state_manager: LocalFileStateManager) -> None:
+    """Test getting last updated timestamp"""
+    assert state_manager.get_last_updated() is None
+
+    state_manager.save_state(TestState(id="test-id"))
+    last_updated = state_manager.get_last_updated()
+
+    assert isinstance(last_updated, datetime)
+    assert last_updated.tzinfo == timezone.utc
@@ -1,10 +1,11 @@
-import jsonpickle
-import boto3
-from datetime import datetime, timezone
-from typing import Optional, TypeVar
-from botocore.exceptions import ClientError
+import threading
+from datetime import datetime
+from typing import Any, Optional, TypeVar
 
 from .interfaces import StateManager
+from .lease import Lease, LeaseRecord
+from .serialization import encode_state, decode_state
+from .threaded import ThreadedAsyncStateManager
 
 T = TypeVar('T')
 
@@ -14,39 +15,53 @@ class S3StateManager(StateManager[T]):
     Stores state as JSON in an S3 bucket.
     """
     
-    def __init__(self, bucket_name: str, key: str, state_class: type[T]):
+    def __init__(self, bucket_name: str, key: str, state_class: type[T], s3_client: Optional[Any] = None):
         """
         Initialize S3 state manager
+        boto3 is only imported and the client created on first use.
         
         Args:
             bucket_name: Name of the S3 bucket
             key: Key/path within the bucket where state will be stored
+            s3_client: Optional boto3 S3 client to share between state managers
         """
         self.bucket = bucket_name
         self.key = key
-        self.s3_client = boto3.client('s3')
         self.state_class = state_class
+        self._s3_client = s3_client
+        self._client_lock = threading.Lock()
+
+    @property
+    def s3_client(self) -> Any:
+        if self._s3_client is None:
+            # Concurrent first uses, e.g. through AsyncS3StateManager, create a single client
+            with self._client_lock:
+                if self._s3_client is None:
+                    import boto3
+                    self._s3_client = boto3.client('s3')
+        return self._s3_client
 
     def save_state(self, state: T) -> None:
         """Save state as JSON in S3"""
-        state.last_updated_date = datetime.now(timezone.utc)
+        from botocore.exceptions import ClientError
         try:
             self.s3_client.put_object(
                 Bucket=self.bucket,
                 Key=self.key,
-                Body=jsonpickle.encode(state)
+                Body=encode_state(state)
             )
         except ClientError as e:
             raise RuntimeError(f"Failed to save state to S3: {str(e)}")
 
     def get_state(self) -> Optional[T]:
         """Retrieve and deserialize state from S3"""
+        from botocore.exceptions import ClientError
         try:
             response = self.s3_client.get_object(
                 Bucket=self.bucket,
                 Key=self.key
             )
-            return jsonpickle.decode(response['Body'].read().decode('utf-8'))
+            return decode_state(response['Body'].read())
             
         except ClientError as e:
             if e.response['Error']['Code'] == 'NoSuchKey':
@@ -60,6 +75,7 @@ class S3StateManager(StateManager[T]):
 
     def clear_state(self) -> None:
         """Delete state object from S3"""
+        from botocore.exceptions import ClientError
         try:
             self.s3_client.delete_object(
                 Bucket=self.bucket,
@@ -67,3 +83,80 @@ class S3StateManager(StateManager[T]):
             )
         except ClientError as e:
             raise RuntimeError(f"Failed to clear state from S3: {str(e)}")
+
+class AsyncS3StateManager(ThreadedAsyncStateManager[T]):
+    """
+    Async S3 state manager.
+    Runs S3StateManager calls in worker threads.
+    """
+
+    def __init__(self, bucket_name: str, key: str, state_class: type[T], s3_client: Optional[Any] = None) -> None:
+        super().__init__(S3StateManager(bucket_name, key, state_class, s3_client))
+
+class S3Lease(Lease):
+    """
+    Lease stored as an S3 object.
+    Writes use S3 conditional puts, If-None-Match for the first write and If-Match on the ETag afterwards.
+    """
+
+    PRECONDITION_ERRORS = ("PreconditionFailed", "ConditionalRequestConflict")
+
+    def __init__(
+        self,
+        bucket_name: str,
+        key: str,
+        ttl_secs: int = 300,
+        holder: Optional[str] = None,
+        s3_client: Optional[Any] = None
+    ) -> None:
+        """
+        Initialize S3 lease.
+
+        Args:
+            bucket_name: Name of the S3 bucket
+            key: Key/path of the lease object in the bucket
+            ttl_secs: How long an acquired or renewed lease is valid for
+            holder: Unique name of this holder
+            s3_client: Optional boto3 S3 client to share with state managers
+        """
+        super().__init__(ttl_secs=ttl_secs, holder=holder)
+        self.bucket = bucket_name
+        self.key = key
+        self._s3_client = s3_client
+        self._client_lock = threading.Lock()
+
+    @property
+    def s3_client(self) -> Any:
+        if self._s3_client is None:
+            with self._client_lock:
+                if self._s3_client is None:
+                    import boto3
+                    self._s3_client = boto3.client('s3')
+        return self._s3_client
+
+    def _read(self) -> tuple[Optional[LeaseRecord], Optional[str]]:
+        from botocore.exceptions import ClientError
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket, Key=self.key)
+            return LeaseRecord.decode(response['Body'].read()), response['ETag']
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'NoSuchKey':
+                return None, None
+            raise RuntimeError(f"Failed to read lease from S3: {str(e)}")
+
+    def _write(self, record: LeaseRecord, expected_version: Optional[str]) -> Optional[str]:
+        from botocore.exceptions import ClientError
+        condition = {'IfMatch': expected_version} if expected_version else {'IfNoneMatch': '*'}
+        try:
+            response = self.s3_client.put_object(
+                Bucket=self.bucket,
+                Key=self.key,
+                Body=record.encode(),
+                ContentType='application/json',
+                **condition
+            )
+            return response['ETag']
+        except ClientError as e:
+            if e.response['Error']['Code'] in self.PRECONDITION_ERRORS:
+                return None
+            raise RuntimeError(f"Failed to write lease to S3: {str(e)}")
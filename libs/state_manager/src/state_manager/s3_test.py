@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 from datetime import datetime, timezone
 from typing import Optional, Generator
@@ -6,7 +7,8 @@ from moto import mock_aws
 import boto3
 
 from .interfaces import BaseState
-from .s3 import S3StateManager
+from .s3 import S3StateManager, AsyncS3StateManager, S3Lease
+from .lease import LeaseUnavailableError
 
 @dataclass
 class TestState(BaseState):
@@ -90,3 +92,61 @@ def test_error_handling(state_manager: S3StateManager) -> None:
     
     with pytest.raises(RuntimeError):
         state_manager.clear_state()
+
+def test_async_save_and_get_state(s3_client) -> None:
+    """Test the async S3 state manager against the same bucket"""
+    async_manager = AsyncS3StateManager("test-bucket", "test-key", TestState)
+
+    async def run() -> Optional[TestState]:
+        await async_manager.save_state(TestState(id="async-id"))
+        return await async_manager.get_state()
+
+    retrieved_state = asyncio.run(run())
+
+    assert retrieved_state is not None
+    assert retrieved_state.id == "async-id"
+
+def test_shared_client(s3_client) -> None:
+    """Test that state managers can share a caller supplied client"""
+    first = S3StateManager("test-bucket", "first-key", TestState, s3_client=s3_client)
+    second = S3StateManager("test-bucket", "second-key", TestState, s3_client=s3_client)
+
+    first.save_state(TestState(id="first-id"))
+
+    assert first.s3_client is second.s3_client is s3_client
+    assert first.get_state().id == "first-id"
+    assert second.get_state() is None
+
+def test_lease_is_exclusive(s3_client) -> None:
+    """Test that S3 conditional puts keep the lease exclusive"""
+    first = S3Lease("test-bucket", "lease.json", holder="first", s3_client=s3_client)
+    second = S3Lease("test-bucket", "lease.json", holder="second", s3_client=s3_client)
+
+    assert first.acquire()
+    assert not second.acquire()
+    assert first.renew()
+
+    first.release()
+    assert second.acquire()
+    assert not first.renew()
+
+def test_lease_stale_write_rejected(s3_client) -> None:
+    """Test that a write based on an outdated ETag is rejected"""
+    lease = S3Lease("test-bucket", "lease.json", holder="first", s3_client=s3_client)
+    lease.acquire()
+    record, etag = lease._read()
+    lease.renew()
+
+    assert lease._write(record, etag) is None
+
+def test_lease_context_manager(s3_client) -> None:
+    """Test the S3 lease as a context manager"""
+    with S3Lease("test-bucket", "lease.json", holder="first", s3_client=s3_client):
+        with pytest.raises(LeaseUnavailableError):
+            with S3Lease("test-bucket", "lease.json", holder="second", s3_client=s3_client):
+                pass
+
+def test_lease_error_handling(s3_client) -> None:
+    """Test error handling for an invalid bucket"""
+    with pytest.raises(RuntimeError):
+        S3Lease("nonexistent-bucket", "lease.json", s3_client=s3_client).acquire()
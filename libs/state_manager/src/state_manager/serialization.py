@@ -0,0 +1,34 @@
+from datetime import datetime, timezone
+from typing import TypeVar
+
+T = TypeVar('T')
+
+def encode_state(state: T) -> str:
+    """
+    Stamps the state's last updated date and serializes it with jsonpickle.
+    Shared by every backend so state written by one can be read by another.
+
+    Args:
+        state: The state object to serialize
+
+    Returns:
+        The JSON representation of the state
+    """
+    import jsonpickle
+    state.last_updated_date = datetime.now(timezone.utc)
+    return jsonpickle.encode(state)
+
+def decode_state(state_json: str | bytes) -> T:
+    """
+    Deserializes state previously written by encode_state.
+
+    Args:
+        state_json: The JSON representation of the state
+
+    Returns:
+        The state object
+    """
+    import jsonpickle
+    if isinstance(state_json, bytes):
+        state_json = state_json.decode("utf-8")
+    return jsonpickle.decode(state_json)
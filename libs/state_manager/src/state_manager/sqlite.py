@@ -0,0 +1,93 @@
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Optional, TypeVar
+
+from .interfaces import StateManager
+from .serialization import encode_state, decode_state
+
+T = TypeVar('T')
+
+class SQLiteStateManager(StateManager[T]):
+    """
+    SQLite implementation of StateManager interface.
+    Stores state as JSON in a single row of a key/value table, so several
+    state managers can share one database file using different keys.
+    """
+
+    def __init__(self, db_path: str, key: str, state_class: type[T], table_name: str = "state") -> None:
+        """
+        Initialize SQLite state manager.
+
+        Args:
+            db_path: Path to the SQLite database file, or ":memory:"
+            key: Key of the row where state will be stored
+            state_class: Type of the state object being stored
+            table_name: Name of the table holding state rows
+        """
+        if not table_name.isidentifier():
+            raise ValueError(f"Invalid table name: {table_name}")
+
+        self.db_path = db_path
+        self.key = key
+        self.state_class = state_class
+        self.table_name = table_name
+        self._lock = threading.Lock()
+
+        try:
+            self.connection = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+            if db_path != ":memory:":
+                self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table_name} ("
+                "key TEXT PRIMARY KEY, state TEXT NOT NULL, last_updated TEXT NOT NULL)"
+            )
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Failed to open SQLite state database: {str(e)}") from e
+
+    def save_state(self, state: T) -> None:
+        """Save state as JSON in SQLite"""
+        try:
+            state_json = encode_state(state)
+            with self._lock:
+                self.connection.execute(
+                    f"INSERT INTO {self.table_name} (key, state, last_updated) VALUES (?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET state = excluded.state, last_updated = excluded.last_updated",
+                    (self.key, state_json, state.last_updated_date.isoformat())
+                )
+        except (sqlite3.Error, TypeError, AttributeError) as e:
+            raise RuntimeError(f"Failed to save state to SQLite: {str(e)}") from e
+
+    def get_state(self) -> Optional[T]:
+        """Retrieve and deserialize state from SQLite"""
+        try:
+            with self._lock:
+                row = self.connection.execute(
+                    f"SELECT state FROM {self.table_name} WHERE key = ?", (self.key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Failed to retrieve state from SQLite: {str(e)}") from e
+        return decode_state(row[0]) if row else None
+
+    def get_last_updated(self) -> Optional[datetime]:
+        """Get the row's last updated timestamp"""
+        try:
+            with self._lock:
+                row = self.connection.execute(
+                    f"SELECT last_updated FROM {self.table_name} WHERE key = ?", (self.key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Failed to get last updated timestamp: {str(e)}") from e
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def clear_state(self) -> None:
+        """Delete the state row if it exists"""
+        try:
+            with self._lock:
+                self.connection.execute(f"DELETE FROM {self.table_name} WHERE key = ?", (self.key,))
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Failed to clear state: {str(e)}") from e
+
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        self.connection.close()
@@ -0,0 +1,90 @@
+import pytest
+from pathlib import Path
+from datetime import datetime, timezone
+from typing import Optional, Generator
+from dataclasses import dataclass
+
+from .interfaces import BaseState
+from .sqlite import SQLiteStateManager
+
+@dataclass
+class TestState(BaseState):
+    def __init__(self, id: str, last_updated_date: Optional[datetime] = datetime.now(timezone.utc).isoformat()):
+        self.id: str = id
+        super().__init__(last_updated_date)
+    __test__ = False
+
+@pytest.fixture
+def state_manager(tmp_path: Path) -> Generator[SQLiteStateManager, None, None]:
+    manager = SQLiteStateManager(str(tmp_path / "state.db"), "test-key", TestState)
+    yield manager
+    manager.close()
+
+def test_save_and_get_state(state_manager: SQLiteStateManager) -> None:
+    """Test saving and retrieving state"""
+    state_manager.save_state(TestState(id="test-id"))
+
+    retrieved_state = state_manager.get_state()
+
+    assert isinstance(retrieved_state, TestState)
+    assert retrieved_state.id == "test-id"
+    assert isinstance(retrieved_state.last_updated_date, datetime)
+    assert retrieved_state.last_updated_date.tzinfo == timezone.utc
+
+def test_save_state_overwrites(state_manager: SQLiteStateManager) -> None:
+    """Test that saving twice keeps only the latest state"""
+    state_manager.save_state(TestState(id="first"))
+    state_manager.save_state(TestState(id="second"))
+
+    assert state_manager.get_state().id == "second"
+
+def test_keys_are_isolated(tmp_path: Path) -> None:
+    """Test that managers sharing a database don't see each other's state"""
+    db_path = str(tmp_path / "state.db")
+    first = SQLiteStateManager(db_path, "first", TestState)
+    second = SQLiteStateManager(db_path, "second", TestState)
+
+    first.save_state(TestState(id="first-id"))
+
+    assert first.get_state().id == "first-id"
+    assert second.get_state() is None
+    first.close()
+    second.close()
+
+def test_get_nonexistent_state(state_manager: SQLiteStateManager) -> None:
+    """Test retrieving state that doesn't exist"""
+    assert state_manager.get_state() is None
+
+def test_clear_state(state_manager: SQLiteStateManager) -> None:
+    """Test clearing state"""
+    state_manager.save_state(TestState(id="test-id"))
+    state_manager.clear_state()
+
+    assert state_manager.get_state() is None
+
+def test_get_last_updated(state_manager: SQLiteStateManager) -> None:
+    """Test getting last updated timestamp"""
+    assert state_manager.get_last_updated() is None
+
+    test_state = TestState(id="test-id")
+    state_manager.save_state(test_state)
+
+    assert state_manager.get_last_updated() == test_state.last_updated_date
+
+def test_invalid_table_name() -> None:
+    """Test that table names are validated before being used in SQL"""
+    with pytest.raises(ValueError):
+        SQLiteStateManager(":memory:", "key", TestState, table_name="state; DROP TABLE x")
+
+def test_error_handling(state_manager: SQLiteStateManager) -> None:
+    """Test error handling for a closed connection"""
+    state_manager.close()
+
+    with pytest.raises(RuntimeError):
+        state_manager.save_state(TestState(id="test-id"))
+
+    with pytest.raises(RuntimeError):
+        state_manager.get_state()
+
+    with pytest.raises(RuntimeError):
+        state_manager.clear_state()
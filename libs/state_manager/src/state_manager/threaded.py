@@ -0,0 +1,39 @@
+import asyncio
+from datetime import datetime
+from typing import Any, Callable, Optional, TypeVar
+
+from .interfaces import AsyncStateManager, StateManager
+
+T = TypeVar('T')
+
+async def _run_in_thread(func: Callable[..., Any], *args: Any) -> Any:
+    return await asyncio.to_thread(func, *args)
+
+class ThreadedAsyncStateManager(AsyncStateManager[T]):
+    """
+    AsyncStateManager that offloads every call of a synchronous StateManager
+    to a worker thread, so any backend can be awaited without blocking the event loop.
+    Serialization is done by the wrapped manager, so state written through the
+    sync and async APIs is interchangeable.
+    """
+
+    def __init__(self, state_manager: StateManager[T]) -> None:
+        """
+        Initialize the threaded adapter.
+
+        Args:
+            state_manager: The synchronous state manager to wrap
+        """
+        self.state_manager = state_manager
+
+    async def save_state(self, state: T) -> None:
+        await _run_in_thread(self.state_manager.save_state, state)
+
+    async def get_state(self) -> Optional[T]:
+        return await _run_in_thread(self.state_manager.get_state)
+
+    async def get_last_updated(self) -> Optional[datetime]:
+        return await _run_in_thread(self.state_manager.get_last_updated)
+
+    async def clear_state(self) -> None:
+        await _run_in_thread(self.state_manager.clear_state)
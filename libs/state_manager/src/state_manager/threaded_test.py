@@ -0,0 +1,67 @@
+import asyncio
+import threading
+import pytest
+from pathlib import Path
+from datetime import datetime, timezone
+from typing import Optional
+from dataclasses import dataclass
+from unittest.mock import Mock
+
+from .interfaces import BaseState
+from .local import LocalFileStateManager
+from .threaded import ThreadedAsyncStateManager
+
+@dataclass
+class TestState(BaseState):
+    def __init__(self, id: str, last_updated_date: Optional[datetime] = datetime.now(timezone.utc).isoformat()):
+        self.id: str = id
+        super().__init__(last_updated_date)
+    __test__ = False
+
+@pytest.fixture
+def sync_manager(tmp_path: Path) -> LocalFileStateManager:
+    return LocalFileStateManager(str(tmp_path / "state.json"), TestState)
+
+def test_async_round_trip(sync_manager: LocalFileStateManager) -> None:
+    """Test saving, reading and clearing state through the async API"""
+    async_manager = ThreadedAsyncStateManager(sync_manager)
+
+    async def run() -> None:
+        await async_manager.save_state(TestState(id="test-id"))
+        state = await async_manager.get_state()
+        assert state.id == "test-id"
+        assert isinstance(await async_manager.get_last_updated(), datetime)
+        await async_manager.clear_state()
+        assert await async_manager.get_state() is None
+
+    asyncio.run(run())
+
+def test_async_and_sync_share_serialization(sync_manager: LocalFileStateManager) -> None:
+    """Test that state written asynchronously can be read synchronously"""
+    async_manager = ThreadedAsyncStateManager(sync_manager)
+
+    asyncio.run(async_manager.save_state(TestState(id="shared")))
+
+    assert sync_manager.get_state().id == "shared"
+
+def test_calls_run_off_the_event_loop_thread() -> None:
+    """Test that the wrapped manager is not called on the event loop thread"""
+    calling_threads = []
+    sync_manager = Mock()
+    sync_manager.get_state.side_effect = lambda: calling_threads.append(threading.get_ident())
+
+    async def run() -> int:
+        await ThreadedAsyncStateManager(sync_manager).get_state()
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(run())
+
+    assert calling_threads and calling_threads[0] != loop_thread
+
+def test_errors_propagate() -> None:
+    """Test that backend errors surface to the awaiting caller"""
+    sync_manager = Mock()
+    sync_manager.save_state.side_effect = RuntimeError("Failed to save state")
+
+    with pytest.raises(RuntimeError, match="Failed to save state"):
+        asyncio.run(ThreadedAsyncStateManager(sync_manager).save_state(TestState(id="id")))
@@ -34,17 +34,18 @@ class GitHubPRHandler:
             pr_number = payload["pull_request"]["number"]
             repo_full_name = payload["repository"]["full_name"]
             
+            # PyGithub is synchronous, so its calls run in a thread to keep the event loop free
             # Add initial comment to indicate processing has started
-            repo = self.github.get_repo(repo_full_name)
-            pr = repo.get_pull(pr_number)
-            await pr.create_issue_comment("🔍 Code review in progress... Please wait.")
+            repo = await asyncio.to_thread(self.github.get_repo, repo_full_name)
+            pr = await asyncio.to_thread(repo.get_pull, pr_number)
+            await asyncio.to_thread(pr.create_issue_comment, "🔍 Code review in progress... Please wait.")
             
             # Get the diff
-            diff = pr.get_files()
+            diff = await asyncio.to_thread(lambda: list(pr.get_files()))
             
             all_feedback = []
             for file in diff:
-                review_results = self.code_reviewer.review_code(file.patch)
+                review_results = await asyncio.to_thread(self.code_reviewer.review_code, file.patch)
                 
                 formatted_review = f"### Code Review for `{file.filename}`\n\n"
                 for category, items in review_results.items():
@@ -55,13 +56,13 @@ class GitHubPRHandler:
                 all_feedback.append(formatted_review)
             
             # Post the final review comment
-            await pr.create_issue_comment("\n\n".join(all_feedback))
+            await asyncio.to_thread(pr.create_issue_comment, "\n\n".join(all_feedback))
             
         except Exception as e:
             logger.error(f"Error processing PR: {e}")
             # Try to post error message to PR
             try:
-                await pr.create_issue_comment(f"❌ An error occurred during code review: {str(e)}")
+                await asyncio.to_thread(pr.create_issue_comment, f"❌ An error occurred during code review: {str(e)}")
             except Exception as comment_error:
                 logger.error(f"Failed to post error comment: {comment_error}")
         finally:
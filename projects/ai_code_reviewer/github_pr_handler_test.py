@@ -40,7 +40,7 @@ async def test_process_pr_success(github_handler: GitHubPRHandler) -> None:
     
     mock_pr = Mock()
     mock_pr.get_files.return_value = [mock_file]
-    mock_pr.create_issue_comment = AsyncMock()
+    mock_pr.create_issue_comment = Mock()
     
     mock_repo = Mock()
     mock_repo.get_pull.return_value = mock_pr
@@ -1,16 +1,49 @@
 import requests
 from datetime import datetime, timezone, timedelta
 from typing import Optional, List, Sequence
+import threading
 from google.cloud import bigquery
 from loguru import logger
 from models.state import LastRunState
-from state_manager.gcs import GCSStateManager
+from state_manager.gcs import GCSStateManager, GCSLease
+from state_manager.lease import LeaseUnavailableError
 from config import settings
 from models.build import Build
 from setup import setup_build_table
 from dataclasses import asdict
 import uuid
 
+class TokenPool:
+    """
+    Rotates requests across several GitHub access tokens, each with its own rate limit,
+    preferring the token with the most remaining budget as reported by the last response.
+    """
+
+    def __init__(self, access_tokens: Sequence[str]) -> None:
+        if not access_tokens:
+            raise ValueError("At least one access token is required")
+        # None until a response has reported the token's remaining budget
+        self.remaining: dict[str, Optional[int]] = {token: None for token in access_tokens}
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def next_token(self) -> str:
+        """Token with the most remaining budget, tokens with unknown budget first, rotating between ties"""
+        with self._lock:
+            tokens = list(self.remaining)
+            self._next = (self._next + 1) % len(tokens)
+            rotated = tokens[self._next:] + tokens[:self._next]
+            return max(rotated, key=lambda token: float("inf") if self.remaining[token] is None else self.remaining[token])
+
+    def update(self, access_token: str, response_headers: dict[str, str]) -> None:
+        """Record the remaining budget of a token from the rate limit headers of a response"""
+        try:
+            remaining = int(response_headers.get("X-RateLimit-Remaining"))
+        except (TypeError, ValueError):
+            return
+        with self._lock:
+            self.remaining[access_token] = remaining
+
 def parse_workflow_run(run: dict, repo_owner: str, repo_name: str) -> Optional[Build]:
     """
     Parse a single workflow run into a Build object.
@@ -49,7 +82,8 @@ def parse_workflow_run(run: dict, repo_owner: str, repo_name: str) -> Optional[B
 def fetch_workflow_page(
     url: str,
     headers: dict[str, str],
-    params: dict[str, str]
+    params: dict[str, str],
+    token_pool: Optional[TokenPool] = None
 ) -> Optional[List[dict]]:
     """
     Fetch a single page of workflow runs from GitHub API.
@@ -58,12 +92,19 @@ def fetch_workflow_page(
         url: GitHub API endpoint URL
         headers: Request headers
         params: Query parameters
+        token_pool: Tokens to authenticate with, overrides the Authorization header
     
     Returns:
         List of workflow runs if successful, None if failed
     """
     try:
+        access_token: Optional[str] = None
+        if token_pool:
+            access_token = token_pool.next_token()
+            headers = {**headers, "Authorization": f"Bearer {access_token}"}
         response: requests.Response = requests.get(url, headers=headers, params=params)
+        if token_pool:
+            token_pool.update(access_token, response.headers)
         response.raise_for_status()
         return response.json().get("workflow_runs", [])
     except requests.exceptions.RequestException as e:
@@ -74,7 +115,7 @@ def get_github_workflow_build_times(
     repo_owner: str, 
     repo_name: str, 
     workflow_id: str, 
-    access_token: str,
+    access_token: str | Sequence[str],
     since_date: datetime
 ) -> List[Build]:
     """
@@ -84,15 +125,16 @@ def get_github_workflow_build_times(
         repo_owner: GitHub repository owner/organization
         repo_name: Name of the repository
         workflow_id: ID of the workflow to get build times for
-        access_token: GitHub personal access token with workflow read permissions
+        access_token: GitHub personal access token with workflow read permissions, or several
+            tokens whose rate limits are pooled by rotating requests across them
         since_date: DateTime to filter workflow runs from (inclusive)
     
     Returns:
         List of Build objects containing build metadata
     """
+    token_pool = TokenPool([access_token] if isinstance(access_token, str) else list(access_token))
     headers: dict[str, str] = {
         "Accept": "application/vnd.github+json",
-        "Authorization": f"Bearer {access_token}",
         "X-GitHub-Api-Version": "2022-11-28"
     }
     
@@ -110,7 +152,7 @@ def get_github_workflow_build_times(
             "per_page": str(per_page)
         }
         
-        workflow_runs = fetch_workflow_page(url, headers, params)
+        workflow_runs = fetch_workflow_page(url, headers, params, token_pool)
         if not workflow_runs:
             break
             
@@ -127,15 +169,13 @@ def get_github_workflow_build_times(
     return builds
 
 
-if __name__ == '__main__':
-    client = bigquery.Client()
-    setup_build_table(
-        client=client,
-        project_id=settings.gcp.project_id,
-        dataset_id=settings.gcp.dataset_id,
-        table_id=settings.gcp.table_id
-    )
-
+def sync_builds(client: bigquery.Client) -> None:
+    """
+    Inserts builds created since the last run into BigQuery and saves the new last run state.
+    
+    Args:
+        client: BigQuery client
+    """
     # Initialize GCS state manager
     state_manager: GCSStateManager = GCSStateManager(
         bucket_name=settings.bucket,
@@ -176,4 +216,25 @@ if __name__ == '__main__':
     
     state.id=str(uuid.uuid4())
     state.last_updated_date = now
-    state_manager.save_state(state)
\ No newline at end of file
+    state_manager.save_state(state)
+
+
+if __name__ == '__main__':
+    client = bigquery.Client()
+    setup_build_table(
+        client=client,
+        project_id=settings.gcp.project_id,
+        dataset_id=settings.gcp.dataset_id,
+        table_id=settings.gcp.table_id
+    )
+
+    # Only one scheduler at a time gets to sync, the others skip this run
+    try:
+        with GCSLease(
+            bucket_name=settings.bucket,
+            lease_path=settings.lease_file_path,
+            ttl_secs=settings.lease_ttl_secs
+        ):
+            sync_builds(client)
+    except LeaseUnavailableError:
+        logger.info("Another scheduler holds the lease, skipping this run")
@@ -9,6 +9,7 @@ from main import (
     get_github_workflow_build_times,
     fetch_workflow_page,
     parse_workflow_run,
+    TokenPool,
 )
 
 @pytest.fixture
@@ -158,3 +159,42 @@ def test_get_github_workflow_build_times_empty(mock_empty_response: Dict[str, An
         )
 
         assert len(builds) == 0
+
+def test_token_pool_prefers_most_remaining_budget() -> None:
+    """Test that tokens with unknown budget are tried first and then the one with the most budget"""
+    pool = TokenPool(["a", "b", "c"])
+
+    assert {pool.next_token() for _ in range(3)} == {"a", "b", "c"}
+
+    pool.update("a", {"X-RateLimit-Remaining": "10"})
+    pool.update("b", {"X-RateLimit-Remaining": "4000"})
+    pool.update("c", {"X-RateLimit-Remaining": "200"})
+    pool.update("c", {})
+
+    assert pool.next_token() == "b"
+
+def test_get_github_workflow_build_times_rotates_tokens(mock_successful_response: Dict[str, Any]) -> None:
+    """Test that pages are fetched with the token that has the most remaining budget"""
+    full_page = {"workflow_runs": mock_successful_response["workflow_runs"] * 50}
+    responses = []
+    def get(url: str, headers: dict[str, str], params: dict[str, str]) -> Mock:
+        # token-a is nearly spent and token-b has plenty left
+        remaining = "1" if headers["Authorization"] == "Bearer token-a" else "4000"
+        response = Mock(headers={"X-RateLimit-Remaining": remaining})
+        response.json.return_value = full_page if len(responses) < 2 else {"workflow_runs": []}
+        responses.append(headers["Authorization"])
+        return response
+
+    with patch('requests.get', side_effect=get):
+        builds: List[Build] = get_github_workflow_build_times(
+            repo_owner="test-owner",
+            repo_name="test-repo",
+            workflow_id="123",
+            access_token=["token-a", "token-b"],
+            since_date=datetime(2024, 1, 1, tzinfo=timezone.utc)
+        )
+
+    assert len(builds) == 200
+    # Both tokens are tried once, then the one with budget left is preferred
+    assert sorted(responses[:2]) == ["Bearer token-a", "Bearer token-b"]
+    assert responses[2] == "Bearer token-b"
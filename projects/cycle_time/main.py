@@ -0,0 +1,192 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict
+from datetime import datetime, timezone, timedelta
+from typing import List, Optional, Sequence
+from google.cloud import bigquery
+from loguru import logger
+from code_analysis_tool.github_client import GitHubClient
+from code_analysis_tool.models.pull_request import PullRequest
+from code_analysis_tool.models.review import Review
+from state_manager.checkpoint import CheckpointStateManager
+from state_manager.gcs import GCSStateManager, GCSLease
+from state_manager.lease import Lease, LeaseUnavailableError
+from config import settings
+from models.pull_request_cycle import PullRequestCycle
+from models.state import SyncState
+from setup import setup_cycle_time_table
+
+DATETIME_STR_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+def seconds_between(start: datetime, end: Optional[datetime]) -> Optional[int]:
+    return int((end - start).total_seconds()) if end else None
+
+def build_cycle(pr: PullRequest, reviews: List[Review]) -> PullRequestCycle:
+    """
+    Works out the lifecycle of a merged pull request from its reviews.
+
+    Args:
+        pr: Merged pull request
+        reviews: Reviews of the pull request
+
+    Returns:
+        PullRequestCycle with the first review and first approval by someone other than the author
+    """
+    submitted = sorted(
+        (review for review in reviews if review.submitted_at and review.author.login != pr.author.login),
+        key=lambda review: review.submitted_at
+    )
+    first_review_at: Optional[datetime] = submitted[0].submitted_at if submitted else None
+    approved_at: Optional[datetime] = next((review.submitted_at for review in submitted if review.state == "APPROVED"), None)
+
+    return PullRequestCycle(
+        id=pr.id,
+        repo=pr.repository.full_name,
+        number=pr.number,
+        author=pr.author.login,
+        created_at=pr.created_at.strftime(DATETIME_STR_FORMAT),
+        merged_at=pr.merged_at.strftime(DATETIME_STR_FORMAT),
+        cycle_time_secs=seconds_between(pr.created_at, pr.merged_at),
+        first_review_at=first_review_at.strftime(DATETIME_STR_FORMAT) if first_review_at else None,
+        approved_at=approved_at.strftime(DATETIME_STR_FORMAT) if approved_at else None,
+        time_to_first_review_secs=seconds_between(pr.created_at, first_review_at),
+        time_to_approval_secs=seconds_between(pr.created_at, approved_at)
+    )
+
+def fetch_repository_cycles(
+    github_client: GitHubClient,
+    repo_name: str,
+    since_date: datetime,
+    exclusive: bool
+) -> tuple[List[PullRequestCycle], Optional[datetime]]:
+    """
+    Gets the cycles of pull requests merged in a repository since a date.
+
+    Args:
+        github_client: GitHub client
+        repo_name: Full name of the repository
+        since_date: Date to get pull requests merged from
+        exclusive: Whether to skip pull requests merged exactly at since_date, i.e. already synced
+
+    Returns:
+        The cycles and the newest merged at timestamp among them, None if there were none
+    """
+    pull_requests: List[PullRequest] = [
+        pr for pr in github_client.iter_merged_pull_requests(repo_name, since_date.isoformat())
+        if not (exclusive and pr.merged_at <= since_date)
+    ]
+    cycles: List[PullRequestCycle] = [
+        build_cycle(pr, github_client.get_pull_request_reviews(repo_name, pr.number))
+        for pr in pull_requests
+    ]
+    newest_merged_at: Optional[datetime] = max((pr.merged_at for pr in pull_requests), default=None)
+    return cycles, newest_merged_at
+
+def keep_lease(lease: Lease) -> None:
+    """
+    Renews the lease once half of its TTL has passed, so a sync that outlasts the TTL
+    keeps it, and aborts the sync if another scheduler has taken the lease over.
+
+    Args:
+        lease: Lease held for the sync
+    """
+    if lease.expires_at - datetime.now(timezone.utc) > lease.ttl / 2:
+        return
+    if not lease.renew():
+        raise Exception("Lost the lease to another scheduler, stopping the sync")
+
+def sync_cycle_times(
+    client: bigquery.Client,
+    github_client: GitHubClient,
+    state_manager: CheckpointStateManager[SyncState],
+    lease: Optional[Lease] = None
+) -> None:
+    """
+    Inserts cycles of pull requests merged since each repository's watermark into BigQuery.
+
+    Repositories are fetched concurrently and each repository's watermark is checkpointed
+    as soon as its rows are inserted, so a failed run resumes where it left off instead
+    of rescanning every repository.
+
+    Args:
+        client: BigQuery client
+        github_client: GitHub client
+        state_manager: Checkpointing state manager holding the per repository watermarks
+        lease: Lease held for the sync, renewed between repositories
+    """
+    state: Optional[SyncState] = state_manager.get_state()
+    if not state:
+        state = SyncState(id="initial_run")
+    default_since: datetime = datetime.now(timezone.utc) - timedelta(days=settings.initial_days_to_look_back)
+    fully_qualified_table_id = f"{settings.gcp.project_id}.{settings.gcp.dataset_id}.{settings.gcp.table_id}"
+
+    repo_names: List[str] = [repo.full_name for repo in github_client.iter_user_repositories(settings.github.owner)]
+    logger.info(f"Syncing pull request cycle times for {len(repo_names)} repositories")
+
+    executor = ThreadPoolExecutor(max_workers=github_client.max_workers, thread_name_prefix="cycle-time")
+    try:
+        futures = {}
+        for repo_name in repo_names:
+            watermark: Optional[str] = state.watermarks.get(repo_name)
+            since_date: datetime = datetime.fromisoformat(watermark) if watermark else default_since
+            futures[executor.submit(fetch_repository_cycles, github_client, repo_name, since_date, watermark is not None)] = repo_name
+
+        for future in as_completed(futures):
+            repo_name = futures[future]
+            cycles, newest_merged_at = future.result()
+            if lease:
+                keep_lease(lease)
+            if not cycles:
+                continue
+
+            logger.info(f"Inserting {len(cycles)} record(s) for {repo_name} into {fully_qualified_table_id}...")
+            errors: Sequence[dict] = client.insert_rows_json(
+                fully_qualified_table_id,
+                [asdict(cycle) for cycle in cycles],
+                # Lets BigQuery drop duplicates if an insert is retried
+                row_ids=[cycle.id for cycle in cycles]
+            )
+            if len(errors) > 0:
+                raise Exception(f"Errors inserting into BigQuery: {errors}")
+
+            state.watermarks[repo_name] = newest_merged_at.isoformat()
+            state_manager.checkpoint(state)
+    finally:
+        # Don't keep fetching the remaining repositories after a failure
+        executor.shutdown(cancel_futures=True)
+
+    logger.info("Finished syncing")
+
+
+if __name__ == '__main__':
+    client = bigquery.Client()
+    setup_cycle_time_table(
+        client=client,
+        project_id=settings.gcp.project_id,
+        dataset_id=settings.gcp.dataset_id,
+        table_id=settings.gcp.table_id
+    )
+
+    # Only one scheduler at a time gets to sync, the others skip this run
+    try:
+        with GCSLease(
+            bucket_name=settings.bucket,
+            lease_path=settings.lease_file_path,
+            ttl_secs=settings.lease_ttl_secs
+        ) as lease, CheckpointStateManager(
+            GCSStateManager(
+                bucket_name=settings.bucket,
+                state_path=settings.state_file_path,
+                state_class=SyncState
+            ),
+            log_path=settings.checkpoint_log_path
+        ) as state_manager:
+            sync_cycle_times(
+                client=client,
+                github_client=GitHubClient(settings.access_token, max_workers=settings.max_workers),
+                state_manager=state_manager,
+                lease=lease
+            )
+    except LeaseUnavailableError:
+        logger.info("Another scheduler holds the lease, skipping this run")
+    finally:
+        client.close()
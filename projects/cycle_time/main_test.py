@@ -0,0 +1,173 @@
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+import pytest
+from unittest.mock import Mock
+from typing import List, Optional
+
+from code_analysis_tool.models.pull_request import PullRequest
+from code_analysis_tool.models.repository import Repository
+from code_analysis_tool.models.review import Review
+from code_analysis_tool.models.user import User
+from state_manager.checkpoint import CheckpointStateManager
+from state_manager.local import LocalFileStateManager
+
+from models.state import SyncState
+from main import build_cycle, fetch_repository_cycles, keep_lease, sync_cycle_times
+
+AUTHOR = User(id="1", login="author")
+REVIEWER = User(id="2", login="reviewer")
+
+def create_pull_request(number: int, merged_at: datetime, repo_name: str = "owner/repo") -> PullRequest:
+    owner = User(id="0", login="owner")
+    return PullRequest(
+        id=f"{repo_name}#{number}",
+        number=number,
+        title=f"PR {number}",
+        author=AUTHOR,
+        repository=Repository(id=repo_name, name=repo_name.split("/")[1], full_name=repo_name, owner=owner),
+        created_at=datetime(2024, 1, 1, 10, 0, tzinfo=timezone.utc),
+        merged_at=merged_at,
+        merged=True,
+        description=None
+    )
+
+def review(author: User, state: str, submitted_at: Optional[datetime]) -> Review:
+    return Review(id=f"{author.login}-{state}", author=author, state=state, submitted_at=submitted_at)
+
+def test_build_cycle() -> None:
+    """Test the first review and approval ignore the author's own reviews"""
+    pr = create_pull_request(1, datetime(2024, 1, 2, 10, 0, tzinfo=timezone.utc))
+    reviews = [
+        review(REVIEWER, "APPROVED", datetime(2024, 1, 1, 14, 0, tzinfo=timezone.utc)),
+        review(AUTHOR, "COMMENTED", datetime(2024, 1, 1, 10, 30, tzinfo=timezone.utc)),
+        review(REVIEWER, "PENDING", None),
+        review(REVIEWER, "CHANGES_REQUESTED", datetime(2024, 1, 1, 11, 0, tzinfo=timezone.utc)),
+    ]
+
+    cycle = build_cycle(pr, reviews)
+
+    assert cycle.repo == "owner/repo"
+    assert cycle.author == "author"
+    assert cycle.created_at == "2024-01-01 10:00:00"
+    assert cycle.first_review_at == "2024-01-01 11:00:00"
+    assert cycle.approved_at == "2024-01-01 14:00:00"
+    assert cycle.merged_at == "2024-01-02 10:00:00"
+    assert cycle.time_to_first_review_secs == 3600
+    assert cycle.time_to_approval_secs == 4 * 3600
+    assert cycle.cycle_time_secs == 24 * 3600
+
+def test_build_cycle_without_reviews() -> None:
+    """Test a pull request merged without review"""
+    cycle = build_cycle(create_pull_request(1, datetime(2024, 1, 1, 11, 0, tzinfo=timezone.utc)), [])
+
+    assert cycle.first_review_at is None
+    assert cycle.approved_at is None
+    assert cycle.time_to_first_review_secs is None
+    assert cycle.cycle_time_secs == 3600
+
+def test_fetch_repository_cycles_skips_synced() -> None:
+    """Test that pull requests merged at the watermark aren't synced again"""
+    watermark = datetime(2024, 1, 5, tzinfo=timezone.utc)
+    github_client = Mock()
+    github_client.iter_merged_pull_requests.return_value = iter([
+        create_pull_request(2, datetime(2024, 1, 6, tzinfo=timezone.utc)),
+        create_pull_request(1, watermark),
+    ])
+    github_client.get_pull_request_reviews.return_value = []
+
+    cycles, newest_merged_at = fetch_repository_cycles(github_client, "owner/repo", watermark, exclusive=True)
+
+    assert [cycle.number for cycle in cycles] == [2]
+    assert newest_merged_at == datetime(2024, 1, 6, tzinfo=timezone.utc)
+    github_client.iter_merged_pull_requests.assert_called_once_with("owner/repo", watermark.isoformat())
+    github_client.get_pull_request_reviews.assert_called_once_with("owner/repo", 2)
+
+@pytest.fixture
+def state_manager(tmp_path: Path) -> CheckpointStateManager:
+    return CheckpointStateManager(LocalFileStateManager(str(tmp_path / "state.json"), SyncState), str(tmp_path / "checkpoints.log"))
+
+def test_sync_cycle_times_uses_watermarks(state_manager: CheckpointStateManager) -> None:
+    """Test that repositories resume from their watermark and only repositories with new pull requests advance"""
+    state_manager.save_state(SyncState(id="previous_run", watermarks={"owner/synced": "2024-01-05T00:00:00+00:00"}))
+    merged_at = {
+        "owner/synced": datetime(2024, 1, 6, tzinfo=timezone.utc),
+        "owner/new": datetime(2024, 1, 3, tzinfo=timezone.utc),
+    }
+    since_dates: dict[str, str] = {}
+    def merged_pull_requests(repo_name: str, since_date: str) -> List[PullRequest]:
+        since_dates[repo_name] = since_date
+        return [create_pull_request(1, merged_at[repo_name], repo_name)] if repo_name in merged_at else []
+
+    github_client = Mock()
+    github_client.max_workers = 2
+    github_client.iter_user_repositories.return_value = [
+        Repository(id=name, name=name, full_name=name, owner=User(id="0", login="owner"))
+        for name in ("owner/synced", "owner/new", "owner/quiet")
+    ]
+    github_client.iter_merged_pull_requests.side_effect = merged_pull_requests
+    github_client.get_pull_request_reviews.return_value = []
+    client = Mock()
+    client.insert_rows_json.return_value = []
+
+    sync_cycle_times(client, github_client, state_manager)
+    state_manager.close()
+
+    assert since_dates["owner/synced"] == "2024-01-05T00:00:00+00:00"
+    assert client.insert_rows_json.call_count == 2
+    inserted_ids = sorted(row_id for call in client.insert_rows_json.call_args_list for row_id in call.kwargs["row_ids"])
+    assert inserted_ids == ["owner/new#1", "owner/synced#1"]
+    assert state_manager.get_state().watermarks == {
+        "owner/synced": "2024-01-06T00:00:00+00:00",
+        "owner/new": "2024-01-03T00:00:00+00:00",
+    }
+
+def test_sync_cycle_times_insert_errors(state_manager: CheckpointStateManager) -> None:
+    """Test that insert errors fail the sync without advancing the watermark"""
+    github_client = Mock()
+    github_client.max_workers = 1
+    github_client.iter_user_repositories.return_value = [Repository(id="1", name="repo", full_name="owner/repo", owner=User(id="0", login="owner"))]
+    github_client.iter_merged_pull_requests.return_value = [create_pull_request(1, datetime(2024, 1, 6, tzinfo=timezone.utc))]
+    github_client.get_pull_request_reviews.return_value = []
+    client = Mock()
+    client.insert_rows_json.return_value = [{"index": 0, "errors": ["invalid"]}]
+
+    with pytest.raises(Exception) as exc_info:
+        sync_cycle_times(client, github_client, state_manager)
+
+    assert "Errors inserting into BigQuery" in str(exc_info.value)
+    assert state_manager.get_state() is None
+
+def lease_expiring_in(remaining: timedelta) -> Mock:
+    lease = Mock()
+    lease.ttl = timedelta(hours=1)
+    lease.expires_at = datetime.now(timezone.utc) + remaining
+    return lease
+
+def test_keep_lease_renews_after_half_the_ttl() -> None:
+    """Test the lease is only renewed once half of its TTL has passed"""
+    fresh = lease_expiring_in(timedelta(minutes=50))
+    keep_lease(fresh)
+    fresh.renew.assert_not_called()
+
+    expiring = lease_expiring_in(timedelta(minutes=20))
+    expiring.renew.return_value = True
+    keep_lease(expiring)
+    expiring.renew.assert_called_once()
+
+def test_sync_cycle_times_stops_when_lease_is_lost(state_manager: CheckpointStateManager) -> None:
+    """Test that a lease taken over by another scheduler stops the sync before inserting"""
+    github_client = Mock()
+    github_client.max_workers = 1
+    github_client.iter_user_repositories.return_value = [Repository(id="1", name="repo", full_name="owner/repo", owner=User(id="0", login="owner"))]
+    github_client.iter_merged_pull_requests.return_value = [create_pull_request(1, datetime(2024, 1, 6, tzinfo=timezone.utc))]
+    github_client.get_pull_request_reviews.return_value = []
+    client = Mock()
+    lease = lease_expiring_in(timedelta(minutes=5))
+    lease.renew.return_value = False
+
+    with pytest.raises(Exception) as exc_info:
+        sync_cycle_times(client, github_client, state_manager, lease)
+
+    assert "Lost the lease" in str(exc_info.value)
+    client.insert_rows_json.assert_not_called()
+    assert state_manager.get_state() is None
@@ -0,0 +1,22 @@
+from typing import Optional
+from dataclasses import dataclass
+
+
+@dataclass
+class PullRequestCycle:
+    """
+    Lifecycle timestamps and durations of a merged pull request
+    Should match the Schema defined in setup.py
+    Timestamps are strings to make it easy to insert into BigQuery
+    """
+    id: str
+    repo: str
+    number: int
+    author: str
+    created_at: str
+    merged_at: str
+    cycle_time_secs: int
+    first_review_at: Optional[str] = None
+    approved_at: Optional[str] = None
+    time_to_first_review_secs: Optional[int] = None
+    time_to_approval_secs: Optional[int] = None
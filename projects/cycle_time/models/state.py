@@ -0,0 +1,18 @@
+from dataclasses import dataclass
+from state_manager.interfaces import BaseState
+from datetime import datetime
+from typing import Optional
+
+@dataclass
+class SyncState(BaseState):
+    """
+    Merged at timestamp of the newest synced pull request per repository,
+    so each run only fetches pull requests merged since then
+    """
+    id: str
+    watermarks: dict[str, str]
+    last_updated_date: datetime
+    def __init__(self, id: str, watermarks: Optional[dict[str, str]] = None):
+        self.id: str = id
+        self.watermarks: dict[str, str] = watermarks or {}
+        super().__init__()
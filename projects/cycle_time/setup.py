@@ -0,0 +1,57 @@
+from google.cloud import bigquery
+
+from bigquery.dataset import ensure_dataset_exists
+from bigquery.datatable import ensure_table_exists
+
+def setup_cycle_time_table(
+    client: bigquery.Client,
+    project_id: str,
+    dataset_id: str,
+    table_id: str = "pull_request_cycle_times",
+    location: str = "australia-southeast1"
+) -> None:
+    """
+    Sets up the BigQuery dataset and table for storing pull request cycle times if they don't exist.
+    
+    Args:
+        client: BigQuery client
+        dataset_id: ID of the dataset to store cycle times
+        table_id: ID of the table to store cycle times
+        location: Geographic location of the dataset
+    """
+    try:
+        # Ensure dataset exists
+        dataset: bigquery.Dataset = ensure_dataset_exists(
+            client=client,
+            project_id=project_id,
+            dataset_id=dataset_id, 
+            location=location)
+        
+        # Define schema for cycle times table
+        schema = [
+            bigquery.SchemaField("id", "STRING", mode="REQUIRED"),
+            bigquery.SchemaField("repo", "STRING", mode="REQUIRED"),
+            bigquery.SchemaField("number", "INT64", mode="REQUIRED"),
+            bigquery.SchemaField("author", "STRING", mode="REQUIRED"),
+            bigquery.SchemaField("created_at", "TIMESTAMP", mode="REQUIRED"),
+            bigquery.SchemaField("first_review_at", "TIMESTAMP", mode="NULLABLE"),
+            bigquery.SchemaField("approved_at", "TIMESTAMP", mode="NULLABLE"),
+            bigquery.SchemaField("merged_at", "TIMESTAMP", mode="REQUIRED"),
+            bigquery.SchemaField("time_to_first_review_secs", "INT64", mode="NULLABLE"),
+            bigquery.SchemaField("time_to_approval_secs", "INT64", mode="NULLABLE"),
+            bigquery.SchemaField("cycle_time_secs", "INT64", mode="REQUIRED")
+        ]
+        
+        # Ensure table exists with proper schema
+        ensure_table_exists(
+            client=client,
+            project_id=project_id,
+            dataset_id=dataset_id,
+            table_id=table_id,
+            schema=schema,
+            partition_by="merged_at",
+            clustering_fields=["repo", "author"],
+            partition_type=bigquery.TimePartitioningType.MONTH
+        )
+    except Exception as e:
+        raise RuntimeError(f"Failed to setup cycle time table: {table_id} in dataset: {dataset_id} with error: {e}")